@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks du moteur morphologique (à lancer depuis le dossier moteur_arabe/)"""
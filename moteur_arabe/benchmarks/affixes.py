@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du découpage des affixes sur des mots de texte synthétiques.
+
+    python -m benchmarks.affixes
+    python -m benchmarks.affixes --racines 20000 --mots 50000
+
+Construit le lexique (racines × schèmes par défaut), puis habille des mots
+connus de proclitiques et de suffixes tirés au hasard (والكاتب، بمكتوبها),
+mêlés de mots inconnus. Mesure le débit (mots/s) du découpage seul et de
+l'analyse complète, le nombre de candidats par mot et la couverture
+comparée à l'index inverse seul.
+"""
+import argparse
+import random
+import sys
+import time
+
+from .donnees import LETTRES
+from .flou import construire_lexique
+
+PROCLITIQUES = ("", "", "و", "ف", "ب", "ل", "ال", "وال", "بال", "لل", "فب")
+SUFFIXES = ("", "", "ها", "هم", "ه", "ات", "ون", "ين", "كم", "نا")
+
+
+def generer_textes(mots, nombre, part_inconnus, graine):
+    """`nombre` mots de texte : mots du lexique avec affixes, ou suites de lettres"""
+    aleatoire = random.Random(graine)
+    textes = []
+    for _ in range(nombre):
+        if aleatoire.random() < part_inconnus:
+            longueur = aleatoire.randint(3, 9)
+            textes.append("".join(aleatoire.choice(LETTRES) for _ in range(longueur)))
+        else:
+            textes.append(aleatoire.choice(PROCLITIQUES) + aleatoire.choice(mots)
+                          + aleatoire.choice(SUFFIXES))
+    return textes
+
+
+def debit(operation, textes):
+    """(mots par seconde, résultats) d'une opération appliquée à chaque mot"""
+    debut = time.perf_counter()
+    resultats = [operation(texte) for texte in textes]
+    return len(textes) / (time.perf_counter() - debut), resultats
+
+
+def principal(argv=None):
+    parseur = argparse.ArgumentParser(description="Benchmark du découpage des affixes")
+    parseur.add_argument("--racines", type=int, default=10000)
+    parseur.add_argument("--mots", type=int, default=50000)
+    parseur.add_argument("--inconnus", type=float, default=0.2,
+                         help="part de mots sans racine connue")
+    parseur.add_argument("--graine", type=int, default=42)
+    args = parseur.parse_args(argv)
+
+    moteur = construire_lexique(args.racines, args.graine)
+    arbre = moteur.arbre_racines
+    textes = generer_textes(list(arbre.index_inverse), args.mots, args.inconnus, args.graine)
+    print(f"Lexique: {args.racines} racines, {len(arbre.index_inverse)} mots ; "
+          f"{len(textes)} mots de texte ({args.inconnus:.0%} inconnus)")
+
+    analyseur = moteur.analyseur_affixes()
+    par_seconde, decoupages = debit(analyseur.decouper, textes)
+    nombres = [len(candidats) for candidats in decoupages]
+    print(f"Découpage seul: {par_seconde:,.0f} mots/s ; candidats par mot: "
+          f"moyenne {sum(nombres) / len(nombres):.2f}, max {max(nombres)}")
+
+    par_seconde, resultats = debit(arbre.trouver_racine_du_mot, textes)
+    couverture_index = sum(1 for racine in resultats if racine) / len(textes)
+    print(f"Index inverse seul: {par_seconde:,.0f} mots/s, couverture {couverture_index:.1%}")
+
+    moteur.transducteur()   # compilé hors mesure
+    par_seconde, resultats = debit(moteur.analyser_avec_affixes, textes)
+    couverture = sum(1 for analyse in resultats if analyse) / len(textes)
+    print(f"Analyse avec affixes: {par_seconde:,.0f} mots/s, couverture {couverture:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la découverte de racines dans un corpus.
+
+    python -m benchmarks.decouverte
+    python -m benchmarks.decouverte --mo 500 --processus 1 2 4 8
+
+Écrit un corpus synthétique d'environ --mo mégaoctets (mots de racines
+connues, habillés d'affixes, et mots inconnus, loi de Zipf ; voir
+benchmarks.documents), puis découvre ses racines avec un moteur qui ne
+connaît que les schèmes. Pour chaque nombre de processus : débit (Mo/s,
+jetons/s), mémoire maximale (processus principal et sous-processus),
+rappel et précision des racines proposées face aux racines d'origine.
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from src.decouverte import decouvrir
+
+from .affixes import generer_textes
+from .documents import generer_documents
+from .flou import construire_lexique
+from .scenarios import creer_moteur
+
+
+def ecrire_corpus(chemin, vocabulaire, taille, graine):
+    """Écrit des documents (une ligne chacun) jusqu'à `taille` octets ; retourne le nombre de jetons"""
+    nb_jetons = 0
+    with open(chemin, "w", encoding="utf-8") as f:
+        for _, texte in generer_documents(vocabulaire, sys.maxsize, 30, graine):
+            f.write(texte + "\n")
+            nb_jetons += texte.count(" ") + 1
+            if f.tell() >= taille:
+                return nb_jetons
+
+
+def memoire_max(qui):
+    """Mémoire résidente maximale (Mo) du processus ou du plus gros sous-processus"""
+    return resource.getrusage(qui).ru_maxrss / 1024
+
+
+def principal(argv=None):
+    parseur = argparse.ArgumentParser(description="Benchmark de la découverte de racines")
+    parseur.add_argument("--racines", type=int, default=5000)
+    parseur.add_argument("--vocabulaire", type=int, default=50000)
+    parseur.add_argument("--mo", type=int, default=50, help="taille du corpus (Mo)")
+    parseur.add_argument("--processus", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parseur.add_argument("--seuil", type=int, default=20)
+    parseur.add_argument("--graine", type=int, default=42)
+    args = parseur.parse_args(argv)
+
+    lexique = construire_lexique(args.racines, args.graine)
+    origine = {noeud.racine for noeud in lexique.arbre_racines.iterer_infixe()}
+    vocabulaire = generer_textes(list(lexique.arbre_racines.index_inverse), args.vocabulaire,
+                                 0.2, args.graine)
+    del lexique
+    moteur = creer_moteur()      # schèmes par défaut, aucune racine
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "corpus.txt")
+        nb_jetons = ecrire_corpus(chemin, vocabulaire, args.mo << 20, args.graine)
+        octets = os.path.getsize(chemin)
+        print(f"Corpus: {octets / 1e6:.0f} Mo, {nb_jetons:,} jetons ; "
+              f"{len(origine)} racines d'origine")
+
+        for processus in args.processus:
+            debut = time.perf_counter()
+            racines, compteur = decouvrir(moteur, [chemin], seuil=args.seuil,
+                                          processus=processus)
+            duree = time.perf_counter() - debut
+            trouvees = {racine for racine, _ in racines}
+            justes = len(trouvees & origine)
+            print(f"{processus} processus: {duree:.1f} s ({octets / 1e6 / duree:.1f} Mo/s, "
+                  f"{nb_jetons / duree:,.0f} jetons/s) ; {len(trouvees)} racines ≥ {args.seuil}, "
+                  f"rappel {justes / len(origine):.1%}, précision {justes / max(1, len(trouvees)):.1%} ; "
+                  f"{len(compteur):,} clés, sous-estimation max {compteur.erreur} ; mémoire max "
+                  f"{memoire_max(resource.RUSAGE_SELF):.0f} Mo "
+                  f"(sous-processus {memoire_max(resource.RUSAGE_CHILDREN):.0f} Mo)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'index de documents par racine (construction et recherche).
+
+    python -m benchmarks.documents
+    python -m benchmarks.documents --documents 1000000 --tampon 2000000
+
+Construit un lexique synthétique, puis un corpus de documents dont les
+mots (avec proclitiques et suffixes, voir benchmarks.affixes) suivent une
+loi de Zipf. Mesure le débit d'indexation (documents/s, jetons/s), la
+mémoire maximale du processus, la taille de l'index et la latence des
+requêtes d'un et de deux mots.
+"""
+import argparse
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+from src.index_documents import IndexDocuments, RacinesDesJetons, indexer
+
+from .affixes import generer_textes
+from .flou import construire_lexique
+
+
+def generer_documents(vocabulaire, nombre, longueur, graine):
+    """(nom, texte) de `nombre` documents d'environ `longueur` mots (loi de Zipf)"""
+    aleatoire = random.Random(graine)
+    cumuls = []
+    total = 0.0
+    for rang in range(1, len(vocabulaire) + 1):
+        total += 1.0 / rang
+        cumuls.append(total)
+    for numero in range(nombre):
+        taille = aleatoire.randint(longueur // 2, longueur * 3 // 2)
+        mots = aleatoire.choices(vocabulaire, cum_weights=cumuls, k=taille)
+        yield f"doc{numero}", " ".join(mots)
+
+
+def memoire_max():
+    """Mémoire résidente maximale du processus (Mo)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def latences(index, racines_du_jeton, requetes, k):
+    """Durées (ms) des requêtes, triées"""
+    durees = []
+    for requete in requetes:
+        debut = time.perf_counter()
+        index.rechercher(requete, racines_du_jeton, k)
+        durees.append((time.perf_counter() - debut) * 1000.0)
+    durees.sort()
+    return durees
+
+
+def principal(argv=None):
+    parseur = argparse.ArgumentParser(description="Benchmark de l'index de documents")
+    parseur.add_argument("--racines", type=int, default=5000)
+    parseur.add_argument("--vocabulaire", type=int, default=20000)
+    parseur.add_argument("--documents", type=int, default=50000)
+    parseur.add_argument("--longueur", type=int, default=30, help="mots par document (moyenne)")
+    parseur.add_argument("--tampon", type=int, default=1 << 20,
+                         help="occurrences gardées en mémoire avant écriture")
+    parseur.add_argument("--requetes", type=int, default=500)
+    parseur.add_argument("-k", type=int, default=10)
+    parseur.add_argument("--graine", type=int, default=42)
+    args = parseur.parse_args(argv)
+
+    moteur = construire_lexique(args.racines, args.graine)
+    vocabulaire = generer_textes(list(moteur.arbre_racines.index_inverse), args.vocabulaire,
+                                 0.1, args.graine)
+    memoire_avant = memoire_max()
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "corpus.ridx")
+        debut = time.perf_counter()
+        stats = indexer(moteur, generer_documents(vocabulaire, args.documents, args.longueur,
+                                                  args.graine), chemin, args.tampon)
+        duree = time.perf_counter() - debut
+        print(f"Indexation: {stats['documents']:,} documents, {stats['jetons']:,} jetons, "
+              f"{stats['racines']:,} racines en {duree:.1f} s "
+              f"({stats['documents'] / duree:,.0f} documents/s, {stats['jetons'] / duree:,.0f} jetons/s)")
+        print(f"Index: {stats['octets'] / 1e6:.1f} Mo ({stats['octets'] / max(1, stats['jetons']):.2f} "
+              f"octet(s)/jeton), {stats['fichiers_temporaires']} fichier(s) temporaire(s) ; "
+              f"mémoire max {memoire_max():.0f} Mo (avant indexation {memoire_avant:.0f} Mo)")
+
+        aleatoire = random.Random(args.graine)
+        racines_du_jeton = RacinesDesJetons(moteur)
+        with IndexDocuments(chemin) as index:
+            for nb_mots in (1, 2):
+                requetes = [" ".join(aleatoire.choices(vocabulaire[:2000], k=nb_mots))
+                            for _ in range(args.requetes)]
+                durees = latences(index, racines_du_jeton, requetes, args.k)
+                print(f"Requêtes de {nb_mots} mot(s): p50 {statistics.median(durees):.2f} ms, "
+                      f"p99 {durees[int(len(durees) * 0.99) - 1]:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Génération déterministe de données synthétiques pour les benchmarks"""
+import random
+
+# Les 28 lettres de l'alphabet arabe (consonnes radicales possibles)
+LETTRES = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+
+# Lettres servant d'affixes dans les schèmes (سألتمونيها)
+LETTRES_AFFIXES = "سألتمونيها"
+
+# Échelles standard des benchmarks (nombre de racines)
+ECHELLES = (1000, 10000, 100000)
+
+
+def generer_racines(nombre, graine=42):
+    """
+    Retourne `nombre` racines distinctes, toujours les mêmes pour une graine
+    donnée. Trilitères d'abord (28³ = 21 952 possibles), puis quadrilitères.
+    """
+    aleatoire = random.Random(graine)
+    racines = set()
+    longueur = 3
+    while len(racines) < nombre:
+        if longueur == 3 and len(racines) >= len(LETTRES) ** 3 * 0.9:
+            longueur = 4
+        racines.add("".join(aleatoire.choice(LETTRES) for _ in range(longueur)))
+    resultat = sorted(racines)
+    aleatoire.shuffle(resultat)
+    return resultat
+
+
+def alterer(mot, nb_fautes, aleatoire):
+    """Introduit `nb_fautes` fautes (substitution, suppression, insertion ou inversion)"""
+    for _ in range(nb_fautes):
+        i = aleatoire.randrange(len(mot))
+        operation = aleatoire.choice(("substitution", "suppression", "insertion", "inversion"))
+        if operation == "substitution":
+            mot = mot[:i] + aleatoire.choice(LETTRES) + mot[i + 1:]
+        elif operation == "suppression" and len(mot) > 2:
+            mot = mot[:i] + mot[i + 1:]
+        elif operation == "inversion" and i + 1 < len(mot):
+            mot = mot[:i] + mot[i + 1] + mot[i] + mot[i + 2:]
+        else:
+            mot = mot[:i] + aleatoire.choice(LETTRES) + mot[i:]
+    return mot
+
+
+def generer_schemes(nombre, graine=42):
+    """
+    Retourne `nombre` schèmes synthétiques distincts (cle, pattern, description).
+    Chaque pattern contient C1, C2, C3 dans l'ordre, entourés de lettres
+    d'affixe : préfixe (0-2 lettres), infixes (0-1) et suffixe (0-2 lettres).
+    """
+    aleatoire = random.Random(graine)
+    schemes = {}
+    while len(schemes) < nombre:
+        morceaux = []
+        for position in range(4):
+            maximum = 1 if position in (1, 2) else 2
+            morceaux.append("".join(aleatoire.choice(LETTRES_AFFIXES)
+                                    for _ in range(aleatoire.randint(0, maximum))))
+        pattern = f"{morceaux[0]}C1{morceaux[1]}C2{morceaux[2]}C3{morceaux[3]}"
+        cle = pattern.replace("C1", "ف").replace("C2", "ع").replace("C3", "ل")
+        if cle not in schemes:
+            schemes[cle] = (cle, pattern, "schème synthétique")
+    return list(schemes.values())
+
+
+def ecrire_racines(chemin, racines):
+    """Écrit un fichier de racines au format de data/racines.txt"""
+    with open(chemin, "w", encoding="utf-8") as f:
+        f.write("\n".join(racines))
+        f.write("\n")
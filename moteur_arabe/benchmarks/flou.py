@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la recherche approchée sur un lexique entièrement développé.
+
+    python -m benchmarks.flou
+    python -m benchmarks.flou --racines 20000 --requetes 5000 --distance 2
+
+Construit le lexique (racines × schèmes par défaut), puis mesure la latence
+des requêtes altérées de 0 à `distance` fautes. Objectif : < 1 ms par requête.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from .donnees import generer_racines, alterer
+from .scenarios import creer_moteur, developper
+
+
+def construire_lexique(nb_racines, graine):
+    """Charge les racines synthétiques et génère tous leurs dérivés"""
+    racines = generer_racines(nb_racines, graine)
+    moteur = creer_moteur(racines)
+    developper(moteur, racines)
+    return moteur
+
+
+def principal(argv=None):
+    parseur = argparse.ArgumentParser(description="Benchmark de la recherche approchée")
+    parseur.add_argument("--racines", type=int, default=20000)
+    parseur.add_argument("--requetes", type=int, default=5000)
+    parseur.add_argument("--distance", type=int, default=2)
+    parseur.add_argument("--graine", type=int, default=42)
+    args = parseur.parse_args(argv)
+
+    debut = time.perf_counter()
+    moteur = construire_lexique(args.racines, args.graine)
+    duree_lexique = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    recherche = moteur.recherche_floue()
+    duree_index = time.perf_counter() - debut
+    print(f"Lexique: {args.racines} racines, {len(moteur.arbre_racines.index_inverse)} mots "
+          f"({duree_lexique:.2f} s) ; index flou: {recherche.mots.nb_variantes()} "
+          f"variantes ({duree_index:.2f} s)")
+
+    aleatoire = random.Random(args.graine)
+    mots = list(moteur.arbre_racines.index_inverse)
+    requetes = [alterer(aleatoire.choice(mots), aleatoire.randint(0, args.distance), aleatoire)
+                for _ in range(args.requetes)]
+
+    latences = []
+    trouves = 0
+    for requete in requetes:
+        t0 = time.perf_counter()
+        resultats = recherche.chercher_mots(requete, args.distance)
+        latences.append((time.perf_counter() - t0) * 1000.0)
+        trouves += bool(resultats)
+
+    latences.sort()
+    p50 = statistics.median(latences)
+    p99 = latences[int(len(latences) * 0.99) - 1]
+    print(f"Requêtes: {len(requetes)} (k<={args.distance}), trouvées: {trouves}")
+    print(f"Latence: moyenne {statistics.fmean(latences):.3f} ms, "
+          f"p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+    return 0 if p50 < 1.0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Mémoire et latence de l'index inverse : dict de chaînes, IndexInverse par
+identifiants (l'index de l'arbre) et IndexCompact (DAWG).
+
+    python -m benchmarks.memoire_index
+    python -m benchmarks.memoire_index --racines 10000 100000 --requetes 20000
+
+Pour chaque taille, le lexique est entièrement développé (racines × schèmes
+par défaut). Chaque représentation est comptée avec le texte des mots : le
+dict avec ses objets str, l'IndexInverse dans la table des mots internés
+(TableMots), l'IndexCompact avec ses tableaux. Les latences portent sur
+des mots connus et inconnus mélangés.
+"""
+import argparse
+import random
+import sys
+import time
+
+from src.dawg import IndexCompact
+
+from .donnees import generer_racines
+from .scenarios import creer_moteur, developper
+
+
+def mesurer_recherches(index, requetes):
+    """Durée moyenne (µs) de index.get sur les requêtes"""
+    get = index.get
+    debut = time.perf_counter()
+    for mot in requetes:
+        get(mot)
+    return (time.perf_counter() - debut) / max(1, len(requetes)) * 1e6
+
+
+def principal(argv=None):
+    parseur = argparse.ArgumentParser(description="Mémoire de l'index inverse (dict / identifiants / DAWG)")
+    parseur.add_argument("--racines", type=int, nargs="+", default=[10000, 100000])
+    parseur.add_argument("--requetes", type=int, default=20000)
+    parseur.add_argument("--graine", type=int, default=42)
+    args = parseur.parse_args(argv)
+
+    for nb_racines in args.racines:
+        racines = generer_racines(nb_racines, args.graine)
+        moteur = creer_moteur(racines)
+        developper(moteur, racines)
+        arbre = moteur.arbre_racines
+        index = arbre.index_inverse
+        dictionnaire = dict(index.items())
+
+        debut = time.perf_counter()
+        compact = IndexCompact(index)
+        duree = time.perf_counter() - debut
+
+        aleatoire = random.Random(args.graine)
+        mots = list(index)
+        requetes = [aleatoire.choice(mots) + ("" if aleatoire.random() < 0.75 else "ز")
+                    for _ in range(args.requetes)]
+        assert all(compact.get(mot) == index.get(mot) == dictionnaire.get(mot) for mot in requetes)
+
+        octets_dict = sys.getsizeof(dictionnaire) + sum(sys.getsizeof(mot) for mot in dictionnaire)
+        octets_ids = arbre.symboles_mots.taille_octets() + index.taille_octets()
+        octets_compact = compact.taille_octets()
+        print(f"{nb_racines} racines, {len(index)} mots : "
+              f"dict {octets_dict / 1024:,.0f} Ko, identifiants {octets_ids / 1024:,.0f} Ko "
+              f"(x{octets_dict / octets_ids:.1f}), DAWG {octets_compact / 1024:,.0f} Ko "
+              f"(x{octets_dict / octets_compact:.1f}, {compact.mots.nb_etats()} états, "
+              f"construit en {duree:.2f} s) ; "
+              f"get {mesurer_recherches(dictionnaire, requetes):.2f} / "
+              f"{mesurer_recherches(index, requetes):.2f} / "
+              f"{mesurer_recherches(compact, requetes):.2f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
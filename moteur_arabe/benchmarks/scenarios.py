@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+Scénarios chronométrés du moteur à différentes échelles.
+
+    python -m benchmarks.scenarios
+    python -m benchmarks.scenarios --echelles 1000 10000 100000 --sortie avant.json
+    python -m benchmarks.scenarios --sortie apres.json --comparer avant.json --seuil 0.2
+
+Pour chaque scénario et chaque échelle : opérations/s, latences p50/p99 (µs)
+et pic mémoire (tracemalloc, mesuré dans une seconde passe pour ne pas
+fausser les temps). Le rapport JSON sert de référence de non-régression :
+avec --comparer, le script échoue si un débit baisse de plus de --seuil.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.arbre_abr import ArbreAVL
+from src.table_hachage import TableHachage
+from src.moteur import MoteurMorphologique
+
+from .donnees import ECHELLES, generer_racines, generer_schemes, ecrire_racines
+
+
+def creer_moteur(racines=(), schemes=None):
+    """Moteur silencieux chargé avec les racines et les schèmes donnés
+    (schèmes par défaut si `schemes` est None)"""
+    arbre = ArbreAVL(verbeux=False)
+    table = TableHachage(verbeux=False)
+    if schemes is None:
+        table.charger_schemes_par_defaut()
+    else:
+        for cle, pattern, description in schemes:
+            table.inserer(cle, pattern, description)
+
+    moteur = MoteurMorphologique(verbeux=False)
+    moteur.initialiser(arbre, table)
+    for racine in racines:
+        arbre.racine = arbre.inserer(arbre.racine, racine)
+    return moteur
+
+
+def cles_schemes(table):
+    """Liste des clés de la table des schèmes (une clé redéfinie une seule fois)"""
+    return list(dict.fromkeys(entree.cle for entree in table.iterer()))
+
+
+def developper(moteur, racines):
+    """Génère tous les dérivés (racine × schème) ; retourne [(mot, racine)]"""
+    mots = []
+    cles = cles_schemes(moteur.table_schemes)
+    for racine in racines:
+        for cle in cles:
+            mot = moteur.generer_mot(racine, cle)
+            if mot:
+                mots.append((mot, racine))
+    return mots
+
+
+def chronometrer(operation, arguments):
+    """Exécute operation(*args) pour chaque args ; retourne les durées (s)"""
+    horloge = time.perf_counter
+    durees = []
+    for args in arguments:
+        debut = horloge()
+        operation(*args)
+        durees.append(horloge() - debut)
+    return durees
+
+
+# ============ SCÉNARIOS ============
+# Chaque scénario reçoit (contexte, nb_operations) et retourne une fonction
+# sans argument qui exécute les opérations et retourne la liste des durées.
+
+def scenario_charger(contexte, nb_operations):
+    """ArbreAVL.charger_depuis_fichier : une opération = un chargement complet"""
+    chemin = contexte["fichier_racines"]
+
+    def executer():
+        return chronometrer(lambda: ArbreAVL(verbeux=False).charger_depuis_fichier(chemin),
+                            [()] * contexte["repetitions"])
+    return executer
+
+
+def scenario_generer_mot(contexte, nb_operations):
+    """MoteurMorphologique.generer_mot sur des couples (racine, schème) aléatoires"""
+    moteur = creer_moteur(contexte["racines"], contexte["schemes"])
+    aleatoire = random.Random(contexte["graine"])
+    cles = cles_schemes(moteur.table_schemes)
+    couples = [(aleatoire.choice(contexte["racines"]), aleatoire.choice(cles))
+               for _ in range(nb_operations)]
+    return lambda: chronometrer(moteur.generer_mot, couples)
+
+
+def _mots_a_valider(contexte, nb_operations):
+    """Couples (mot, racine) : 3/4 valides (générés ailleurs), 1/4 invalides"""
+    reference = creer_moteur(contexte["racines"], contexte["schemes"])
+    aleatoire = random.Random(contexte["graine"])
+    cles = cles_schemes(reference.table_schemes)
+    couples = []
+    for _ in range(nb_operations):
+        racine = aleatoire.choice(contexte["racines"])
+        mot = reference.generer_mot(racine, aleatoire.choice(cles))
+        if aleatoire.random() < 0.25:
+            racine = aleatoire.choice(contexte["racines"])
+        couples.append((mot, racine))
+    return couples
+
+
+def scenario_valider_mot_balayage(contexte, nb_operations):
+    """valider_mot sur un lexique sans dérivés : l'index inverse échoue, le
+    transducteur lit la forme (scheme_pour) et le mot est enregistré"""
+    moteur = creer_moteur(contexte["racines"], contexte["schemes"])
+    couples = _mots_a_valider(contexte, nb_operations)
+    return lambda: chronometrer(moteur.valider_mot, couples)
+
+
+def scenario_valider_mot_index(contexte, nb_operations):
+    """valider_mot sur un lexique développé : réponse via l'index inverse"""
+    moteur = creer_moteur(contexte["racines"], contexte["schemes"])
+    developper(moteur, contexte["racines"])
+    couples = _mots_a_valider(contexte, nb_operations)
+    return lambda: chronometrer(moteur.valider_mot, couples)
+
+
+def scenario_generer_tous_derives(contexte, nb_operations):
+    """generer_tous_dérivés : une opération = tous les schèmes d'une racine"""
+    moteur = creer_moteur(contexte["racines"], contexte["schemes"])
+    aleatoire = random.Random(contexte["graine"])
+    racines = [(aleatoire.choice(contexte["racines"]),)
+               for _ in range(max(1, nb_operations // 10))]
+    return lambda: chronometrer(moteur.generer_tous_dérivés, racines)
+
+
+def scenario_trouver_racine(contexte, nb_operations):
+    """ArbreAVL.trouver_racine_du_mot : 3/4 mots connus, 1/4 inconnus"""
+    moteur = creer_moteur(contexte["racines"], contexte["schemes"])
+    mots = developper(moteur, contexte["racines"])
+    aleatoire = random.Random(contexte["graine"])
+    requetes = [(aleatoire.choice(mots)[0] if aleatoire.random() < 0.75
+                 else aleatoire.choice(mots)[0] + "ز",)
+                for _ in range(nb_operations)]
+    return lambda: chronometrer(moteur.arbre_racines.trouver_racine_du_mot, requetes)
+
+
+def scenario_etendre(contexte, nb_operations):
+    """MoteurMorphologique.etendre (mot → racine, famille en cache) : mots connus"""
+    moteur = creer_moteur(contexte["racines"], contexte["schemes"])
+    mots = developper(moteur, contexte["racines"])
+    aleatoire = random.Random(contexte["graine"])
+    requetes = [(aleatoire.choice(mots)[0],) for _ in range(nb_operations)]
+    for mot, in requetes:       # familles calculées hors mesure
+        moteur.etendre(mot)
+    return lambda: chronometrer(moteur.etendre, requetes)
+
+
+def scenario_supprimer(contexte, nb_operations):
+    """ArbreAVL.supprimer de racines distinctes sur un lexique développé"""
+    moteur = creer_moteur(contexte["racines"], contexte["schemes"])
+    developper(moteur, contexte["racines"])
+    arbre = moteur.arbre_racines
+    aleatoire = random.Random(contexte["graine"])
+    cibles = aleatoire.sample(contexte["racines"], min(nb_operations, len(contexte["racines"])))
+
+    def supprimer(racine):
+        arbre.racine = arbre.supprimer(arbre.racine, racine)
+
+    return lambda: chronometrer(supprimer, [(r,) for r in cibles])
+
+
+def scenario_supprimer_lot(contexte, nb_operations):
+    """ArbreAVL.supprimer_lot : une opération = un lot de nb_operations racines"""
+    moteur = creer_moteur(contexte["racines"], contexte["schemes"])
+    developper(moteur, contexte["racines"])
+    arbre = moteur.arbre_racines
+    aleatoire = random.Random(contexte["graine"])
+    cibles = aleatoire.sample(contexte["racines"], min(nb_operations, len(contexte["racines"])))
+    return lambda: chronometrer(arbre.supprimer_lot, [(cibles,)])
+
+
+SCENARIOS = {
+    "charger_depuis_fichier": scenario_charger,
+    "generer_mot": scenario_generer_mot,
+    "valider_mot_balayage": scenario_valider_mot_balayage,
+    "valider_mot_index": scenario_valider_mot_index,
+    "generer_tous_derives": scenario_generer_tous_derives,
+    "trouver_racine_du_mot": scenario_trouver_racine,
+    "etendre": scenario_etendre,
+    "supprimer": scenario_supprimer,
+    "supprimer_lot": scenario_supprimer_lot,
+}
+
+
+# ============ MESURE ET RAPPORT ============
+
+def percentile(durees_triees, p):
+    """Percentile p (0-100) d'une liste triée (méthode du rang le plus proche)"""
+    if not durees_triees:
+        return 0.0
+    rang = max(0, min(len(durees_triees) - 1, round(p / 100 * len(durees_triees)) - 1))
+    return durees_triees[rang]
+
+
+def mesurer(nom, echelle, contexte, nb_operations, memoire=True):
+    """Exécute un scénario : passe chronométrée, puis passe mémoire"""
+    fabrique = SCENARIOS[nom]
+
+    durees = sorted(fabrique(contexte, nb_operations)())
+    total = sum(durees)
+
+    pic = None
+    if memoire:
+        executer = fabrique(contexte, nb_operations)
+        tracemalloc.start()
+        try:
+            executer()
+            pic = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "scenario": nom,
+        "echelle": echelle,
+        "operations": len(durees),
+        "ops_par_seconde": round(len(durees) / total, 1) if total > 0 else None,
+        "p50_us": round(percentile(durees, 50) * 1e6, 2),
+        "p99_us": round(percentile(durees, 99) * 1e6, 2),
+        "pic_memoire_ko": round(pic / 1024, 1) if pic is not None else None,
+    }
+
+
+def comparer(resultats, reference, seuil):
+    """Affiche les écarts de débit ; retourne le nombre de régressions > seuil"""
+    anciens = {(r["scenario"], r["echelle"]): r for r in reference["resultats"]}
+    regressions = 0
+    for r in resultats:
+        ancien = anciens.get((r["scenario"], r["echelle"]))
+        if not ancien or not ancien["ops_par_seconde"] or not r["ops_par_seconde"]:
+            continue
+        rapport = r["ops_par_seconde"] / ancien["ops_par_seconde"]
+        marque = "✅"
+        if rapport < 1 - seuil:
+            marque = "❌"
+            regressions += 1
+        print(f"{marque} {r['scenario']:<24} {r['echelle']:>7} : x{rapport:.2f}", file=sys.stderr)
+    return regressions
+
+
+def principal(argv=None):
+    parseur = argparse.ArgumentParser(description="Benchmarks du moteur morphologique")
+    parseur.add_argument("--echelles", type=int, nargs="+", default=list(ECHELLES[:2]),
+                         help="nombres de racines (défaut: 1000 10000)")
+    parseur.add_argument("--operations", type=int, default=5000,
+                         help="opérations chronométrées par scénario")
+    parseur.add_argument("--schemes", type=int, default=0,
+                         help="nombre de schèmes synthétiques (0 = schèmes par défaut)")
+    parseur.add_argument("--repetitions", type=int, default=3,
+                         help="chargements complets pour charger_depuis_fichier")
+    parseur.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS),
+                         default=list(SCENARIOS))
+    parseur.add_argument("--graine", type=int, default=42)
+    parseur.add_argument("--sans-memoire", action="store_true",
+                         help="ne mesure pas le pic mémoire (plus rapide)")
+    parseur.add_argument("--sortie", help="fichier JSON du rapport (défaut: stdout)")
+    parseur.add_argument("--comparer", help="rapport JSON de référence")
+    parseur.add_argument("--seuil", type=float, default=0.2,
+                         help="baisse de débit tolérée avec --comparer (défaut: 0.2)")
+    args = parseur.parse_args(argv)
+
+    schemes = generer_schemes(args.schemes, args.graine) if args.schemes else None
+    resultats = []
+
+    with tempfile.TemporaryDirectory() as dossier:
+        for echelle in args.echelles:
+            racines = generer_racines(echelle, args.graine)
+            fichier = os.path.join(dossier, f"racines_{echelle}.txt")
+            ecrire_racines(fichier, racines)
+            contexte = {
+                "racines": racines,
+                "schemes": schemes,
+                "fichier_racines": fichier,
+                "repetitions": args.repetitions,
+                "graine": args.graine,
+            }
+            for nom in args.scenarios:
+                resultat = mesurer(nom, echelle, contexte, args.operations,
+                                   memoire=not args.sans_memoire)
+                resultats.append(resultat)
+                print(f"⏱️  {nom:<24} {echelle:>7} : {resultat['ops_par_seconde']:>12,.0f} ops/s"
+                      f"  p50 {resultat['p50_us']:>9.1f} µs  p99 {resultat['p99_us']:>9.1f} µs",
+                      file=sys.stderr)
+
+    rapport = {
+        "meta": {
+            "python": platform.python_version(),
+            "plateforme": platform.platform(),
+            "graine": args.graine,
+            "operations": args.operations,
+            "schemes": args.schemes or "defaut",
+        },
+        "resultats": resultats,
+    }
+
+    texte = json.dumps(rapport, ensure_ascii=False, indent=2)
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            f.write(texte + "\n")
+    else:
+        print(texte)
+
+    if args.comparer:
+        with open(args.comparer, encoding="utf-8") as f:
+            reference = json.load(f)
+        if comparer(resultats, reference, args.seuil):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
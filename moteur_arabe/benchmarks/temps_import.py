@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Mesure du temps d'import (python -X importtime) des points d'entrée sans GUI.
+
+    python -m benchmarks.temps_import
+    python -m benchmarks.temps_import --repetitions 10 --facteur 2
+
+Chaque module est importé dans un interpréteur neuf ; on garde la médiane
+du temps cumulé. Le script échoue (code 1) si un budget est dépassé ou si
+un module de l'interface graphique (flet) est importé.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Module importé → budget du temps cumulé en millisecondes
+BUDGETS_MS = {
+    "src": 5.0,
+    "src.moteur": 25.0,
+    "src.lot": 60.0,
+}
+
+# Modules qui ne doivent jamais être chargés hors interface graphique
+MODULES_INTERDITS = ("flet",)
+
+DOSSIER_PROJET = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def mesurer(module):
+    """Importe `module` dans un nouvel interpréteur et retourne
+    (temps cumulé en ms, liste des modules chargés)"""
+    resultat = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=DOSSIER_PROJET, capture_output=True, text=True, check=True
+    )
+
+    cumule_us = None
+    charges = []
+    for ligne in resultat.stderr.splitlines():
+        if not ligne.startswith("import time:") or "|" not in ligne:
+            continue
+        _, cumule, nom = ligne.split("|")
+        nom = nom.strip()
+        charges.append(nom)
+        if nom == module:
+            cumule_us = int(cumule)
+
+    if cumule_us is None:
+        raise RuntimeError(f"Temps d'import introuvable pour '{module}'")
+    return cumule_us / 1000.0, charges
+
+
+def principal(argv=None):
+    parseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parseur.add_argument("--repetitions", type=int, default=5,
+                         help="nombre de mesures par module (médiane)")
+    parseur.add_argument("--facteur", type=float, default=1.0,
+                         help="multiplie les budgets (machines lentes / CI)")
+    args = parseur.parse_args(argv)
+
+    echecs = 0
+    for module, budget in BUDGETS_MS.items():
+        mesures = []
+        for _ in range(args.repetitions):
+            duree, charges = mesurer(module)
+            mesures.append(duree)
+
+        interdits = sorted({nom for nom in charges
+                            if nom.split(".")[0] in MODULES_INTERDITS})
+        mediane = statistics.median(mesures)
+        limite = budget * args.facteur
+
+        if interdits:
+            echecs += 1
+            print(f"❌ {module}: importe {', '.join(interdits)}")
+        elif mediane > limite:
+            echecs += 1
+            print(f"❌ {module}: {mediane:.1f} ms > budget {limite:.1f} ms")
+        else:
+            print(f"✅ {module}: {mediane:.1f} ms (budget {limite:.1f} ms)")
+
+    return 1 if echecs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Moteur morphologique arabe.
+
+Les composants sont chargés à la demande : `from src import MoteurMorphologique`
+n'importe que le moteur et ses structures, jamais l'interface graphique (flet)
+ni les modules optionnels tant qu'on ne les utilise pas.
+"""
+import importlib
+
+# Nom public → module (relatif au paquet) qui le définit
+_COMPOSANTS = {
+    "ArbreAVL": ".arbre_abr",
+    "NoeudAVL": ".arbre_abr",
+    "TableHachage": ".table_hachage",
+    "EntreeScheme": ".table_hachage",
+    "MoteurMorphologique": ".moteur",
+    "InterfaceCLI": ".interface",
+    "InterfaceLot": ".lot",
+    "RechercheFloue": ".recherche_floue",
+    "IndexFlou": ".recherche_floue",
+    "Metriques": ".metriques",
+    "Journal": ".journal",
+    "StockageMemoire": ".stockage",
+    "StockageSQLite": ".stockage_sqlite",
+    "ouvrir_stockage": ".stockage",
+    "Transducteur": ".transducteur",
+    "AnalyseurAffixes": ".affixes",
+    "CacheFamilles": ".familles",
+    "Dawg": ".dawg",
+    "IndexCompact": ".dawg",
+    "TableSymboles": ".symboles",
+    "TableMots": ".symboles",
+    "IndexInverse": ".symboles",
+    "AnalysesMultiples": ".symboles",
+    "IndexDocuments": ".index_documents",
+    "indexer": ".index_documents",
+    "CompteurBorne": ".decouverte",
+    "decouvrir": ".decouverte",
+    "Profileur": ".profilage",
+    "exporter": ".export",
+    "importer": ".export",
+}
+
+__all__ = sorted(_COMPOSANTS)
+
+
+def __getattr__(nom):
+    """Importe paresseusement le module d'un composant au premier accès"""
+    module = _COMPOSANTS.get(nom)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    valeur = getattr(importlib.import_module(module, __name__), nom)
+    globals()[nom] = valeur
+    return valeur
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
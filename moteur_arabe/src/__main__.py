@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Point d'entrée `python -m src` (depuis le dossier moteur_arabe/).
+
+Sans argument : menu interactif (InterfaceCLI).
+Avec une sous-commande : mode lot (voir src/lot.py).
+"""
+import sys
+
+
+def principal(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        from .lot import principal as principal_lot
+        return principal_lot(argv)
+
+    from .interface import InterfaceCLI
+    InterfaceCLI().executer()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Découpage des affixes d'un mot de texte : proclitiques + tige + suffixes.
+
+Les mots d'un corpus portent des proclitiques (و، ف، ب، ك، ل، س، ال) et des
+suffixes (ات، ون، ة، ها، هم...) qu'aucun schème ne décrit : il faut les
+retirer avant de chercher la racine de la tige. Les affixes valides sont
+compilés une fois en deux arbres de préfixes (trie) :
+
+    préfixes   lus depuis le début du mot    وبال، فس، لل...
+    suffixes   lus depuis la fin du mot      ها، تها، ونها...
+
+Chaque affixe porte les classes de mots qu'il accepte (NOM, VERBE). Un
+découpage n'est gardé que si la tige garde au moins TIGE_MIN lettres, si
+le préfixe et le suffixe ont une classe en commun et si l'article ne se
+combine pas avec un pronom suffixe (ال + كتاب + ها n'est pas proposé). Le ta marbuta
+devenu ت devant un pronom est rétabli : مكتبتها → مكتبة + ها.
+
+Les découpages sont rendus du plus court au plus long (mot entier
+d'abord) : quelques candidats par mot, pas le produit de tous les affixes.
+"""
+from .utils import retirer_diacritiques
+
+NOM = 1
+VERBE = 2
+TOUTES = NOM | VERBE
+
+TIGE_MIN = 3      # lettres minimum de la tige (racines trilitères)
+
+CONJONCTIONS = ("و", "ف")
+PREPOSITIONS = ("ب", "ك", "ل")   # ل (lam de but) se place aussi devant un verbe
+FUTUR = "س"
+ARTICLE = "ال"
+
+# Suffixes de flexion sans pronom
+FLEXIONS_NOM = ("ة", "ات", "ان", "ين", "ون", "تان", "تين")
+FLEXIONS_VERBE = ("ت", "تم", "تما", "تن", "نا", "وا", "ون", "ان", "ن")
+# Devant un pronom : forme de la flexion → lettres rendues à la tige
+LIAISONS_NOM = (("", ""), ("ت", "ة"), ("ات", ""), ("و", ""), ("ا", ""), ("ي", ""))
+LIAISONS_VERBE = (("", ""), ("ت", ""), ("تم", ""), ("نا", ""), ("و", ""), ("ا", ""))
+PRONOMS_NOM = ("ه", "ها", "هم", "هما", "هن", "ك", "كم", "كن", "ي", "نا")
+PRONOMS_VERBE = ("ه", "ها", "هم", "هما", "هن", "ك", "كم", "كن", "ني", "نا")
+
+
+def inventaire_prefixes():
+    """{préfixe: (classes, article)} : enchaînements valides de proclitiques"""
+    prefixes = {}
+
+    def ajouter(prefixe, classes, article=False):
+        ancien = prefixes.get(prefixe, (0, article))
+        prefixes[prefixe] = (ancien[0] | classes, article)
+
+    for conjonction in ("",) + CONJONCTIONS:
+        ajouter(conjonction, TOUTES)
+        ajouter(conjonction + ARTICLE, NOM, True)
+        ajouter(conjonction + FUTUR, VERBE)
+        for preposition in PREPOSITIONS:
+            ajouter(conjonction + preposition, TOUTES if preposition == "ل" else NOM)
+            # ل + ال s'écrit لل
+            article = "ل" if preposition == "ل" else ARTICLE
+            ajouter(conjonction + preposition + article, NOM, True)
+    return prefixes
+
+
+def inventaire_suffixes():
+    """{(suffixe, ajout à la tige, pronom): classes} : flexions et pronoms valides"""
+    suffixes = {}
+
+    def ajouter(suffixe, ajout, pronom, classes):
+        cle = (suffixe, ajout, pronom)
+        suffixes[cle] = suffixes.get(cle, 0) | classes
+
+    ajouter("", "", False, TOUTES)
+    for classes, flexions, liaisons, pronoms in (
+            (NOM, FLEXIONS_NOM, LIAISONS_NOM, PRONOMS_NOM),
+            (VERBE, FLEXIONS_VERBE, LIAISONS_VERBE, PRONOMS_VERBE)):
+        for flexion in flexions:
+            ajouter(flexion, "", False, classes)
+        for liaison, ajout in liaisons:
+            for pronom in pronoms:
+                ajouter(liaison + pronom, ajout, True, classes)
+    return suffixes
+
+
+class _Trie:
+    """Arbre de préfixes aplati : état → {lettre: état}, état → entrées"""
+
+    def __init__(self):
+        self.transitions = [{}]
+        self.sorties = [[]]
+
+    def inserer(self, chaine, entree):
+        etat = 0
+        for lettre in chaine:
+            suivant = self.transitions[etat].get(lettre)
+            if suivant is None:
+                suivant = self.transitions[etat][lettre] = len(self.transitions)
+                self.transitions.append({})
+                self.sorties.append([])
+            etat = suivant
+        self.sorties[etat].append(entree)
+
+
+class AnalyseurAffixes:
+    """Découpages (préfixe, tige, suffixe) plausibles d'un mot de texte"""
+
+    def __init__(self, tige_min=TIGE_MIN):
+        self.tige_min = tige_min
+        self.prefixes = _Trie()
+        for prefixe, (classes, article) in inventaire_prefixes().items():
+            self.prefixes.inserer(prefixe, (prefixe, classes, article))
+        # Les suffixes sont lus à l'envers, depuis la dernière lettre
+        self.suffixes = _Trie()
+        for (suffixe, ajout, pronom), classes in inventaire_suffixes().items():
+            self.suffixes.inserer(suffixe[::-1], (suffixe, classes, pronom, ajout))
+
+    def _prefixes(self, mot, limite):
+        """Entrées du trie des préfixes rencontrées en lisant au plus `limite` lettres"""
+        transitions, sorties = self.prefixes.transitions, self.prefixes.sorties
+        trouves = list(sorties[0])
+        etat = 0
+        for lettre in mot[:limite]:
+            etat = transitions[etat].get(lettre)
+            if etat is None:
+                break
+            trouves.extend(sorties[etat])
+        return trouves
+
+    def _suffixes(self, mot, limite):
+        """Entrées du trie des suffixes, en lisant le mot depuis la fin"""
+        transitions, sorties = self.suffixes.transitions, self.suffixes.sorties
+        trouves = list(sorties[0])
+        etat = 0
+        for i in range(len(mot) - 1, len(mot) - 1 - limite, -1):
+            etat = transitions[etat].get(mot[i])
+            if etat is None:
+                break
+            trouves.extend(sorties[etat])
+        return trouves
+
+    def decouper(self, mot):
+        """
+        [(préfixe, tige, suffixe)] du mot sans diacritiques, mot entier
+        d'abord puis par nombre croissant de lettres retirées ; une tige
+        n'apparaît qu'une fois
+        """
+        mot = retirer_diacritiques(mot)
+        limite = len(mot) - self.tige_min
+        if limite <= 0:
+            return [("", mot, "")]
+        prefixes = self._prefixes(mot, limite)
+        suffixes = self._suffixes(mot, limite)
+        candidats = []
+        for prefixe, classes_p, article in prefixes:
+            reste = limite - len(prefixe)
+            for suffixe, classes_s, pronom, ajout in suffixes:
+                if (len(suffixe) > reste or not classes_p & classes_s
+                        or (article and pronom)):
+                    continue
+                tige = mot[len(prefixe):len(mot) - len(suffixe)] + ajout
+                candidats.append((len(prefixe) + len(suffixe), prefixe, tige, suffixe))
+        candidats.sort(key=lambda c: c[0])
+        vues = set()
+        resultats = []
+        for _, prefixe, tige, suffixe in candidats:
+            if tige not in vues:
+                vues.add(tige)
+                resultats.append((prefixe, tige, suffixe))
+        return resultats
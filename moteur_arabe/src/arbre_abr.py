@@ -1,210 +1,741 @@
-# -*- coding: utf-8 -*-
-class NoeudAVL:
-    """Nœud de l'arbre AVL pour une racine arabe"""
-    
-    def __init__(self, racine):
-        self.racine = racine          # Racine arabe (ex: "كتب")
-        self.derivees = []            # Liste des mots dérivés
-        self.gauche = None            # Sous-arbre gauche
-        self.droite = None            # Sous-arbre droit
-        self.hauteur = 1              # Hauteur pour AVL
-
-class ArbreAVL:
-    """Arbre AVL pour gérer les racines arabes avec index inverse"""
-    
-    def __init__(self):
-        self.racine = None
-        self.index_inverse = {}       # mot → racine (TRÈS IMPORTANT !)
-    
-    def hauteur(self, noeud):
-        """Retourne la hauteur d'un nœud"""
-        return noeud.hauteur if noeud else 0
-    
-    def equilibre(self, noeud):
-        """Calcule le facteur d'équilibre"""
-        return self.hauteur(noeud.gauche) - self.hauteur(noeud.droite) if noeud else 0
-    
-    def rotation_droite(self, z):
-        """Rotation droite AVL"""
-        y = z.gauche
-        T2 = y.droite
-        y.droite = z
-        z.gauche = T2
-        z.hauteur = 1 + max(self.hauteur(z.gauche), self.hauteur(z.droite))
-        y.hauteur = 1 + max(self.hauteur(y.gauche), self.hauteur(y.droite))
-        return y
-    
-    def rotation_gauche(self, z):
-        """Rotation gauche AVL"""
-        y = z.droite
-        T2 = y.gauche
-        y.gauche = z
-        z.droite = T2
-        z.hauteur = 1 + max(self.hauteur(z.gauche), self.hauteur(z.droite))
-        y.hauteur = 1 + max(self.hauteur(y.gauche), self.hauteur(y.droite))
-        return y
-    
-    def inserer(self, noeud, racine):
-        """Insère une nouvelle racine"""
-        if not noeud:
-            return NoeudAVL(racine)
-        
-        if racine < noeud.racine:
-            noeud.gauche = self.inserer(noeud.gauche, racine)
-        elif racine > noeud.racine:
-            noeud.droite = self.inserer(noeud.droite, racine)
-        else:
-            return noeud  # Racine déjà présente
-        
-        noeud.hauteur = 1 + max(self.hauteur(noeud.gauche), 
-                               self.hauteur(noeud.droite))
-        
-        balance = self.equilibre(noeud)
-        
-        # Cas Gauche-Gauche
-        if balance > 1 and racine < noeud.gauche.racine:
-            return self.rotation_droite(noeud)
-        
-        # Cas Droite-Droite
-        if balance < -1 and racine > noeud.droite.racine:
-            return self.rotation_gauche(noeud)
-        
-        # Cas Gauche-Droite
-        if balance > 1 and racine > noeud.gauche.racine:
-            noeud.gauche = self.rotation_gauche(noeud.gauche)
-            return self.rotation_droite(noeud)
-        
-        # Cas Droite-Gauche
-        if balance < -1 and racine < noeud.droite.racine:
-            noeud.droite = self.rotation_droite(noeud.droite)
-            return self.rotation_gauche(noeud)
-        
-        return noeud
-    
-    def rechercher(self, noeud, racine):
-        """Recherche une racine dans l'arbre"""
-        if not noeud or racine == noeud.racine:
-            return noeud
-        
-        if racine < noeud.racine:
-            return self.rechercher(noeud.gauche, racine)
-        
-        return self.rechercher(noeud.droite, racine)
-    
-    def ajouter_derive(self, racine, mot, scheme=None):
-        """Ajoute un dérivé à une racine"""
-        noeud = self.rechercher(self.racine, racine)
-        if not noeud:
-            return False
-        
-        # Ajoute à la liste des dérivés
-        if mot not in noeud.derivees:
-            noeud.derivees.append(mot)
-            
-            # MET À JOUR L'INDEX INVERSE (IMPORTANT !)
-            self.index_inverse[mot] = racine
-            
-            return True
-        return False
-    
-    def trouver_racine_du_mot(self, mot):
-        """
-        Trouve la racine d'un mot
-        Complexité O(1) grâce à index_inverse !
-        """
-        return self.index_inverse.get(mot)
-    
-    def afficher_infixe(self, noeud):
-        """Affiche toutes les racines triées"""
-        if noeud:
-            self.afficher_infixe(noeud.gauche)
-            print(f"  - {noeud.racine} ({len(noeud.derivees)} dérivés)")
-            self.afficher_infixe(noeud.droite)
-    
-    def charger_depuis_fichier(self, nom_fichier):
-        """Charge les racines depuis un fichier texte"""
-        try:
-            with open(nom_fichier, 'r', encoding='utf-8') as f:
-                for ligne in f:
-                    racine = ligne.strip()
-                    if racine and len(racine) >= 3:
-                        self.racine = self.inserer(self.racine, racine)
-            print(f"✅ Racines chargées depuis '{nom_fichier}'")
-        except FileNotFoundError:
-            print(f"❌ Fichier '{nom_fichier}' non trouvé")
-    
-    def compter_noeuds(self, noeud):
-        """Compte le nombre de racines"""
-        if not noeud:
-            return 0
-        return 1 + self.compter_noeuds(noeud.gauche) + self.compter_noeuds(noeud.droite)
-    def trouver_min(self, noeud):
-        """Trouve le nœud avec la valeur minimale"""
-        current = noeud
-        while current.gauche:
-            current = current.gauche
-        return current
-    
-    def supprimer(self, noeud, racine):
-        """Supprime une racine de l'arbre AVL"""
-        if not noeud:
-            return noeud
-        
-        # Étape 1 : suppression standard BST
-        if racine < noeud.racine:
-            noeud.gauche = self.supprimer(noeud.gauche, racine)
-        elif racine > noeud.racine:
-            noeud.droite = self.supprimer(noeud.droite, racine)
-        else:
-            # Nœud à supprimer trouvé
-            
-            # Supprimer de l'index inverse tous les dérivés
-            for mot in noeud.derivees:
-                if mot in self.index_inverse:
-                    del self.index_inverse[mot]
-            
-            # Nœud avec un seul enfant ou sans enfant
-            if not noeud.gauche:
-                temp = noeud.droite
-                noeud = None
-                return temp
-            elif not noeud.droite:
-                temp = noeud.gauche
-                noeud = None
-                return temp
-            
-            # Nœud avec deux enfants
-            temp = self.trouver_min(noeud.droite)
-            noeud.racine = temp.racine
-            noeud.derivees = temp.derivees
-            noeud.droite = self.supprimer(noeud.droite, temp.racine)
-        
-        if not noeud:
-            return noeud
-        
-        # Étape 2 : mettre à jour la hauteur
-        noeud.hauteur = 1 + max(self.hauteur(noeud.gauche),
-                               self.hauteur(noeud.droite))
-        
-        # Étape 3 : rééquilibrer l'arbre
-        balance = self.equilibre(noeud)
-        
-        # Cas Gauche-Gauche
-        if balance > 1 and self.equilibre(noeud.gauche) >= 0:
-            return self.rotation_droite(noeud)
-        
-        # Cas Gauche-Droite
-        if balance > 1 and self.equilibre(noeud.gauche) < 0:
-            noeud.gauche = self.rotation_gauche(noeud.gauche)
-            return self.rotation_droite(noeud)
-        
-        # Cas Droite-Droite
-        if balance < -1 and self.equilibre(noeud.droite) <= 0:
-            return self.rotation_gauche(noeud)
-        
-        # Cas Droite-Gauche
-        if balance < -1 and self.equilibre(noeud.droite) > 0:
-            noeud.droite = self.rotation_droite(noeud.droite)
-            return self.rotation_gauche(noeud)
-        
+# -*- coding: utf-8 -*-
+from array import array
+from itertools import islice
+
+from .symboles import (MASQUE_RACINE, AnalysesMultiples, CasesDuScheme, IndexInverse, TableMots,
+                       TableSymboles)
+from .utils import retirer_diacritiques
+
+# Caractère plus grand que toute lettre : borne supérieure d'un préfixe
+_FIN_PREFIXE = chr(0x10FFFF)
+# Les ids de schème tiennent sur 16 bits (ids_schemes en array('H'), analyses multiples)
+NB_MAX_SCHEMES = 0xFFFF
+
+class NoeudAVL:
+    """Nœud de l'arbre AVL pour une racine arabe"""
+    __slots__ = ("racine", "id_racine", "ids_derives", "ids_schemes", "symboles_mots",
+                 "gauche", "droite", "hauteur", "taille")
+    
+    def __init__(self, racine, id_racine=0, symboles_mots=None):
+        self.racine = racine          # Racine arabe (ex: "كتب")
+        self.id_racine = id_racine    # Identifiant de la racine (voir symboles.py)
+        self.ids_derives = array('I') # Identifiants des mots dérivés
+        self.ids_schemes = array('H') # Schème de chaque dérivé (même ordre, 0 = inconnu)
+        self.symboles_mots = symboles_mots if symboles_mots is not None else TableMots()
+        self.gauche = None            # Sous-arbre gauche
+        self.droite = None            # Sous-arbre droit
+        self.hauteur = 1              # Hauteur pour AVL
+        self.taille = 1               # Nombre de nœuds du sous-arbre (rang / k-ième)
+    
+    @property
+    def derivees(self):
+        """Liste des mots dérivés (chaînes reconstituées à partir des identifiants)"""
+        chaine = self.symboles_mots.chaine
+        return [chaine(i) for i in self.ids_derives]
+
+class ArbreAVL:
+    """Arbre AVL pour gérer les racines arabes avec index inverse"""
+    
+    def __init__(self, verbeux=True):
+        self.racine = None
+        # Mots et racines sont internés : l'arbre ne stocke que leurs identifiants
+        self.symboles_mots = TableMots()
+        self.symboles_racines = TableSymboles()
+        self.index_inverse = IndexInverse(self.symboles_mots, self.symboles_racines)  # mot → racine (TRÈS IMPORTANT !)
+        self.index_normalise = {}     # mot sans diacritiques → formes vocalisées connues
+        # Mots de plusieurs racines : toutes leurs analyses (racine, schème)
+        self.analyses_multiples = AnalysesMultiples()
+        self.verbeux = verbeux        # False en mode lot (pas d'affichage)
+        self.observateurs = []        # Index secondaires tenus à jour (ex: recherche floue)
+        # Compteurs tenus à jour à chaque modification (statistiques en O(1))
+        self.nb_derives = 0           # Somme des dérivés de toutes les racines
+        self.usage_schemes = {}       # clé du schème → nombre de dérivés produits
+        # Schèmes des dérivés : numérotés pour être stockés sur 2 octets par dérivé
+        self.cles_schemes = [None]    # id → clé du schème (0 = inconnu)
+        self.ids_par_cle = {}         # clé du schème → id
+        # clé du schème → CasesDuScheme des dérivés (id du mot << 32 | id de la racine)
+        self.index_schemes = {}
+        # Époques : version est incrémentée à chaque modification de l'arbre ;
+        # epoque_schemes est la version de la table des schèmes dont les
+        # dérivés enregistrés sont issus (voir MoteurMorphologique.synchroniser_derives)
+        self.version = 0
+        self.epoque_schemes = 0
+    
+    def _afficher(self, message):
+        """Affiche un message si le mode verbeux est actif"""
+        if self.verbeux:
+            print(message)
+    
+    def _notifier(self, evenement, *args):
+        """
+        Prévient les observateurs d'une modification : racine_ajoutee(racine),
+        derive_ajoute(racine, mot, scheme), derive_retire(racine, mot),
+        racine_supprimee(racine) et arbre_vide()
+        """
+        self.version += 1
+        for observateur in self.observateurs:
+            methode = getattr(observateur, evenement, None)
+            if methode:
+                methode(*args)
+    
+    def hauteur(self, noeud):
+        """Retourne la hauteur d'un nœud"""
+        return noeud.hauteur if noeud else 0
+    
+    def taille(self, noeud):
+        """Retourne le nombre de nœuds du sous-arbre"""
+        return noeud.taille if noeud else 0
+    
+    def nb_racines(self):
+        """Nombre de racines de l'arbre, en O(1)"""
+        return self.taille(self.racine)
+    
+    def equilibre(self, noeud):
+        """Calcule le facteur d'équilibre"""
+        return self.hauteur(noeud.gauche) - self.hauteur(noeud.droite) if noeud else 0
+    
+    def rotation_droite(self, z):
+        """Rotation droite AVL"""
+        y = z.gauche
+        T2 = y.droite
+        y.droite = z
+        z.gauche = T2
+        z.hauteur = 1 + max(self.hauteur(z.gauche), self.hauteur(z.droite))
+        z.taille = 1 + self.taille(z.gauche) + self.taille(z.droite)
+        y.hauteur = 1 + max(self.hauteur(y.gauche), self.hauteur(y.droite))
+        y.taille = 1 + self.taille(y.gauche) + self.taille(y.droite)
+        return y
+    
+    def rotation_gauche(self, z):
+        """Rotation gauche AVL"""
+        y = z.droite
+        T2 = y.gauche
+        y.gauche = z
+        z.droite = T2
+        z.hauteur = 1 + max(self.hauteur(z.gauche), self.hauteur(z.droite))
+        z.taille = 1 + self.taille(z.gauche) + self.taille(z.droite)
+        y.hauteur = 1 + max(self.hauteur(y.gauche), self.hauteur(y.droite))
+        y.taille = 1 + self.taille(y.gauche) + self.taille(y.droite)
+        return y
+    
+    def inserer(self, noeud, racine):
+        """Insère une nouvelle racine"""
+        if not noeud:
+            self._notifier("racine_ajoutee", racine)
+            return NoeudAVL(racine, self.symboles_racines.identifiant(racine), self.symboles_mots)
+        
+        if racine < noeud.racine:
+            noeud.gauche = self.inserer(noeud.gauche, racine)
+        elif racine > noeud.racine:
+            noeud.droite = self.inserer(noeud.droite, racine)
+        else:
+            return noeud  # Racine déjà présente
+        
+        noeud.hauteur = 1 + max(self.hauteur(noeud.gauche), 
+                               self.hauteur(noeud.droite))
+        noeud.taille = 1 + self.taille(noeud.gauche) + self.taille(noeud.droite)
+        
+        balance = self.equilibre(noeud)
+        
+        # Cas Gauche-Gauche
+        if balance > 1 and racine < noeud.gauche.racine:
+            return self.rotation_droite(noeud)
+        
+        # Cas Droite-Droite
+        if balance < -1 and racine > noeud.droite.racine:
+            return self.rotation_gauche(noeud)
+        
+        # Cas Gauche-Droite
+        if balance > 1 and racine > noeud.gauche.racine:
+            noeud.gauche = self.rotation_gauche(noeud.gauche)
+            return self.rotation_droite(noeud)
+        
+        # Cas Droite-Gauche
+        if balance < -1 and racine < noeud.droite.racine:
+            noeud.droite = self.rotation_droite(noeud.droite)
+            return self.rotation_gauche(noeud)
+        
+        return noeud
+    
+    def rechercher(self, noeud, racine):
+        """Recherche une racine dans l'arbre"""
+        if not noeud or racine == noeud.racine:
+            return noeud
+        
+        if racine < noeud.racine:
+            return self.rechercher(noeud.gauche, racine)
+        
+        return self.rechercher(noeud.droite, racine)
+    
+    def chercher(self, racine):
+        """Recherche itérative d'une racine depuis la racine de l'arbre (nœud ou None)"""
+        noeud = self.racine
+        while noeud:
+            if racine == noeud.racine:
+                return noeud
+            noeud = noeud.gauche if racine < noeud.racine else noeud.droite
+        return None
+    
+    def ajouter_racine(self, racine):
+        """Insère une racine depuis la racine de l'arbre"""
+        self.racine = self.inserer(self.racine, racine)
+    
+    def inserer_lot(self, racines):
+        """
+        Insère plusieurs racines ; retourne le nombre de racines nouvelles.
+        Pour un petit lot, insertions une à une (O(k log n)). Sinon les
+        nœuds existants, tels quels avec leurs dérivés, et les nouveaux sont
+        fusionnés dans l'ordre et l'arbre est reconstruit équilibré en une
+        passe (O(n + k log k)).
+        """
+        cibles = sorted(set(racines))
+        avant = self.nb_racines()
+        if len(cibles) * max(1, self.hauteur(self.racine)) < avant:
+            for racine in cibles:
+                self.racine = self.inserer(self.racine, racine)
+            return self.nb_racines() - avant
+        
+        noeuds = []
+        ajoutees = []
+        i = 0
+        for noeud in self.iterer_infixe():
+            while i < len(cibles) and cibles[i] <= noeud.racine:
+                if cibles[i] != noeud.racine:
+                    ajoutees.append(cibles[i])
+                    noeuds.append(NoeudAVL(cibles[i], self.symboles_racines.identifiant(cibles[i]),
+                                           self.symboles_mots))
+                i += 1
+            noeuds.append(noeud)
+        for racine in cibles[i:]:
+            ajoutees.append(racine)
+            noeuds.append(NoeudAVL(racine, self.symboles_racines.identifiant(racine),
+                                   self.symboles_mots))
+        self.racine = self._construire_equilibre(noeuds, 0, len(noeuds))
+        for racine in ajoutees:
+            self._notifier("racine_ajoutee", racine)
+        return len(ajoutees)
+    
+    def supprimer_racine(self, racine):
+        """Supprime une racine (et ses dérivés) depuis la racine de l'arbre"""
+        self.racine = self.supprimer(self.racine, racine)
+    
+    def supprimer_lot(self, racines):
+        """
+        Supprime plusieurs racines (et leurs dérivés) ; retourne le nombre supprimé.
+        Pour un petit lot, suppressions une à une (O(k log n)). Sinon un seul
+        parcours garde les nœuds restants, tels quels avec leurs dérivés, et
+        l'arbre est reconstruit équilibré en une passe (O(n)).
+        """
+        cibles = set(racines)
+        avant = self.nb_racines()
+        if len(cibles) * max(1, self.hauteur(self.racine)) < avant:
+            for racine in cibles:
+                self.racine = self.supprimer(self.racine, racine)
+            return avant - self.nb_racines()
+        
+        gardes = []
+        retires = []
+        for noeud in self.iterer_infixe():
+            (retires if noeud.racine in cibles else gardes).append(noeud)
+        self.racine = self._construire_equilibre(gardes, 0, len(gardes))
+        
+        # L'arbre est déjà à jour : index et observateurs voient l'état final
+        for noeud in retires:
+            for id_mot, id_scheme in zip(noeud.ids_derives, noeud.ids_schemes):
+                self._decompter(id_mot, id_scheme, noeud.id_racine)
+                self._desindexer(noeud, id_mot)
+        for noeud in retires:
+            self._notifier("racine_supprimee", noeud.racine)
+        return len(retires)
+    
+    def rechercher_profondeur(self, racine):
+        """Recherche itérative : retourne (nœud ou None, nombre de nœuds visités)"""
+        noeud = self.racine
+        profondeur = 0
+        while noeud:
+            profondeur += 1
+            if racine == noeud.racine:
+                return noeud, profondeur
+            noeud = noeud.gauche if racine < noeud.racine else noeud.droite
+        return None, profondeur
+    
+    def ajouter_derive(self, racine, mot, scheme=None):
+        """Ajoute un dérivé à une racine"""
+        noeud = self.chercher(racine)
+        if not noeud:
+            return False
+        
+        return self.enregistrer_derive(noeud, mot, scheme)
+    
+    def enregistrer_derive(self, noeud, mot, scheme=None):
+        """Ajoute un dérivé à un nœud déjà trouvé (liste + index inverse + compteurs)"""
+        id_mot = self.symboles_mots.identifiant(mot)
+        if id_mot in noeud.ids_derives:
+            return False
+        
+        id_scheme = self._id_scheme(scheme)   # avant toute écriture : peut lever ValueError
+        noeud.ids_derives.append(id_mot)
+        self.nb_derives += 1
+        noeud.ids_schemes.append(id_scheme)
+        if scheme is not None:
+            self.usage_schemes[scheme] = self.usage_schemes.get(scheme, 0) + 1
+            derives = self.index_schemes.get(scheme)
+            if derives is None:
+                derives = self.index_schemes[scheme] = CasesDuScheme()
+            derives.ajouter(id_mot << 32 | noeud.id_racine)
+        
+        # MET À JOUR L'INDEX INVERSE (IMPORTANT !)
+        index = self.index_inverse
+        if index.__class__ is IndexInverse:
+            ancienne = index.fixer(id_mot, noeud.id_racine)
+        else:
+            ancienne = self.symboles_racines.chercher(index.get(mot))
+            index[mot] = noeud.racine      # index compacté (voir compacter_index)
+        # Le mot avait déjà une racine : l'analyse précédente est gardée
+        if ancienne and ancienne != noeud.id_racine or id_mot in self.analyses_multiples:
+            self._noter_analyse(noeud, id_mot, ancienne)
+        
+        # Forme vocalisée : accessible aussi par sa clé sans diacritiques
+        cle = retirer_diacritiques(mot)
+        if cle != mot:
+            self.index_normalise.setdefault(cle, []).append(mot)
+        
+        self._notifier("derive_ajoute", noeud.racine, mot, scheme)
+        return True
+    
+    def _noter_analyse(self, noeud, id_mot, ancienne):
+        """Ajoute l'analyse (racine du nœud, schème) d'un mot partagé entre racines"""
+        analyses = self.analyses_multiples
+        if id_mot not in analyses:
+            precedent = self.chercher(self.symboles_racines.chaine(ancienne))
+            if precedent is None or id_mot not in precedent.ids_derives:
+                return      # entrée d'index forcée (fixer_index) : pas de dérivé
+            i = precedent.ids_derives.index(id_mot)
+            analyses.ajouter(id_mot, ancienne << 16 | precedent.ids_schemes[i])
+        analyses.ajouter(id_mot, noeud.id_racine << 16 | noeud.ids_schemes[-1])
+    
+    def analyses_du_mot(self, mot):
+        """
+        Toutes les analyses (racine, clé du schème ou None) d'un mot, vocalisé
+        ou non : la racine de l'index inverse d'abord, puis les autres racines
+        qui ont produit le même mot, dans l'ordre d'ajout
+        """
+        cle = retirer_diacritiques(mot)
+        formes = [mot]
+        if cle != mot:
+            formes.append(cle)
+        formes.extend(self.index_normalise.get(cle, ()))
+        racines, cles = self.symboles_racines.chaine, self.cles_schemes
+        for forme in formes:
+            racine = self.index_inverse.get(forme)
+            if racine is None:
+                continue
+            analyses = self.analyses_multiples.analyses(self.symboles_mots.chercher(forme))
+            if not analyses:
+                noeud = self.chercher(racine)
+                return [(racine, self.scheme_du_derive(noeud, forme) if noeud else None)]
+            resultats = [(racines(a >> 16), cles[a & 0xFFFF]) for a in analyses]
+            resultats.sort(key=lambda analyse: analyse[0] != racine)
+            return resultats
+        return []
+    
+    def _id_scheme(self, scheme):
+        """Numéro du schème (attribué au premier dérivé qui l'utilise)"""
+        if scheme is None:
+            return 0
+        identifiant = self.ids_par_cle.get(scheme)
+        if identifiant is None:
+            identifiant = len(self.cles_schemes)
+            if identifiant > NB_MAX_SCHEMES:
+                raise ValueError(f"Trop de schèmes distincts (au plus {NB_MAX_SCHEMES:,}) : '{scheme}'")
+            self.ids_par_cle[scheme] = identifiant
+            self.cles_schemes.append(scheme)
+        return identifiant
+    
+    def possede_derive(self, noeud, mot):
+        """Vrai si `mot` est un dérivé du nœud (comparaison d'identifiants)"""
+        id_mot = self.symboles_mots.chercher(mot)
+        return id_mot != 0 and id_mot in noeud.ids_derives
+    
+    def derives_hors_index(self, noeud):
+        """Dérivés du nœud que l'index inverse attribue à une autre racine"""
+        chaine = self.symboles_mots.chaine
+        index = self.index_inverse
+        if index.__class__ is IndexInverse:
+            racine_id = index.racine_id
+            return [chaine(id_mot) for id_mot in noeud.ids_derives
+                    if racine_id(id_mot) != noeud.id_racine]
+        return [mot for mot in map(chaine, noeud.ids_derives) if index.get(mot) != noeud.racine]
+    
+    def scheme_du_derive(self, noeud, mot):
+        """Clé du schème qui a produit `mot` pour ce nœud (None si inconnu)"""
+        id_mot = self.symboles_mots.chercher(mot)
+        try:
+            return self.cles_schemes[noeud.ids_schemes[noeud.ids_derives.index(id_mot)]]
+        except ValueError:
+            return None
+    
+    def derives_avec_schemes(self, noeud):
+        """Liste des (mot, clé du schème ou None) d'un nœud"""
+        cles = self.cles_schemes
+        chaine = self.symboles_mots.chaine
+        return [(chaine(m), cles[i]) for m, i in zip(noeud.ids_derives, noeud.ids_schemes)]
+    
+    def mots_du_scheme(self, scheme):
+        """Mots produits par un schème dans tout le lexique (index, sans parcours)"""
+        chaine = self.symboles_mots.chaine
+        # Tri des cases : les mots sortent dans l'ordre où ils ont été internés
+        ids = dict.fromkeys(case >> 32 for case in sorted(self.index_schemes.get(scheme, ())))
+        return [chaine(id_mot) for id_mot in ids]
+    
+    def derives_du_scheme(self, scheme):
+        """Cases (racine, mot) produites par un schème dans tout le lexique"""
+        mot, racine = self.symboles_mots.chaine, self.symboles_racines.chaine
+        return [(racine(case & 0xFFFFFFFF), mot(case >> 32))
+                for case in sorted(self.index_schemes.get(scheme, ()))]
+    
+    def trouver_racine_du_mot(self, mot):
+        """
+        Trouve la racine d'un mot, vocalisé ou non (كَاتِبٌ comme كاتب)
+        Complexité O(1) grâce à index_inverse !
+        """
+        index = self.index_inverse
+        if index.__class__ is IndexInverse:
+            # index.get sans l'appel de méthode : une recherche de dict
+            racine = index.chaines_racines[index.ids.get(mot, 0) & MASQUE_RACINE]
+        else:
+            racine = index.get(mot)
+        if racine is not None:
+            return racine
+        
+        # Clé sans diacritiques : forme nue, puis formes vocalisées connues
+        cle = retirer_diacritiques(mot)
+        if cle != mot:
+            racine = self.index_inverse.get(cle)
+            if racine is not None:
+                return racine
+        for forme in self.index_normalise.get(cle, ()):
+            racine = self.index_inverse.get(forme)
+            if racine is not None:
+                return racine
+        return None
+    
+    def retirer_derive(self, noeud, mot):
+        """Retire un dérivé d'un nœud (liste, index et compteurs)"""
+        id_mot = self.symboles_mots.chercher(mot)
+        if not id_mot or id_mot not in noeud.ids_derives:
+            return False
+        
+        i = noeud.ids_derives.index(id_mot)
+        del noeud.ids_derives[i]
+        self._decompter(id_mot, noeud.ids_schemes.pop(i), noeud.id_racine)
+        self._desindexer(noeud, id_mot)
+        self._notifier("derive_retire", noeud.racine, mot)
+        return True
+    
+    def _decompter(self, id_mot, id_scheme, id_racine):
+        """Met à jour les compteurs et l'index des schèmes après le retrait d'un dérivé"""
+        self.nb_derives -= 1
+        if not id_scheme:
+            return
+        scheme = self.cles_schemes[id_scheme]
+        reste = self.usage_schemes[scheme] - 1
+        if reste:
+            self.usage_schemes[scheme] = reste
+        else:
+            del self.usage_schemes[scheme]
+        
+        derives = self.index_schemes[scheme]
+        derives.retirer(id_mot << 32 | id_racine)
+        if not derives:
+            del self.index_schemes[scheme]
+    
+    def fixer_index(self, mot, racine):
+        """Force l'entrée d'index inverse d'un mot (racine None = retirée)"""
+        self.version += 1
+        if racine:
+            self.index_inverse[mot] = racine
+        else:
+            self.index_inverse.pop(mot, None)
+    
+    def _desindexer(self, noeud, id_mot):
+        """
+        Retire un mot de l'index inverse et de l'index normalisé, seulement
+        s'il y désigne la racine du nœud : un mot partagé reste indexé sous
+        l'autre racine, ou passe à la plus ancienne de ses autres racines
+        """
+        mot = self.symboles_mots.chaine(id_mot)
+        suivante = 0
+        if id_mot in self.analyses_multiples:
+            restantes = self.analyses_multiples.retirer_racine(id_mot, noeud.id_racine)
+            suivante = restantes[0] >> 16 if restantes else 0
+        
+        index = self.index_inverse
+        if index.__class__ is IndexInverse:
+            if index.racine_id(id_mot) != noeud.id_racine:
+                return
+            index.fixer(id_mot, suivante)
+        elif index.get(mot) == noeud.racine:
+            if suivante:
+                index[mot] = self.symboles_racines.chaine(suivante)
+            else:
+                del index[mot]
+        else:
+            return
+        if suivante:
+            return
+        
+        cle = retirer_diacritiques(mot)
+        if cle != mot:
+            formes = self.index_normalise.get(cle)
+            if formes and mot in formes:
+                formes.remove(mot)
+                if not formes:
+                    del self.index_normalise[cle]
+    
+    # ============ PARCOURS ORDONNÉS (rang, intervalle, préfixe) ============
+    
+    def _pile_depuis(self, debut):
+        """Pile du parcours infixe positionnée sur la première racine >= debut"""
+        pile = []
+        noeud = self.racine
+        while noeud:
+            if debut is None or noeud.racine >= debut:
+                pile.append(noeud)
+                noeud = noeud.gauche
+            else:
+                noeud = noeud.droite
+        return pile
+    
+    def _pile_depuis_rang(self, k):
+        """Pile du parcours infixe positionnée sur la k-ième racine (0 = première)"""
+        pile = []
+        noeud = self.racine
+        while noeud:
+            rang_noeud = self.taille(noeud.gauche)
+            if k <= rang_noeud:
+                pile.append(noeud)
+                noeud = noeud.gauche
+            else:
+                k -= rang_noeud + 1
+                noeud = noeud.droite
+        return pile
+    
+    def _parcourir_pile(self, pile):
+        """Parcours infixe itératif à partir d'une pile déjà positionnée"""
+        while pile:
+            noeud = pile.pop()
+            yield noeud
+            suivant = noeud.droite
+            while suivant:
+                pile.append(suivant)
+                suivant = suivant.gauche
+    
+    def iterer_infixe(self, debut=None, fin=None):
+        """
+        Parcourt les nœuds dans l'ordre avec debut <= racine < fin
+        (None = pas de borne). Complexité O(log n + k), sans récursion.
+        """
+        for noeud in self._parcourir_pile(self._pile_depuis(debut)):
+            if fin is not None and noeud.racine >= fin:
+                return
+            yield noeud
+    
+    def iterer_prefixe(self, prefixe):
+        """Parcourt dans l'ordre les nœuds dont la racine commence par `prefixe`"""
+        return self.iterer_infixe(prefixe, prefixe + _FIN_PREFIXE)
+    
+    def kieme(self, k):
+        """Retourne le nœud de rang k (0 = plus petite racine), ou None"""
+        if k < 0 or k >= self.taille(self.racine):
+            return None
+        return self._pile_depuis_rang(k)[-1]
+    
+    def rang(self, racine):
+        """Nombre de racines strictement inférieures à `racine` (O(log n))"""
+        resultat = 0
+        noeud = self.racine
+        while noeud:
+            if racine <= noeud.racine:
+                noeud = noeud.gauche
+            else:
+                resultat += self.taille(noeud.gauche) + 1
+                noeud = noeud.droite
+        return resultat
+    
+    def compter_intervalle(self, debut=None, fin=None):
+        """Nombre de racines avec debut <= racine < fin, en O(log n)"""
+        bas = self.rang(debut) if debut is not None else 0
+        haut = self.rang(fin) if fin is not None else self.taille(self.racine)
+        return max(0, haut - bas)
+    
+    def compter_prefixe(self, prefixe):
+        """Nombre de racines commençant par `prefixe`, en O(log n)"""
+        return self.compter_intervalle(prefixe, prefixe + _FIN_PREFIXE)
+    
+    def page(self, numero, taille_page, prefixe=""):
+        """
+        Retourne (nœuds de la page, nombre total) pour les racines commençant
+        par `prefixe`. Les pages sont numérotées à partir de 0.
+        Complexité O(log n + taille_page) : pas de parcours complet.
+        """
+        if prefixe:
+            debut = self.rang(prefixe)
+            total = self.compter_prefixe(prefixe)
+        else:
+            debut = 0
+            total = self.taille(self.racine)
+        
+        decalage = numero * taille_page
+        if numero < 0 or decalage >= total:
+            return [], total
+        
+        nb = min(taille_page, total - decalage)
+        pile = self._pile_depuis_rang(debut + decalage)
+        return list(islice(self._parcourir_pile(pile), nb)), total
+    
+    def afficher_infixe(self, noeud):
+        """Affiche toutes les racines triées"""
+        if noeud:
+            self.afficher_infixe(noeud.gauche)
+            print(f"  - {noeud.racine} ({len(noeud.ids_derives)} dérivés)")
+            self.afficher_infixe(noeud.droite)
+    
+    def charger_depuis_fichier(self, nom_fichier):
+        """Charge les racines depuis un fichier texte"""
+        try:
+            with open(nom_fichier, 'r', encoding='utf-8') as f:
+                for ligne in f:
+                    racine = ligne.strip()
+                    if racine and len(racine) >= 3:
+                        self.racine = self.inserer(self.racine, racine)
+            self._afficher(f"✅ Racines chargées depuis '{nom_fichier}'")
+        except FileNotFoundError:
+            self._afficher(f"❌ Fichier '{nom_fichier}' non trouvé")
+    
+    def compacter_index(self):
+        """
+        Remplace l'index inverse par un IndexCompact (DAWG + tableau des
+        racines, voir dawg.py) : un index figé qui ne dépend plus de la table
+        des mots internés. Les modifications suivantes restent possibles ;
+        appeler de nouveau pour les intégrer au DAWG.
+        """
+        from .dawg import IndexCompact
+        self.index_inverse = IndexCompact(self.index_inverse, self.version)
+        return self.index_inverse
+    
+    def vider(self):
+        """Retire toutes les racines, tous les dérivés et remet les compteurs à zéro"""
+        self.racine = None
+        self.symboles_mots = TableMots()
+        self.symboles_racines = TableSymboles()
+        self.index_inverse = IndexInverse(self.symboles_mots, self.symboles_racines)
+        self.index_normalise = {}
+        self.analyses_multiples = AnalysesMultiples()
+        self.nb_derives = 0
+        self.usage_schemes = {}
+        self.index_schemes = {}
+        self._notifier("arbre_vide")
+    
+    def compter_noeuds(self, noeud):
+        """Compte le nombre de racines"""
+        if not noeud:
+            return 0
+        return 1 + self.compter_noeuds(noeud.gauche) + self.compter_noeuds(noeud.droite)
+    def trouver_min(self, noeud):
+        """Trouve le nœud avec la valeur minimale"""
+        current = noeud
+        while current.gauche:
+            current = current.gauche
+        return current
+    
+    def supprimer(self, noeud, racine):
+        """Supprime une racine de l'arbre AVL"""
+        if not noeud:
+            return noeud
+        
+        # Étape 1 : suppression standard BST
+        if racine < noeud.racine:
+            noeud.gauche = self.supprimer(noeud.gauche, racine)
+        elif racine > noeud.racine:
+            noeud.droite = self.supprimer(noeud.droite, racine)
+        else:
+            # Nœud à supprimer trouvé
+            
+            # Supprimer de l'index inverse (et des compteurs) tous les dérivés
+            for id_mot, id_scheme in zip(noeud.ids_derives, noeud.ids_schemes):
+                self._decompter(id_mot, id_scheme, noeud.id_racine)
+                self._desindexer(noeud, id_mot)
+            self._notifier("racine_supprimee", racine)
+            
+            # Nœud avec un seul enfant ou sans enfant
+            if not noeud.gauche:
+                temp = noeud.droite
+                noeud = None
+                return temp
+            elif not noeud.droite:
+                temp = noeud.gauche
+                noeud = None
+                return temp
+            
+            # Nœud avec deux enfants : le successeur prend sa place. Il est
+            # détaché sans passer par supprimer() : ses dérivés restent indexés.
+            noeud.droite, temp = self._detacher_min(noeud.droite)
+            noeud.racine = temp.racine
+            noeud.id_racine = temp.id_racine
+            noeud.ids_derives = temp.ids_derives
+            noeud.ids_schemes = temp.ids_schemes
+        
+        return self._reequilibrer(noeud)
+    
+    def _detacher_min(self, noeud):
+        """Retire le plus petit nœud du sous-arbre ; retourne (sous-arbre, nœud retiré)"""
+        if not noeud.gauche:
+            return noeud.droite, noeud
+        noeud.gauche, minimum = self._detacher_min(noeud.gauche)
+        return self._reequilibrer(noeud), minimum
+    
+    def _reequilibrer(self, noeud):
+        """Mise à jour de hauteur/taille et rotations après une suppression"""
+        if not noeud:
+            return noeud
+        
+        # Étape 2 : mettre à jour la hauteur
+        noeud.hauteur = 1 + max(self.hauteur(noeud.gauche),
+                               self.hauteur(noeud.droite))
+        noeud.taille = 1 + self.taille(noeud.gauche) + self.taille(noeud.droite)
+        
+        # Étape 3 : rééquilibrer l'arbre
+        balance = self.equilibre(noeud)
+        
+        # Cas Gauche-Gauche
+        if balance > 1 and self.equilibre(noeud.gauche) >= 0:
+            return self.rotation_droite(noeud)
+        
+        # Cas Gauche-Droite
+        if balance > 1 and self.equilibre(noeud.gauche) < 0:
+            noeud.gauche = self.rotation_gauche(noeud.gauche)
+            return self.rotation_droite(noeud)
+        
+        # Cas Droite-Droite
+        if balance < -1 and self.equilibre(noeud.droite) <= 0:
+            return self.rotation_gauche(noeud)
+        
+        # Cas Droite-Gauche
+        if balance < -1 and self.equilibre(noeud.droite) > 0:
+            noeud.droite = self.rotation_droite(noeud.droite)
+            return self.rotation_gauche(noeud)
+        
+        return noeud
+    
+    def _construire_equilibre(self, noeuds, debut, fin):
+        """Relie noeuds[debut:fin] (triés) en sous-arbre parfaitement équilibré"""
+        if debut >= fin:
+            return None
+        milieu = (debut + fin) // 2
+        noeud = noeuds[milieu]
+        noeud.gauche = self._construire_equilibre(noeuds, debut, milieu)
+        noeud.droite = self._construire_equilibre(noeuds, milieu + 1, fin)
+        noeud.hauteur = 1 + max(self.hauteur(noeud.gauche), self.hauteur(noeud.droite))
+        noeud.taille = fin - debut
         return noeud
\ No newline at end of file
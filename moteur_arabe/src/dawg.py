@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+Automate acyclique minimal (DAWG) d'un ensemble de mots.
+
+Des milliers de formes partagent leurs débuts (م، ي، ت، است) et leurs fins
+(ان، ون، ة) : dans un DAWG, chaque préfixe commun n'est stocké qu'une fois
+et les suffixes communs sont fusionnés. L'automate est construit en une
+passe sur des mots triés (algorithme incrémental de Daciuk et al.), puis
+aplati dans des tableaux :
+
+    lettres   une chaîne : les lettres des arcs, état par état
+    cibles    état atteint par chaque arc
+    avant     mots qui précèdent l'arc dans l'ordre (hachage parfait)
+    debut     premier arc de chaque état
+    final     bytearray : 1 si un mot se termine sur l'état
+
+Les tableaux d'entiers utilisent le plus petit type qui suffit (1, 2 ou
+4 octets par valeur).
+
+Chaque mot reçoit son rang dans l'ordre trié (0..n-1), calculé en lisant le
+mot : c'est un hachage parfait et minimal, qui sert d'indice dans un tableau
+plat (voir IndexCompact).
+"""
+from array import array
+
+
+def tableau_entiers(valeurs, maximum):
+    """array du plus petit type non signé qui contient `maximum`"""
+    for code in ("B", "H", "I", "L", "Q"):
+        if maximum < 1 << (8 * array(code).itemsize):
+            return array(code, valeurs)
+    raise OverflowError(maximum)
+
+
+class _EtatConstruction:
+    """État pendant la construction (avant aplatissement)"""
+    __slots__ = ("arcs", "final", "numero")
+
+    def __init__(self):
+        self.arcs = {}        # lettre → état (dans l'ordre des lettres)
+        self.final = False
+        self.numero = -1      # numéro une fois enregistré (état définitif)
+
+
+class Dawg:
+    """Ensemble de mots en lecture seule : appartenance, préfixes, rangs"""
+
+    def __init__(self, mots_tries=()):
+        self.lettres = ""
+        self.cibles = array('I')
+        self.avant = array('I')
+        self.debut = array('I')
+        self.final = bytearray()
+        self.initial = 0
+        self.nb_mots = 0
+        self._construire(mots_tries)
+
+    # ============ CONSTRUCTION ============
+
+    def _construire(self, mots_tries):
+        registre = {}            # signature → état déjà enregistré
+        etats = []               # états enregistrés, par numéro
+        chemin = [_EtatConstruction()]
+        precedent = None
+        for mot in mots_tries:
+            if precedent is not None and mot <= precedent:
+                if mot == precedent:
+                    continue
+                raise ValueError(f"Mots non triés : '{mot}' après '{precedent}'")
+            commun = 0
+            if precedent is not None:
+                limite = min(len(mot), len(precedent))
+                while commun < limite and mot[commun] == precedent[commun]:
+                    commun += 1
+            self._enregistrer(chemin, commun, registre, etats)
+            etat = chemin[commun]
+            for lettre in mot[commun:]:
+                suivant = _EtatConstruction()
+                etat.arcs[lettre] = suivant
+                chemin.append(suivant)
+                etat = suivant
+            etat.final = True
+            self.nb_mots += 1
+            precedent = mot
+        self._enregistrer(chemin, 0, registre, etats)
+        racine = chemin[0]
+        racine.numero = len(etats)
+        etats.append(racine)
+        self._aplatir(etats)
+
+    def _enregistrer(self, chemin, garder, registre, etats):
+        """
+        Fige les états du chemin au-delà de `garder` lettres (ils ne recevront
+        plus d'arcs) : un état identique à un état déjà enregistré est
+        remplacé par celui-ci, ce qui fusionne les suffixes communs.
+        """
+        while len(chemin) > garder + 1:
+            etat = chemin.pop()
+            parent = chemin[-1]
+            signature = (etat.final, tuple((lettre, cible.numero)
+                                           for lettre, cible in etat.arcs.items()))
+            existant = registre.get(signature)
+            lettre = next(reversed(parent.arcs))
+            if existant is None:
+                etat.numero = len(etats)
+                etats.append(etat)
+                registre[signature] = etat
+            else:
+                parent.arcs[lettre] = existant
+
+    def _aplatir(self, etats):
+        """
+        Range les états dans les tableaux (entiers sur 1, 2 ou 4 octets selon
+        la taille de l'automate) ; compte les mots sous chaque état
+        """
+        comptes = [0] * len(etats)
+        lettres, cibles, avant, debut = [], [], [], []
+        for etat in etats:      # les cibles d'un état sont numérotées avant lui
+            debut.append(len(lettres))
+            self.final.append(etat.final)
+            total = 1 if etat.final else 0
+            for lettre, cible in etat.arcs.items():
+                lettres.append(lettre)
+                cibles.append(cible.numero)
+                avant.append(total)
+                total += comptes[cible.numero]
+            comptes[etat.numero] = total
+        debut.append(len(lettres))
+        self.lettres = "".join(lettres)
+        self.cibles = tableau_entiers(cibles, len(etats))
+        self.avant = tableau_entiers(avant, self.nb_mots)
+        self.debut = tableau_entiers(debut, len(lettres))
+        self.initial = len(etats) - 1
+
+    # ============ REQUÊTES ============
+
+    def __len__(self):
+        return self.nb_mots
+
+    def nb_etats(self):
+        return len(self.final)
+
+    def nb_arcs(self):
+        return len(self.lettres)
+
+    def _suivre(self, mot):
+        """(état atteint en lisant `mot`, rang des mots qui le précèdent) ; état -1 si absent"""
+        lettres, debut, cibles, avant = self.lettres, self.debut, self.cibles, self.avant
+        etat = self.initial
+        rang = 0
+        for lettre in mot:
+            i = lettres.find(lettre, debut[etat], debut[etat + 1])
+            if i < 0:
+                return -1, 0
+            rang += avant[i]
+            etat = cibles[i]
+        return etat, rang
+
+    def __contains__(self, mot):
+        etat, _ = self._suivre(mot)
+        return etat >= 0 and self.final[etat] == 1
+
+    def index(self, mot):
+        """Rang du mot dans l'ordre trié (hachage parfait), -1 s'il est absent"""
+        etat, rang = self._suivre(mot)
+        if etat < 0 or not self.final[etat]:
+            return -1
+        return rang
+
+    def mot(self, rang):
+        """Mot de rang donné (inverse de index)"""
+        if not 0 <= rang < self.nb_mots:
+            raise IndexError(rang)
+        lettres, debut, cibles, avant = self.lettres, self.debut, self.cibles, self.avant
+        etat = self.initial
+        resultat = []
+        while True:
+            if self.final[etat]:
+                if rang == 0:
+                    return "".join(resultat)
+            i = debut[etat + 1] - 1
+            while avant[i] > rang:
+                i -= 1
+            rang -= avant[i]
+            resultat.append(lettres[i])
+            etat = cibles[i]
+
+    def iterer(self, prefixe=""):
+        """Parcourt dans l'ordre les mots qui commencent par `prefixe`"""
+        etat, _ = self._suivre(prefixe)
+        if etat < 0:
+            return
+        lettres, debut, cibles = self.lettres, self.debut, self.cibles
+        pile = [(etat, prefixe)]
+        while pile:
+            etat, mot = pile.pop()
+            if self.final[etat]:
+                yield mot
+            # Arcs empilés à l'envers : le plus petit sort en premier
+            for i in range(debut[etat + 1] - 1, debut[etat] - 1, -1):
+                pile.append((cibles[i], mot + lettres[i]))
+
+    def __iter__(self):
+        return self.iterer()
+
+
+class IndexCompact:
+    """
+    Index inverse (mot → racine) compact : les mots sont dans un DAWG, le
+    rang d'un mot donne l'identifiant de sa racine dans un tableau plat.
+    S'utilise comme le dict qu'il remplace (get, [], in, del, pop, len,
+    itération) : les modifications faites après la compaction vont dans un
+    petit dict d'ajouts et un ensemble de mots retirés. `version` est la
+    version de l'arbre au moment de la compaction.
+    """
+
+    def __init__(self, index, version=None):
+        paires = sorted(index.items())         # dict ou IndexCompact (recompaction)
+        racines = sorted({racine for _, racine in paires})
+        self.dawg_racines = Dawg(racines)
+        self.racines = racines                 # id → racine
+        self.mots = Dawg(mot for mot, _ in paires)
+        self.ids = tableau_entiers((self.dawg_racines.index(racine) for _, racine in paires),
+                                   len(racines))
+        self.version = version
+        self.ajouts = {}          # mot → racine, depuis la compaction
+        self.retires = set()      # mots du DAWG retirés depuis la compaction
+        self.nb = len(paires)
+
+    def _compacte(self, mot):
+        """Racine du mot d'après le DAWG seul (None si absent ou retiré)"""
+        if self.retires and mot in self.retires:
+            return None
+        rang = self.mots.index(mot)
+        return self.racines[self.ids[rang]] if rang >= 0 else None
+
+    def get(self, mot, defaut=None):
+        racine = self.ajouts.get(mot)
+        if racine is None:
+            racine = self._compacte(mot)
+        return defaut if racine is None else racine
+
+    def __getitem__(self, mot):
+        racine = self.get(mot)
+        if racine is None:
+            raise KeyError(mot)
+        return racine
+
+    def __contains__(self, mot):
+        return self.get(mot) is not None
+
+    def __setitem__(self, mot, racine):
+        if mot not in self:
+            self.nb += 1
+        self.ajouts[mot] = racine
+        self.retires.discard(mot)
+
+    def __delitem__(self, mot):
+        if mot not in self:
+            raise KeyError(mot)
+        self.ajouts.pop(mot, None)
+        if mot in self.mots:
+            self.retires.add(mot)
+        self.nb -= 1
+
+    def pop(self, mot, *defaut):
+        racine = self.get(mot)
+        if racine is None:
+            if defaut:
+                return defaut[0]
+            raise KeyError(mot)
+        del self[mot]
+        return racine
+
+    def __len__(self):
+        return self.nb
+
+    def __iter__(self):
+        yield from self.ajouts
+        for mot in self.mots:
+            if mot not in self.ajouts and mot not in self.retires:
+                yield mot
+
+    def items(self):
+        for mot in self:
+            yield mot, self.get(mot)
+
+    def taille_octets(self):
+        """Mémoire des tableaux (sans les chaînes des racines, partagées avec l'arbre)"""
+        total = 0
+        for dawg in (self.mots, self.dawg_racines):
+            total += (len(dawg.lettres) * 2 + dawg.cibles.itemsize * len(dawg.cibles)
+                      + dawg.avant.itemsize * len(dawg.avant)
+                      + dawg.debut.itemsize * len(dawg.debut) + len(dawg.final))
+        return total + self.ids.itemsize * len(self.ids)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Découverte de racines dans un corpus : amorçage du lexique.
+
+Chaque jeton du corpus est débarrassé de ses affixes (voir affixes.py), puis
+chaque tige est lue par le transducteur des schèmes, sans filtre sur les
+racines connues : les consonnes C1 C2 C3 lues dans la forme sont une racine
+candidate. Une racine attestée par assez de jetons est proposée.
+
+    corpus ──découpage──▶ morceaux ──processus──▶ CompteurBorne ──fusion──▶ racines ≥ seuil
+
+Le corpus est découpé en plages d'octets (fichiers) ou en paquets de lignes
+(stdin) ; chaque processus compte ses morceaux dans un CompteurBorne, un
+compteur à nombre de clés borné que l'on peut fusionner (résumé de
+Misra-Gries). Mémoire par processus : un morceau de texte, le compteur et
+le cache des jetons, quelle que soit la taille du corpus ; au plus deux
+morceaux par processus sont en attente. Les racines retenues s'insèrent
+dans l'arbre en un lot (ArbreAVL.inserer_lot).
+
+Les comptes rendus sont des bornes inférieures : un compte peut être
+sous-estimé d'au plus `erreur` (total des occurrences / capacité), jamais
+surestimé. Une racine proposée a donc au moins `seuil` occurrences.
+"""
+import heapq
+import multiprocessing
+import os
+from collections import deque
+
+from .affixes import AnalyseurAffixes
+from .index_documents import jetons
+
+CAPACITE = 200000          # clés gardées par compteur
+TAILLE_MORCEAU = 8 << 20   # octets de corpus par tâche
+TAILLE_CACHE = 1 << 17     # jetons dont les racines candidates sont gardées
+
+
+class CompteurBorne:
+    """
+    Compteur de fréquences à mémoire bornée et fusionnable (Misra-Gries) :
+    au-delà de 2 × capacité clés, la (capacité + 1)-ième plus grande valeur
+    est retirée de tous les comptes et les comptes nuls sont oubliés.
+    """
+
+    def __init__(self, capacite=CAPACITE):
+        self.capacite = capacite
+        self.comptes = {}
+        self.total = 0        # occurrences comptées
+        self.erreur = 0       # sous-estimation maximale d'un compte
+
+    def ajouter(self, cle, n=1):
+        comptes = self.comptes
+        comptes[cle] = comptes.get(cle, 0) + n
+        self.total += n
+        if len(comptes) > 2 * self.capacite:
+            self._reduire()
+
+    def _reduire(self):
+        if len(self.comptes) <= self.capacite:
+            return
+        retrait = heapq.nlargest(self.capacite + 1, self.comptes.values())[-1]
+        self.comptes = {cle: n - retrait for cle, n in self.comptes.items() if n > retrait}
+        self.erreur += retrait
+
+    def fusionner(self, autre):
+        """Ajoute les comptes d'un autre compteur (même capacité)"""
+        comptes = self.comptes
+        for cle, n in autre.comptes.items():
+            comptes[cle] = comptes.get(cle, 0) + n
+        self.total += autre.total
+        self.erreur += autre.erreur
+        if len(comptes) > 2 * self.capacite:
+            self._reduire()
+
+    def __len__(self):
+        return len(self.comptes)
+
+    def au_moins(self, seuil):
+        """[(clé, compte)] des comptes ≥ seuil, du plus grand au plus petit"""
+        return sorted(((cle, n) for cle, n in self.comptes.items() if n >= seuil),
+                      key=lambda paire: (-paire[1], paire[0]))
+
+
+class ExtracteurRacines:
+    """Racines candidates d'un jeton : tiges (affixes retirés) lues par les schèmes"""
+
+    def __init__(self, transducteur, taille_cache=TAILLE_CACHE):
+        self.transducteur = transducteur
+        self.affixes = AnalyseurAffixes()
+        self.taille_cache = taille_cache
+        self.cache = {}
+
+    def candidates(self, jeton):
+        racines = self.cache.get(jeton)
+        if racines is None:
+            trouvees = set()
+            for _, tige, _ in self.affixes.decouper(jeton):
+                for consonnes, _ in self.transducteur.analyses_forme(tige):
+                    if all(consonnes):
+                        trouvees.add("".join(consonnes))
+            racines = tuple(trouvees)
+            if len(self.cache) >= self.taille_cache:
+                self.cache.clear()
+            self.cache[jeton] = racines
+        return racines
+
+    def compter(self, lignes, compteur):
+        """Compte les racines candidates des jetons de `lignes` dans `compteur`"""
+        candidates = self.candidates
+        ajouter = compteur.ajouter
+        for ligne in lignes:
+            for jeton in jetons(ligne):
+                for racine in candidates(jeton):
+                    ajouter(racine)
+
+
+# ============ MORCEAUX ============
+
+def plages(chemin, taille=TAILLE_MORCEAU):
+    """Tâches (chemin, début, fin) qui couvrent un fichier par plages d'octets"""
+    total = os.path.getsize(chemin)
+    return [(chemin, debut, min(debut + taille, total)) for debut in range(0, total, taille)]
+
+
+def lignes_de_plage(chemin, debut, fin):
+    """
+    Lignes qui commencent dans [début, fin[ : une ligne coupée par le
+    début de la plage appartient à la plage précédente
+    """
+    with open(chemin, "rb") as f:
+        if debut:
+            f.seek(debut - 1)
+            f.readline()
+        while f.tell() < fin:
+            ligne = f.readline()
+            if not ligne:
+                break
+            yield ligne.decode("utf-8", errors="replace")
+
+
+def paquets(lignes, taille=TAILLE_MORCEAU):
+    """Regroupe un flux de lignes (stdin) en paquets d'environ `taille` caractères"""
+    paquet = []
+    volume = 0
+    for ligne in lignes:
+        paquet.append(ligne)
+        volume += len(ligne)
+        if volume >= taille:
+            yield paquet
+            paquet = []
+            volume = 0
+    if paquet:
+        yield paquet
+
+
+# ============ PROCESSUS ============
+
+_extracteur = None
+_capacite = CAPACITE
+
+
+def _initialiser(transducteur, capacite):
+    global _extracteur, _capacite
+    _extracteur = ExtracteurRacines(transducteur)
+    _capacite = capacite
+
+
+def _compter(tache):
+    """Compteur d'une tâche : plage (chemin, début, fin) ou liste de lignes"""
+    compteur = CompteurBorne(_capacite)
+    lignes = lignes_de_plage(*tache) if isinstance(tache, tuple) else tache
+    _extracteur.compter(lignes, compteur)
+    return compteur
+
+
+def compter_corpus(transducteur, taches, processus=None, capacite=CAPACITE):
+    """
+    Compte les racines candidates de toutes les tâches (plages ou paquets
+    de lignes) ; `processus` processus (défaut : un par cœur, 1 = sans
+    sous-processus). Retourne le CompteurBorne fusionné.
+    """
+    processus = processus or os.cpu_count() or 1
+    total = CompteurBorne(capacite)
+    if processus == 1:
+        _initialiser(transducteur, capacite)
+        for tache in taches:
+            total.fusionner(_compter(tache))
+        return total
+
+    with multiprocessing.Pool(processus, _initialiser, (transducteur, capacite)) as pool:
+        en_cours = deque()
+        for tache in taches:
+            en_cours.append(pool.apply_async(_compter, (tache,)))
+            if len(en_cours) >= 2 * processus:
+                total.fusionner(en_cours.popleft().get())
+        while en_cours:
+            total.fusionner(en_cours.popleft().get())
+    return total
+
+
+def decouvrir(moteur, fichiers=(), lignes=None, seuil=5, processus=None, capacite=CAPACITE,
+              taille_morceau=TAILLE_MORCEAU):
+    """
+    Racines candidates des `fichiers` (ou d'un flux de `lignes`) attestées
+    au moins `seuil` fois, d'après les schèmes du moteur : (racines, compteur)
+    avec racines = [(racine, support)], du plus fréquent au moins fréquent.
+    """
+    from .transducteur import compiler
+    transducteur = compiler(moteur.table_schemes)      # sans racines : toutes acceptées
+    if fichiers:
+        taches = [plage for chemin in fichiers for plage in plages(chemin, taille_morceau)]
+    else:
+        taches = paquets(lignes or (), taille_morceau)
+    compteur = compter_corpus(transducteur, taches, processus, capacite)
+    return compteur.au_moins(seuil), compteur
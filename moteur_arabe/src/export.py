@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+Export et import du lexique complet, au fil de l'eau.
+
+Racines, dérivés (avec leur schème) et index inverse font l'aller-retour
+dans trois formats, choisis d'après l'extension du fichier :
+
+    .tsv    une opération par ligne, comme le journal :
+                R  racine
+                D  racine  mot  schème
+                I  mot  racine            (entrée d'index, voir plus bas)
+    .jsonl  un objet par racine : {"racine": ..., "derives": [[mot, schème], ...]}
+            puis {"index": mot, "racine": ...}
+    .mlex   binaire compact : en-tête MAGIQUE puis des enregistrements
+            type (1 octet) + longueur (uint32) + champs UTF-8 séparés par \\0 ;
+            un enregistrement tronqué à la lecture lève ValueError
+
+Suffixe .gz (gzip) ou .zst (zstandard, module optionnel) pour compresser.
+
+L'arbre est parcouru sans récursion et les lignes sont regroupées en blocs
+de TAILLE_BLOC octets avant écriture : le coût reste dominé par les E/S.
+L'index inverse se déduit des dérivés, sauf quand un même mot appartient à
+plusieurs racines : seules ces entrées-là sont écrites explicitement.
+"""
+import gzip
+import importlib.util
+import io
+import json
+import struct
+
+MAGIQUE = b"MLEX\x01"
+TAILLE_BLOC = 1 << 20          # octets accumulés avant chaque écriture
+FORMATS = ("tsv", "jsonl", "mlex")
+_ENTETE = struct.Struct("<cI")  # type d'enregistrement, longueur
+
+
+def detecter_format(chemin):
+    """Retourne (format, compression) d'après l'extension : (tsv|jsonl|mlex, None|gz|zst)"""
+    nom = chemin.lower()
+    compression = None
+    for suffixe in ("gz", "zst"):
+        if nom.endswith("." + suffixe):
+            compression = suffixe
+            nom = nom[:-len(suffixe) - 1]
+    format_fichier = nom.rsplit(".", 1)[-1]
+    if format_fichier not in FORMATS:
+        raise ValueError(f"Format inconnu pour '{chemin}' (attendu: .tsv, .jsonl ou .mlex)")
+    if compression == "zst" and importlib.util.find_spec("zstandard") is None:
+        raise ValueError("La compression .zst nécessite le module 'zstandard'")
+    return format_fichier, compression
+
+
+def _ouvrir(chemin, mode, compression):
+    """Ouvre un flux binaire, compressé ou non"""
+    if compression == "gz":
+        # Niveau 6 : presque la taille du niveau 9, deux fois plus rapide
+        return gzip.open(chemin, mode + "b", compresslevel=6)
+    if compression == "zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("La compression .zst nécessite le module 'zstandard'")
+        brut = open(chemin, mode + "b")
+        if mode == "w":
+            return zstandard.ZstdCompressor().stream_writer(brut, closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(brut, closefd=True)
+    return open(chemin, mode + "b", buffering=TAILLE_BLOC)
+
+
+# ============ EXPORT ============
+
+def _blocs_tsv(arbre):
+    ambigus = set()
+    lignes = []
+    taille = 0
+    for noeud in arbre.iterer_infixe():
+        racine = noeud.racine
+        lignes.append(f"R\t{racine}\n")
+        derives = arbre.derives_avec_schemes(noeud)
+        for mot, scheme in derives:
+            lignes.append(f"D\t{racine}\t{mot}\t{scheme or ''}\n")
+        ambigus.update(arbre.derives_hors_index(noeud))
+        taille += len(derives) + 1
+        if taille >= 4096:
+            yield "".join(lignes).encode("utf-8")
+            lignes.clear()
+            taille = 0
+    for mot in sorted(ambigus):
+        lignes.append(f"I\t{mot}\t{arbre.index_inverse.get(mot) or ''}\n")
+    yield "".join(lignes).encode("utf-8")
+
+
+def _blocs_jsonl(arbre):
+    ambigus = set()
+    lignes = []
+    for noeud in arbre.iterer_infixe():
+        lignes.append(json.dumps({
+            "racine": noeud.racine,
+            "derives": arbre.derives_avec_schemes(noeud),
+        }, ensure_ascii=False))
+        lignes.append("\n")
+        ambigus.update(arbre.derives_hors_index(noeud))
+        if len(lignes) >= 2048:
+            yield "".join(lignes).encode("utf-8")
+            lignes.clear()
+    for mot in sorted(ambigus):
+        lignes.append(json.dumps({"index": mot, "racine": arbre.index_inverse.get(mot)},
+                                 ensure_ascii=False))
+        lignes.append("\n")
+    yield "".join(lignes).encode("utf-8")
+
+
+def _enregistrement(type_enreg, champs):
+    """Un enregistrement binaire : en-tête puis champs séparés par \\0"""
+    donnees = "\0".join(champs).encode("utf-8")
+    return _ENTETE.pack(type_enreg, len(donnees)) + donnees
+
+
+def _blocs_mlex(arbre):
+    ambigus = set()
+    tampon = bytearray(MAGIQUE)
+    for noeud in arbre.iterer_infixe():
+        champs = [noeud.racine]
+        for mot, scheme in arbre.derives_avec_schemes(noeud):
+            champs.append(mot)
+            champs.append(scheme or "")
+        tampon += _enregistrement(b"R", champs)
+        ambigus.update(arbre.derives_hors_index(noeud))
+        if len(tampon) >= TAILLE_BLOC:
+            yield bytes(tampon)
+            tampon.clear()
+    for mot in sorted(ambigus):
+        tampon += _enregistrement(b"I", (mot, arbre.index_inverse.get(mot) or ""))
+    yield bytes(tampon)
+
+
+_EXPORTS = {"tsv": _blocs_tsv, "jsonl": _blocs_jsonl, "mlex": _blocs_mlex}
+
+
+def exporter(arbre, chemin, format_fichier=None, compression=None):
+    """
+    Écrit tout le lexique dans `chemin` (format et compression déduits de
+    l'extension si non précisés). Retourne le nombre d'octets écrits
+    avant compression.
+    """
+    if format_fichier is None:
+        format_fichier, compression = detecter_format(chemin)
+    nb_octets = 0
+    with _ouvrir(chemin, "w", compression) as f:
+        for bloc in _EXPORTS[format_fichier](arbre):
+            f.write(bloc)
+            nb_octets += len(bloc)
+    return nb_octets
+
+
+def exporter_listes(arbre, chemin_racines, chemin_derives):
+    """Ancien export en deux fichiers : une racine par ligne, puis mot|racine"""
+    with open(chemin_racines, "w", encoding="utf-8", buffering=TAILLE_BLOC) as f:
+        for noeud in arbre.iterer_infixe():
+            f.write(noeud.racine + "\n")
+    with open(chemin_derives, "w", encoding="utf-8", buffering=TAILLE_BLOC) as f:
+        for noeud in arbre.iterer_infixe():
+            if noeud.derivees:
+                f.write("".join(f"{mot}|{noeud.racine}\n" for mot in noeud.derivees))
+
+
+# ============ IMPORT ============
+
+class _Importeur:
+    """Applique les enregistrements lus à l'arbre"""
+
+    def __init__(self, arbre):
+        self.arbre = arbre
+        self.nb_racines = 0
+        self.nb_derives = 0
+
+    def racine(self, racine, derives):
+        """Insère une racine et ses (mot, schème)"""
+        arbre = self.arbre
+        arbre.ajouter_racine(racine)
+        noeud = arbre.chercher(racine)
+        self.nb_racines += 1
+        for mot, scheme in derives:
+            if arbre.enregistrer_derive(noeud, mot, scheme or None):
+                self.nb_derives += 1
+        return noeud
+
+    def index(self, mot, racine):
+        """Entrée explicite de l'index inverse (racine vide = absente)"""
+        self.arbre.fixer_index(mot, racine or None)
+
+
+def _importer_tsv(flux, importeur):
+    arbre = importeur.arbre
+    noeud = None
+    for ligne in io.TextIOWrapper(flux, encoding="utf-8"):
+        champs = ligne.rstrip("\n").split("\t")
+        if champs[0] == "D" and len(champs) == 4:
+            if noeud is None or noeud.racine != champs[1]:
+                noeud = importeur.racine(champs[1], ())
+            if arbre.enregistrer_derive(noeud, champs[2], champs[3] or None):
+                importeur.nb_derives += 1
+        elif champs[0] == "R" and len(champs) == 2:
+            noeud = importeur.racine(champs[1], ())
+        elif champs[0] == "I" and len(champs) == 3:
+            importeur.index(champs[1], champs[2])
+
+
+def _importer_jsonl(flux, importeur):
+    for ligne in io.TextIOWrapper(flux, encoding="utf-8"):
+        if not ligne.strip():
+            continue
+        objet = json.loads(ligne)
+        if "index" in objet:
+            importeur.index(objet["index"], objet.get("racine"))
+        else:
+            importeur.racine(objet["racine"], objet.get("derives", ()))
+
+
+def _importer_mlex(flux, importeur):
+    if flux.read(len(MAGIQUE)) != MAGIQUE:
+        raise ValueError("Fichier .mlex invalide (en-tête inconnu)")
+    taille_entete = _ENTETE.size
+    position = len(MAGIQUE)
+    while True:
+        entete = flux.read(taille_entete)
+        if not entete:
+            return
+        if len(entete) < taille_entete:
+            raise ValueError(f"Fichier .mlex tronqué (en-tête incomplet à l'octet {position})")
+        type_enreg, longueur = _ENTETE.unpack(entete)
+        donnees = flux.read(longueur)
+        if len(donnees) < longueur:
+            raise ValueError(f"Fichier .mlex tronqué (enregistrement de {longueur} octet(s) "
+                             f"à l'octet {position}, {len(donnees)} disponible(s))")
+        champs = donnees.decode("utf-8").split("\0")
+        if type_enreg == b"R":
+            if len(champs) % 2 == 0:
+                raise ValueError(f"Fichier .mlex invalide (racine sans schème à l'octet {position})")
+            importeur.racine(champs[0], zip(champs[1::2], champs[2::2]))
+        elif type_enreg == b"I":
+            if len(champs) != 2:
+                raise ValueError(f"Fichier .mlex invalide (entrée d'index à l'octet {position})")
+            importeur.index(champs[0], champs[1])
+        position += taille_entete + longueur
+
+
+_IMPORTS = {"tsv": _importer_tsv, "jsonl": _importer_jsonl, "mlex": _importer_mlex}
+
+
+def importer(arbre, chemin, format_fichier=None, compression=None):
+    """
+    Ajoute à l'arbre le lexique lu dans `chemin` (au fil de l'eau).
+    Retourne (nombre de racines lues, nombre de dérivés ajoutés).
+    """
+    if format_fichier is None:
+        format_fichier, compression = detecter_format(chemin)
+    importeur = _Importeur(arbre)
+    with _ouvrir(chemin, "r", compression) as flux:
+        _IMPORTS[format_fichier](flux, importeur)
+    return importeur.nb_racines, importeur.nb_derives
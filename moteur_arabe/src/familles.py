@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Familles morphologiques en cache, pour l'expansion de requêtes.
+
+Une recherche sur كاتب doit aussi trouver مكتوب، كتاب، مكتبة... : la famille
+d'une racine est l'ensemble de ses formes, paradigme complet (tous les
+schèmes de la table) et dérivés enregistrés. Elle est calculée une fois puis
+gardée dans un frozenset, prêt à être partagé par les requêtes.
+
+Le cache suit l'arbre comme observateur : un dérivé ajouté ou une racine
+supprimée n'oublient que la famille de leur racine, un dérivé retiré n'en
+retire que ce mot ; l'arbre vidé ou une nouvelle version de la table des
+schèmes oublient tout.
+"""
+
+
+class CacheFamilles:
+    """racine → frozenset des mots de sa famille (paradigme + dérivés enregistrés)"""
+
+    # Familles gardées (les plus anciennes sont oubliées au-delà)
+    TAILLE = 8192
+
+    def __init__(self, moteur, taille=TAILLE):
+        self.moteur = moteur
+        self.taille = taille
+        self.familles = {}
+        self.version_schemes = None
+        self.arbre = None
+
+    def attacher(self, arbre):
+        """Suit les modifications de l'arbre (invalidation racine par racine)"""
+        self.arbre = arbre
+        arbre.observateurs.append(self)
+
+    def detacher(self):
+        if self.arbre is not None and self in self.arbre.observateurs:
+            self.arbre.observateurs.remove(self)
+        self.arbre = None
+
+    def famille(self, racine):
+        """Famille de la racine (frozenset), None si la racine est inconnue"""
+        version = self.moteur.table_schemes.version
+        if version != self.version_schemes:
+            self.familles = {}
+            self.version_schemes = version
+        famille = self.familles.get(racine)
+        if famille is None:
+            famille = self._calculer(racine)
+            if famille is None:
+                return None
+            if len(self.familles) >= self.taille:
+                del self.familles[next(iter(self.familles))]
+            self.familles[racine] = famille
+        return famille
+
+    def _calculer(self, racine):
+        moteur = self.moteur
+        noeud = moteur.arbre_racines.chercher(racine)
+        if noeud is None:
+            return None
+        if moteur.metriques.actif:
+            moteur.metriques.incrementer("familles_calculees")
+        mots = {mot for _, mot in moteur.paradigme(racine) or ()}
+        mots.update(noeud.derivees)
+        return frozenset(mots)
+
+    # ============ ÉVÉNEMENTS DE L'ARBRE ============
+
+    def derive_ajoute(self, racine, mot, scheme=None):
+        famille = self.familles.get(racine)
+        if famille is not None and mot not in famille:    # forme du paradigme : inchangée
+            del self.familles[racine]
+
+    def derive_retire(self, racine, mot):
+        famille = self.familles.get(racine)
+        if famille is None or mot not in famille:
+            return
+        # Forme du paradigme : reste dans la famille ; sinon, seul ce mot en sort
+        if any(forme == mot for _, forme in self.moteur.paradigme(racine) or ()):
+            return
+        self.familles[racine] = famille - {mot}
+
+    def racine_supprimee(self, racine):
+        self.familles.pop(racine, None)
+
+    def arbre_vide(self):
+        self.familles = {}
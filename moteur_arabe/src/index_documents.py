@@ -0,0 +1,576 @@
+# -*- coding: utf-8 -*-
+"""
+Index de documents par racine : recherche plein texte morphologique.
+
+Chaque document est découpé en jetons (suites de lettres arabes, sans
+diacritiques) et chaque jeton est ramené à sa ou ses racines par le moteur
+(analyses_du_mot, puis découpage des affixes et transducteur). L'index
+associe à chaque racine les documents où elle apparaît, avec les positions
+des jetons : chercher كاتب trouve aussi مكتوب، والكتاب، بكتبهم...
+
+Construction au fil de l'eau, en mémoire bornée : les occurrences sont
+accumulées jusqu'à `taille_tampon`, écrites triées par racine dans un
+fichier temporaire, puis les fichiers temporaires sont fusionnés. Seuls
+12 octets par document (place du nom, longueur) restent en mémoire.
+
+Fichier d'index (lu par mmap) :
+
+    MAGIQUE
+    listes        pour chaque racine, dans l'ordre :
+                    blocs de TAILLE_BLOC documents, chacun :
+                      n, tailles des trois sections               (varint)
+                      écarts entre numéros de documents           (varint)
+                      nombre d'occurrences (tf) par document      (varint)
+                      écarts entre positions, document par document
+                    sauts : dernier document et taille de chaque bloc
+                    champions : les NB_CHAMPIONS meilleurs documents (BM25)
+    noms          noms des documents (UTF-8) puis leurs places (array 'Q')
+    longueurs     nombre de jetons de chaque document (array 'I')
+    dictionnaire  JSON : racine → [df, début, sauts, champions, fin]
+    pied          places des sections et nombre de documents
+
+Une recherche lit d'abord le groupe de racines le plus rare, puis vérifie
+les autres par la table de sauts (un bloc décodé par document candidat) :
+le coût suit la liste la plus courte, pas la taille du corpus. Une requête
+d'un seul mot d'une seule racine est servie exactement par la liste des
+champions de cette racine. Au-delà de SEUIL_CHAMPIONS documents à lire
+(pour la liste la plus courte, ou pour les racines d'un mot seul qui en a
+plusieurs), les candidats sont les champions des racines, notés
+exactement : classement approché, borné en temps.
+"""
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+from .utils import retirer_diacritiques
+
+MAGIQUE = b"RIDX\x01"
+TAILLE_BLOC = 128          # documents par bloc (unité de décodage)
+NB_CHAMPIONS = 256         # meilleurs documents gardés par racine
+SEUIL_CHAMPIONS = 20000    # au-delà (documents à lire), candidats pris dans les champions
+TAILLE_TAMPON = 1 << 20    # occurrences accumulées avant écriture d'un fichier temporaire
+TAILLE_CACHE = 1 << 17     # jetons dont les racines sont gardées en cache
+K1, B = 1.2, 0.75          # paramètres de BM25
+_PIED = struct.Struct("<QQQQQ")  # noms, places, longueurs, dictionnaire, nb de documents
+
+# Lettres arabes (hamza → yaa), sans tatweel ni diacritiques
+_JETON = re.compile("[ء-غف-ي]+")
+
+
+def jetons(texte):
+    """Jetons d'un texte : suites de lettres arabes, diacritiques retirés"""
+    return _JETON.findall(retirer_diacritiques(texte))
+
+
+# ============ ENTIERS VARIABLES (varint) ============
+
+def _varint(tampon, n):
+    """Ajoute n ≥ 0 au tampon, 7 bits par octet (bit de poids fort : suite)"""
+    while n > 0x7F:
+        tampon.append(n & 0x7F | 0x80)
+        n >>= 7
+    tampon.append(n)
+
+
+def _decoder(donnees):
+    """Tous les entiers codés dans `donnees`"""
+    resultat = []
+    n = decalage = 0
+    for octet in donnees:
+        if octet & 0x80:
+            n |= (octet & 0x7F) << decalage
+            decalage += 7
+        else:
+            resultat.append(n | octet << decalage)
+            n = decalage = 0
+    return resultat
+
+
+def _lire_varint(donnees, i):
+    """(entier codé à la place i, place suivante)"""
+    n = decalage = 0
+    while True:
+        octet = donnees[i]
+        i += 1
+        n |= (octet & 0x7F) << decalage
+        if not octet & 0x80:
+            return n, i
+        decalage += 7
+
+
+def _entiers(donnees, nombre):
+    """Décode `nombre` entiers ; un octet par entier (cas courant) : décodage en C"""
+    if len(donnees) == nombre:
+        return list(donnees)
+    return _decoder(donnees)
+
+
+def _poids(tf, longueur, moyenne):
+    """Part de BM25 qui dépend du document (à multiplier par l'idf de la racine)"""
+    return tf * (K1 + 1) / (tf + K1 * (1 - B + B * longueur / moyenne))
+
+
+# ============ JETONS → RACINES ============
+
+class RacinesDesJetons:
+    """Racines d'un jeton d'après le moteur, gardées dans un cache borné"""
+
+    def __init__(self, moteur, taille_cache=TAILLE_CACHE):
+        self.moteur = moteur
+        self.taille_cache = taille_cache
+        self.cache = {}
+
+    def __call__(self, jeton):
+        racines = self.cache.get(jeton)
+        if racines is None:
+            racines = self._resoudre(jeton)
+            if len(self.cache) >= self.taille_cache:
+                self.cache.clear()
+            self.cache[jeton] = racines
+        return racines
+
+    def _resoudre(self, jeton):
+        """Toutes les racines du mot connu, sinon celles de sa tige (affixes retirés)"""
+        arbre = self.moteur.arbre_racines
+        analyses = arbre.analyses_du_mot(jeton)
+        if not analyses:
+            analyse = self.moteur.analyser_avec_affixes(jeton)
+            if analyse is None:
+                return ()
+            analyses = arbre.analyses_du_mot(analyse[3]) or [analyse[:2]]
+        return tuple(dict.fromkeys(racine for racine, _ in analyses))
+
+
+# ============ CONSTRUCTION ============
+
+class _Liste:
+    """Écrit la liste d'une racine bloc par bloc (sauts et champions à la fin)"""
+
+    def __init__(self, sortie, longueurs, moyenne):
+        self.sortie = sortie
+        self.longueurs = longueurs
+        self.moyenne = moyenne
+        self.debut = sortie.tell()
+        self.bloc = []               # (document, positions) en attente
+        self.sauts = bytearray()
+        self.dernier = -1            # dernier document écrit
+        self.df = 0
+        self.champions = []          # tas de (poids, -document)
+
+    def ajouter(self, document, positions):
+        self.bloc.append((document, positions))
+        poids = _poids(len(positions), self.longueurs[document], self.moyenne)
+        if len(self.champions) < NB_CHAMPIONS:
+            heapq.heappush(self.champions, (poids, -document))
+        elif poids > self.champions[0][0]:
+            heapq.heapreplace(self.champions, (poids, -document))
+        if len(self.bloc) == TAILLE_BLOC:
+            self._ecrire_bloc()
+
+    def _ecrire_bloc(self):
+        ecarts, tfs, positions = bytearray(), bytearray(), bytearray()
+        precedent = self.dernier
+        for document, places in self.bloc:
+            _varint(ecarts, document - precedent)
+            precedent = document
+            _varint(tfs, len(places))
+            place_precedente = -1
+            for place in places:
+                _varint(positions, place - place_precedente)
+                place_precedente = place
+        bloc = bytearray()
+        for n in (len(self.bloc), len(ecarts), len(tfs), len(positions)):
+            _varint(bloc, n)
+        bloc += ecarts + tfs + positions
+        self.sortie.write(bloc)
+        _varint(self.sauts, precedent - self.dernier)
+        _varint(self.sauts, len(bloc))
+        self.dernier = precedent
+        self.df += len(self.bloc)
+        self.bloc = []
+
+    def terminer(self):
+        """Écrit le dernier bloc, les sauts et les champions ; retourne l'entrée du dictionnaire"""
+        if self.bloc:
+            self._ecrire_bloc()
+        debut_sauts = self.sortie.tell()
+        self.sortie.write(self.sauts)
+        debut_champions = self.sortie.tell()
+        champions = sorted(self.champions, reverse=True)
+        documents = bytearray()
+        _varint(documents, len(champions))
+        for _, document in champions:
+            _varint(documents, -document)
+        self.sortie.write(documents)
+        self.sortie.write(array('f', (poids for poids, _ in champions)).tobytes())
+        return [self.df, self.debut, debut_sauts, debut_champions, self.sortie.tell()]
+
+
+class _Construction:
+    """Accumule les occurrences, vide le tampon en fichiers temporaires, fusionne"""
+
+    def __init__(self, chemin, racines_du_jeton, taille_tampon):
+        self.chemin = chemin
+        self.racines_du_jeton = racines_du_jeton
+        self.taille_tampon = taille_tampon
+        self.dossier = os.path.dirname(os.path.abspath(chemin))
+        self.tampon = {}             # racine → [(document, [positions])]
+        self.nb_occurrences = 0
+        self.temporaires = []        # (chemin, {racine: (début, fin)})
+        self.longueurs = array('I')
+        self.places_noms = array('Q', [0])
+        self.noms = tempfile.TemporaryFile(dir=self.dossier)
+        self.nb_jetons = 0
+
+    def ajouter(self, nom, texte):
+        document = len(self.longueurs)
+        tampon = self.tampon
+        position = -1
+        for position, jeton in enumerate(jetons(texte)):
+            for racine in self.racines_du_jeton(jeton):
+                liste = tampon.get(racine)
+                if liste is None:
+                    tampon[racine] = [(document, [position])]
+                elif liste[-1][0] == document:
+                    liste[-1][1].append(position)
+                else:
+                    liste.append((document, [position]))
+                self.nb_occurrences += 1
+        self.longueurs.append(position + 1)
+        self.nb_jetons += position + 1
+        self.places_noms.append(self.places_noms[-1] + self.noms.write(nom.encode("utf-8")))
+        if self.nb_occurrences >= self.taille_tampon:
+            self._vider_tampon()
+
+    def _vider_tampon(self):
+        """Écrit le tampon trié par racine dans un fichier temporaire"""
+        if not self.tampon:
+            return
+        descripteur, chemin = tempfile.mkstemp(dir=self.dossier, suffix=".ridx-tmp")
+        sections = {}
+        with os.fdopen(descripteur, "wb") as f:
+            for racine in sorted(self.tampon):
+                donnees = bytearray()
+                precedent = -1
+                for document, positions in self.tampon[racine]:
+                    _varint(donnees, document - precedent)
+                    precedent = document
+                    _varint(donnees, len(positions))
+                    place_precedente = -1
+                    for place in positions:
+                        _varint(donnees, place - place_precedente)
+                        place_precedente = place
+                debut = f.tell()
+                f.write(donnees)
+                sections[racine] = (debut, f.tell())
+        self.temporaires.append((chemin, sections))
+        self.tampon = {}
+        self.nb_occurrences = 0
+
+    @staticmethod
+    def _relire(donnees):
+        """(document, positions) d'une section de fichier temporaire"""
+        entiers = _decoder(donnees)
+        i = 0
+        document = -1
+        while i < len(entiers):
+            document += entiers[i]
+            tf = entiers[i + 1]
+            yield document, list(accumulate(entiers[i + 2:i + 2 + tf], initial=-1))[1:]
+            i += 2 + tf
+
+    def terminer(self):
+        """Fusionne les fichiers temporaires dans le fichier d'index ; retourne les statistiques"""
+        self._vider_tampon()
+        nb_documents = len(self.longueurs)
+        moyenne = self.nb_jetons / nb_documents if self.nb_jetons else 1.0
+        sources = []
+        provisoire = self.chemin + ".tmp"
+        try:
+            for chemin, sections in self.temporaires:
+                f = open(chemin, "rb")
+                taille = os.fstat(f.fileno()).st_size
+                donnees = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if taille else b""
+                sources.append((f, donnees, sections))
+            dictionnaire = {}
+            with open(provisoire, "wb") as sortie:
+                sortie.write(MAGIQUE)
+                racines = sorted(set().union(*(sections for _, _, sections in sources)))
+                for racine in racines:
+                    liste = _Liste(sortie, self.longueurs, moyenne)
+                    for _, donnees, sections in sources:
+                        section = sections.get(racine)
+                        if section:
+                            for document, positions in self._relire(donnees[section[0]:section[1]]):
+                                liste.ajouter(document, positions)
+                    dictionnaire[racine] = liste.terminer()
+
+                debut_noms = sortie.tell()
+                self.noms.seek(0)
+                while True:
+                    morceau = self.noms.read(1 << 20)
+                    if not morceau:
+                        break
+                    sortie.write(morceau)
+                debut_places = sortie.tell()
+                sortie.write(self.places_noms.tobytes())
+                debut_longueurs = sortie.tell()
+                sortie.write(self.longueurs.tobytes())
+                debut_dictionnaire = sortie.tell()
+                sortie.write(json.dumps(dictionnaire, ensure_ascii=False,
+                                        separators=(",", ":")).encode("utf-8"))
+                sortie.write(_PIED.pack(debut_noms, debut_places, debut_longueurs,
+                                        debut_dictionnaire, nb_documents))
+                taille = sortie.tell()
+            os.replace(provisoire, self.chemin)
+        finally:
+            for f, donnees, _ in sources:
+                if donnees:
+                    donnees.close()
+                f.close()
+            for chemin, _ in self.temporaires:
+                os.remove(chemin)
+            self.noms.close()
+            # Construction interrompue : pas de fichier partiel laissé derrière
+            if os.path.exists(provisoire):
+                os.remove(provisoire)
+        return {
+            "documents": nb_documents,
+            "jetons": self.nb_jetons,
+            "racines": len(dictionnaire),
+            "fichiers_temporaires": len(self.temporaires),
+            "octets": taille,
+        }
+
+
+def indexer(moteur, documents, chemin, taille_tampon=TAILLE_TAMPON):
+    """
+    Construit l'index des `documents` ((nom, texte), lus au fil de l'eau)
+    dans `chemin`. Retourne les statistiques (documents, jetons, racines,
+    fichiers temporaires, octets).
+    """
+    construction = _Construction(chemin, RacinesDesJetons(moteur), taille_tampon)
+    for nom, texte in documents:
+        construction.ajouter(nom, texte)
+    return construction.terminer()
+
+
+# ============ RECHERCHE ============
+
+class IndexDocuments:
+    """Index de documents ouvert en lecture (mmap) : listes par racine et recherche classée"""
+
+    def __init__(self, chemin):
+        self._fichier = open(chemin, "rb")
+        self.donnees = mmap.mmap(self._fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.donnees[:len(MAGIQUE)] != MAGIQUE:
+            self.fermer()
+            raise ValueError(f"Fichier d'index invalide: '{chemin}'")
+        (self.debut_noms, debut_places, debut_longueurs, debut_dictionnaire,
+         self.nb_documents) = _PIED.unpack(self.donnees[-_PIED.size:])
+        self.places_noms = array('Q')
+        self.places_noms.frombytes(self.donnees[debut_places:debut_longueurs])
+        self.longueurs = array('I')
+        self.longueurs.frombytes(self.donnees[debut_longueurs:debut_dictionnaire])
+        self.dictionnaire = json.loads(
+            self.donnees[debut_dictionnaire:len(self.donnees) - _PIED.size].decode("utf-8"))
+        total = sum(self.longueurs)
+        self.moyenne = total / self.nb_documents if total else 1.0
+        self._sauts = {}             # racine → (derniers documents, débuts des blocs)
+
+    def fermer(self):
+        self.donnees.close()
+        self._fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __contains__(self, racine):
+        return racine in self.dictionnaire
+
+    def __len__(self):
+        return self.nb_documents
+
+    def nom(self, document):
+        """Nom d'un document d'après son numéro"""
+        debut = self.debut_noms + self.places_noms[document]
+        fin = self.debut_noms + self.places_noms[document + 1]
+        return self.donnees[debut:fin].decode("utf-8")
+
+    def frequence(self, racine):
+        """Nombre de documents qui contiennent la racine (df)"""
+        entree = self.dictionnaire.get(racine)
+        return entree[0] if entree else 0
+
+    def idf(self, racine):
+        df = self.frequence(racine)
+        return math.log(1 + (self.nb_documents - df + 0.5) / (df + 0.5))
+
+    # ============ LISTES ============
+
+    def _table_sauts(self, racine):
+        """(dernier document de chaque bloc, début de chaque bloc), gardés en cache"""
+        sauts = self._sauts.get(racine)
+        if sauts is None:
+            _, debut, debut_sauts, debut_champions, _ = self.dictionnaire[racine]
+            entiers = _decoder(self.donnees[debut_sauts:debut_champions])
+            derniers = list(accumulate(entiers[0::2], initial=-1))[1:]
+            debuts = list(accumulate(entiers[1::2], initial=debut))
+            if len(self._sauts) >= 4096:
+                self._sauts.clear()
+            sauts = self._sauts[racine] = (derniers, debuts)
+        return sauts
+
+    def _bloc(self, debut, precedent, positions=False):
+        """(documents, tf[, positions]) du bloc qui commence à `debut`"""
+        donnees = self.donnees
+        nombre, i = _lire_varint(donnees, debut)
+        taille_ecarts, i = _lire_varint(donnees, i)
+        taille_tfs, i = _lire_varint(donnees, i)
+        taille_positions, i = _lire_varint(donnees, i)
+        ecarts = _entiers(donnees[i:i + taille_ecarts], nombre)
+        documents = list(accumulate(ecarts, initial=precedent))[1:]
+        i += taille_ecarts
+        tfs = _entiers(donnees[i:i + taille_tfs], nombre)
+        if not positions:
+            return documents, tfs
+        i += taille_tfs
+        ecarts = _entiers(donnees[i:i + taille_positions], sum(tfs))
+        places = []
+        j = 0
+        for tf in tfs:
+            places.append(list(accumulate(ecarts[j:j + tf], initial=-1))[1:])
+            j += tf
+        return documents, tfs, places
+
+    def documents(self, racine):
+        """(document, tf) de tous les documents de la racine, dans l'ordre"""
+        if racine not in self.dictionnaire:
+            return
+        derniers, debuts = self._table_sauts(racine)
+        precedent = -1
+        for i in range(len(derniers)):
+            documents, tfs = self._bloc(debuts[i], precedent)
+            yield from zip(documents, tfs)
+            precedent = derniers[i]
+
+    def occurrences(self, racine):
+        """(document, positions des jetons) de tous les documents de la racine"""
+        if racine not in self.dictionnaire:
+            return
+        derniers, debuts = self._table_sauts(racine)
+        precedent = -1
+        for i in range(len(derniers)):
+            documents, _, places = self._bloc(debuts[i], precedent, positions=True)
+            yield from zip(documents, places)
+            precedent = derniers[i]
+
+    def champions(self, racine):
+        """[(document, poids BM25 sans l'idf)] : les meilleurs documents de la racine"""
+        entree = self.dictionnaire.get(racine)
+        if entree is None:
+            return []
+        _, _, _, debut, fin = entree
+        nombre, debut = _lire_varint(self.donnees, debut)
+        poids = array('f')
+        poids.frombytes(self.donnees[fin - poids.itemsize * nombre:fin])
+        return list(zip(_decoder(self.donnees[debut:fin - poids.itemsize * nombre]), poids))
+
+    def _trouver(self, racine, candidats):
+        """(document, tf) des `candidats` (triés) qui contiennent la racine"""
+        derniers, debuts = self._table_sauts(racine)
+        courant = -1
+        documents = tfs = ()
+        for document in candidats:
+            i = bisect_left(derniers, document)
+            if i == len(derniers):
+                break
+            if i != courant:
+                courant = i
+                documents, tfs = self._bloc(debuts[i], derniers[i - 1] if i else -1)
+            j = bisect_left(documents, document)
+            if j < len(documents) and documents[j] == document:
+                yield document, tfs[j]
+
+    def rechercher_racines(self, groupes, k=10, tous=True):
+        """
+        Documents classés (BM25) pour des groupes de racines : un groupe par
+        mot de la requête, satisfait par l'une quelconque de ses racines.
+        tous=True : chaque groupe doit être présent ; sinon, au moins un.
+        Retourne [(document, score)], au plus k.
+        """
+        groupes = [[r for r in groupe if r in self.dictionnaire] for groupe in groupes]
+        if tous and not all(groupes):
+            return []
+        groupes = [groupe for groupe in groupes if groupe]
+        if not groupes:
+            return []
+        longueurs, moyenne = self.longueurs, self.moyenne
+
+        # Une racine seule : ses champions sont ses k meilleurs documents ;
+        # plusieurs racines : les listes complètes, sauf au-delà du seuil
+        if len(groupes) == 1 and k <= NB_CHAMPIONS and (
+                len(groupes[0]) == 1
+                or sum(self.frequence(r) for r in groupes[0]) > SEUIL_CHAMPIONS):
+            scores = {}
+            for racine in groupes[0]:
+                idf = self.idf(racine)
+                for document, poids in self.champions(racine):
+                    scores[document] = scores.get(document, 0.0) + idf * poids
+            return heapq.nlargest(k, scores.items(), key=lambda e: (e[1], -e[0]))
+
+        # Le groupe le plus rare donne les candidats, les autres sont vérifiés par sauts
+        groupes.sort(key=lambda groupe: sum(self.frequence(r) for r in groupe))
+        a_lire = groupes[0] if tous else groupes[-1]
+        if sum(self.frequence(r) for r in a_lire) > SEUIL_CHAMPIONS:
+            scores = dict.fromkeys(sorted({document for groupe in groupes for racine in groupe
+                                           for document, _ in self.champions(racine)}), 0.0)
+            a_verifier = groupes
+        else:
+            scores = {}
+            for groupe in (groupes[:1] if tous else groupes):
+                for racine in groupe:
+                    idf = self.idf(racine)
+                    for document, tf in self.documents(racine):
+                        scores[document] = (scores.get(document, 0.0)
+                                            + idf * _poids(tf, longueurs[document], moyenne))
+            a_verifier = groupes[1:] if tous else ()
+        for groupe in a_verifier:
+            candidats = sorted(scores)
+            trouves = {}
+            for racine in groupe:
+                idf = self.idf(racine)
+                for document, tf in self._trouver(racine, candidats):
+                    trouves[document] = (trouves.get(document, 0.0)
+                                         + idf * _poids(tf, longueurs[document], moyenne))
+            if tous:
+                scores = {document: score + trouves[document]
+                          for document, score in scores.items() if document in trouves}
+                if not scores:
+                    return []
+            else:
+                for document, score in trouves.items():
+                    scores[document] += score
+        return heapq.nlargest(k, scores.items(), key=lambda e: (e[1], -e[0]))
+
+    def rechercher(self, requete, racines_du_jeton, k=10, tous=True):
+        """
+        Documents classés pour une requête en texte libre : chaque mot est
+        ramené à ses racines (racines_du_jeton, voir RacinesDesJetons) ; les
+        mots sans racine connue sont ignorés. Retourne [(nom, score)].
+        """
+        groupes = [racines_du_jeton(jeton) for jeton in jetons(requete)]
+        groupes = [groupe for groupe in groupes if groupe]
+        return [(self.nom(document), score)
+                for document, score in self.rechercher_racines(groupes, k, tous)]
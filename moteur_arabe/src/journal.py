@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Journal des modifications du lexique (écriture anticipée).
+
+Chaque modification de l'arbre (racine ajoutée ou supprimée, dérivé ajouté
+ou retiré) est ajoutée en fin de journal : une ligne, O(1) par opération.
+Les lignes sont transmises au système à chaque écriture, mais fsync n'est
+appelé que toutes les `lot_fsync` opérations (ou après `delai_fsync`
+secondes) : un arrêt brutal de la machine perd au plus ce dernier lot.
+
+Quand le journal devient plus long que le lexique lui-même, il est compacté :
+l'état complet est écrit dans un instantané (export TSV, voir export.py,
+remplacé atomiquement), puis le journal est réécrit avec les seules
+suppressions de racines (-R) encore en vigueur. Au démarrage, restaurer()
+ajoute l'instantané puis le journal à l'arbre tel qu'il a été chargé : les
+racines ajoutées au fichier de données après l'instantané sont gardées, et
+une racine supprimée ne revient pas. Rejouer une opération déjà appliquée
+est sans effet, ce qui rend la relecture sûre même si l'arrêt a eu lieu
+pendant un compactage.
+
+Format (une opération par ligne, champs séparés par des tabulations) :
+    +R  racine
+    -R  racine
+    +D  racine  mot  schème (vide si inconnu)
+    -D  racine  mot
+"""
+import os
+import time
+
+from .export import exporter, importer
+
+# Fichiers par défaut, à côté des données
+JOURNAL_DEFAUT = "data/lexique.journal"
+INSTANTANE_DEFAUT = "data/lexique.instantane"
+
+
+class Journal:
+    """Journal append-only des modifications d'un ArbreAVL (observateur)"""
+
+    def __init__(self, chemin=JOURNAL_DEFAUT, chemin_instantane=INSTANTANE_DEFAUT,
+                 lot_fsync=64, delai_fsync=1.0, seuil_compactage=10000, verbeux=True):
+        self.chemin = chemin
+        self.chemin_instantane = chemin_instantane
+        self.lot_fsync = lot_fsync                # opérations entre deux fsync
+        self.delai_fsync = delai_fsync            # secondes max sans fsync
+        self.seuil_compactage = seuil_compactage  # taille minimale avant compactage
+        self.verbeux = verbeux
+
+        self.arbre = None
+        self.fichier = None
+        self.nb_entrees = 0        # lignes dans le journal depuis le dernier instantané
+        self.supprimees = set()    # racines supprimées (gardées au compactage)
+        self.non_synchronisees = 0
+        self.dernier_fsync = 0.0
+
+    def _afficher(self, message):
+        """Affiche un message si le mode verbeux est actif"""
+        if self.verbeux:
+            print(message)
+
+    @property
+    def ouvert(self):
+        return self.fichier is not None
+
+    # ============ RELECTURE ============
+
+    def restaurer(self, arbre):
+        """
+        Rejoue l'instantané puis le journal sur `arbre`, sans le vider : les
+        racines déjà chargées (fichier de données) restent, sauf celles que
+        le journal supprime. Retourne le nombre d'opérations rejouées.
+        """
+        nb = 0
+        if os.path.exists(self.chemin_instantane):
+            nb_racines, nb_derives = importer(arbre, self.chemin_instantane, "tsv")
+            nb += nb_racines + nb_derives
+        if os.path.exists(self.chemin):
+            self.nb_entrees = self._rejouer(arbre, self.chemin)
+            nb += self.nb_entrees
+        if nb:
+            self._afficher(f"✅ {nb} opération(s) restaurée(s) depuis le journal")
+        return nb
+
+    def _rejouer(self, arbre, chemin):
+        """Applique les lignes complètes d'un fichier ; ignore une fin tronquée"""
+        nb = 0
+        with open(chemin, "r", encoding="utf-8", errors="replace") as f:
+            for ligne in f:
+                if not ligne.endswith("\n"):
+                    break  # dernière ligne interrompue par un arrêt brutal
+                champs = ligne.rstrip("\n").split("\t")
+                if self._appliquer(arbre, champs):
+                    nb += 1
+        return nb
+
+    def _appliquer(self, arbre, champs):
+        """Applique une opération du journal ; False si la ligne est invalide"""
+        operation = champs[0]
+        if operation == "+R" and len(champs) == 2:
+            arbre.ajouter_racine(champs[1])
+            self.supprimees.discard(champs[1])
+        elif operation == "-R" and len(champs) == 2:
+            arbre.supprimer_racine(champs[1])
+            self.supprimees.add(champs[1])
+        elif operation == "+D" and len(champs) == 4:
+            noeud = arbre.chercher(champs[1])
+            if noeud:
+                arbre.enregistrer_derive(noeud, champs[2], champs[3] or None)
+        elif operation == "-D" and len(champs) == 3:
+            noeud = arbre.chercher(champs[1])
+            if noeud:
+                arbre.retirer_derive(noeud, champs[2])
+        else:
+            return False
+        return True
+
+    # ============ ÉCRITURE ============
+
+    def ouvrir(self, arbre):
+        """Commence à journaliser les modifications de `arbre`"""
+        if self.ouvert:
+            return
+        self.arbre = arbre
+        dossier = os.path.dirname(self.chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        # Une ligne tronquée en fin de fichier (arrêt brutal) est retirée
+        with open(self.chemin, "a+b") as f:
+            f.seek(0)
+            contenu = f.read()
+            fin = contenu.rfind(b"\n") + 1
+            if fin < len(contenu):
+                f.truncate(fin)
+
+        self.fichier = open(self.chemin, "a", encoding="utf-8")
+        self.dernier_fsync = time.monotonic()
+        arbre.observateurs.append(self)
+
+    def _ecrire(self, *champs):
+        """Ajoute une opération en fin de journal"""
+        # Compactage amorti : le journal ne dépasse jamais la taille du lexique.
+        # Il a lieu avant l'écriture : l'opération précédente est alors
+        # entièrement appliquée, et la courante est rejouable sur l'instantané.
+        if self.nb_entrees - len(self.supprimees) >= max(
+                self.seuil_compactage, self.arbre.nb_racines() + self.arbre.nb_derives):
+            self.compacter()
+
+        self.fichier.write("\t".join(champs) + "\n")
+        self.fichier.flush()
+        self.nb_entrees += 1
+        self.non_synchronisees += 1
+
+        if (self.non_synchronisees >= self.lot_fsync
+                or time.monotonic() - self.dernier_fsync >= self.delai_fsync):
+            self.synchroniser()
+
+    def synchroniser(self):
+        """Force l'écriture sur disque des opérations en attente (fsync)"""
+        if self.ouvert and self.non_synchronisees:
+            self.fichier.flush()
+            os.fsync(self.fichier.fileno())
+        self.non_synchronisees = 0
+        self.dernier_fsync = time.monotonic()
+
+    def compacter(self):
+        """Écrit l'état complet dans l'instantané, puis réduit le journal aux
+        suppressions"""
+        if not self.ouvert:
+            return
+        self.synchroniser()
+
+        temporaire = self.chemin_instantane + ".tmp"
+        exporter(self.arbre, temporaire, "tsv")
+        with open(temporaire, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(temporaire, self.chemin_instantane)
+
+        # L'instantané est en place : le journal repart des suppressions, qui
+        # doivent encore s'appliquer aux racines du fichier de données
+        self.fichier.truncate(0)
+        self.fichier.seek(0)
+        for racine in sorted(self.supprimees):
+            self.fichier.write(f"-R\t{racine}\n")
+        self.fichier.flush()
+        os.fsync(self.fichier.fileno())
+        self.nb_entrees = len(self.supprimees)
+        self._afficher("🗜️  Journal compacté")
+
+    def fermer(self):
+        """Synchronise et ferme le journal ; l'arbre n'est plus suivi"""
+        if not self.ouvert:
+            return
+        self.synchroniser()
+        self.fichier.close()
+        self.fichier = None
+        if self in self.arbre.observateurs:
+            self.arbre.observateurs.remove(self)
+
+    # ============ ÉVÉNEMENTS DE L'ARBRE ============
+
+    def racine_ajoutee(self, racine):
+        self.supprimees.discard(racine)
+        self._ecrire("+R", racine)
+
+    def racine_supprimee(self, racine):
+        self.supprimees.add(racine)
+        self._ecrire("-R", racine)
+
+    def derive_ajoute(self, racine, mot, scheme=None):
+        self._ecrire("+D", racine, mot, scheme or "")
+
+    def derive_retire(self, racine, mot):
+        self._ecrire("-D", racine, mot)
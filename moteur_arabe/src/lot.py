@@ -0,0 +1,578 @@
+# -*- coding: utf-8 -*-
+"""
+Mode lot (non interactif) du moteur morphologique.
+
+Exemples (depuis le dossier moteur_arabe/) :
+    python -m src.lot generate --scheme فاعل < racines.txt
+    python -m src.lot validate mots_racines.tsv --format jsonl
+    python -m src.lot analyze --pre-generer corpus_mots.txt
+    python -m src.lot analyze --pre-generer --index-compact corpus_mots.txt
+    python -m src.lot analyze --fst corpus_mots.txt
+    python -m src.lot analyze --pre-generer --affixes corpus_mots.txt
+    python -m src.lot analyze --pre-generer --top 3 --priorites frequences.tsv corpus_mots.txt
+    python -m src.lot expand-all
+    python -m src.lot expand --pre-generer requetes_mots.txt
+    python -m src.lot by-scheme --pre-generer --scheme فاعل
+    python -m src.lot stats
+    python -m src.lot export --pre-generer lexique.mlex.gz
+    python -m src.lot fst transducteur.json
+    python -m src.lot index-docs --pre-generer corpus.ridx documents.tsv
+    python -m src.lot search --pre-generer corpus.ridx requetes.txt
+    python -m src.lot discover --seuil 20 --processus 8 corpus1.txt corpus2.txt
+    python -m src.lot discover --inserer --stockage sqlite:lexique.db corpus.txt
+    python -m src.lot analyze --pre-generer --profil piles.txt corpus_mots.txt
+    python -m src.lot delete --stockage sqlite:lexique.db obsoletes.txt
+    python -m src.lot stats --lexique lexique.mlex.gz
+    python -m src.lot expand-all --stockage sqlite:lexique.db
+
+Les entrées sont lues ligne par ligne (fichiers ou stdin, '-' = stdin),
+les résultats sont écrits au fil de l'eau sur stdout (TSV ou JSONL) et
+les statistiques de débit sont affichées sur stderr à la fin.
+"""
+import argparse
+import fileinput
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+from .arbre_abr import ArbreAVL
+from .table_hachage import TableHachage
+from .moteur import MoteurMorphologique
+from .metriques import Metriques
+from .export import detecter_format, exporter, importer
+
+
+class InterfaceLot:
+    """Interface en ligne de commande non interactive (mode lot)"""
+
+    def __init__(self, format_sortie="tsv", sortie=None, erreurs=None, metriques=False,
+                 stockage=None):
+        self.moteur = MoteurMorphologique(verbeux=False, metriques=Metriques(actif=metriques))
+        if stockage is None:
+            self.moteur.initialiser(ArbreAVL(verbeux=False), TableHachage(verbeux=False))
+        else:
+            self.moteur.initialiser(stockage=stockage)
+        self.arbre = self.moteur.arbre_racines
+        self.table = self.moteur.table_schemes
+
+        self.format_sortie = format_sortie
+        self.sortie = sortie or sys.stdout
+        self.erreurs = erreurs or sys.stderr
+
+        # Compteurs pour les statistiques de débit
+        self.nb_entrees = 0
+        self.nb_sorties = 0
+        self.nb_rejets = 0
+
+    # ============ ENTRÉES / SORTIES ============
+
+    def charger_donnees(self, fichier_racines, fichier_schemes):
+        """Charge les racines et les schèmes (sans affichage)"""
+        self.arbre.charger_depuis_fichier(fichier_racines)
+        self.table.charger_depuis_fichier(fichier_schemes)
+
+    def fermer(self):
+        """Valide et ferme le stockage (base SQLite), s'il y en a un"""
+        if self.moteur.stockage is not None:
+            self.moteur.stockage.fermer()
+
+    def lire_lignes(self, fichiers):
+        """Lit les entrées ligne par ligne, champs séparés par des tabulations"""
+        with fileinput.input(files=fichiers or ("-",), encoding="utf-8") as flux:
+            for ligne in flux:
+                ligne = ligne.strip()
+                if not ligne or ligne.startswith("#"):
+                    continue
+                self.nb_entrees += 1
+                yield ligne.split("\t")
+
+    def ecrire(self, colonnes, valeurs):
+        """Écrit un résultat au format choisi (TSV ou JSONL)"""
+        if self.format_sortie == "jsonl":
+            ligne = json.dumps(dict(zip(colonnes, valeurs)), ensure_ascii=False)
+        else:
+            ligne = "\t".join("" if v is None else str(v) for v in valeurs)
+        self.sortie.write(ligne + "\n")
+        self.nb_sorties += 1
+
+    def rejeter(self, champs, raison):
+        """Signale une ligne d'entrée invalide sur stderr"""
+        self.nb_rejets += 1
+        ligne = "\t".join(champs)
+        self.erreurs.write(f"⚠️  Ligne ignorée ({raison}): {ligne}\n")
+
+    def iterer_schemes(self):
+        """Parcourt toutes les entrées de la table des schèmes"""
+        return self.table.iterer()
+
+    def iterer_racines(self):
+        """Parcourt les racines de l'arbre dans l'ordre"""
+        for noeud in self.arbre.iterer_infixe():
+            yield noeud.racine
+
+    def transaction(self):
+        """Regroupe des écritures (une transaction SQLite ; sans effet en mémoire)"""
+        stockage = self.moteur.stockage
+        return stockage.transaction() if stockage is not None else nullcontext()
+
+    def pre_generer(self):
+        """Génère tous les dérivés pour alimenter l'index inverse"""
+        schemes = [entree.cle for entree in self.iterer_schemes()]
+        for racine in self.iterer_racines():
+            # Une transaction par racine : le verrou d'écriture est rendu entre deux
+            with self.transaction():
+                for cle in schemes:
+                    self.moteur.generer_mot(racine, cle)
+
+    # ============ SOUS-COMMANDES ============
+
+    def cmd_generate(self, fichiers, scheme=None):
+        """Entrée: racine[TAB schème] → racine, schème, mot"""
+        colonnes = ("racine", "scheme", "mot")
+        for champs in self.lire_lignes(fichiers):
+            racine = champs[0]
+            cle = champs[1] if len(champs) > 1 else scheme
+            if not cle:
+                self.rejeter(champs, "schème manquant")
+                continue
+            mot = self.moteur.generer_mot(racine, cle)
+            self.ecrire(colonnes, (racine, cle, mot))
+
+    def cmd_validate(self, fichiers):
+        """Entrée: mot TAB racine → mot, racine, valide, schème"""
+        colonnes = ("mot", "racine", "valide", "scheme")
+        for champs in self.lire_lignes(fichiers):
+            if len(champs) < 2:
+                self.rejeter(champs, "racine manquante")
+                continue
+            mot, racine = champs[0], champs[1]
+            valide, scheme = self.moteur.valider_mot(mot, racine)
+            if self.format_sortie == "jsonl":
+                self.ecrire(colonnes, (mot, racine, valide, scheme))
+            else:
+                self.ecrire(colonnes, (mot, racine, int(valide), scheme))
+
+    def cmd_analyze(self, fichiers, distance=0, fst=False, affixes=False, top=0):
+        """
+        Entrée: mot → mot, racine (vide si inconnue).
+        Avec distance > 0, les mots inconnus sont cherchés de façon approchée
+        et deux colonnes s'ajoutent : mot_proche, distance.
+        Avec fst, chaque mot est analysé par le transducteur (enregistré ou
+        non) : une ligne mot, racine, schème par analyse.
+        Avec affixes, les proclitiques et suffixes sont retirés avant la
+        recherche : mot, racine, schème, préfixe, tige, suffixe.
+        Avec top > 0, les `top` analyses les plus probables de chaque mot
+        (voir MoteurMorphologique.analyses_classees) : une ligne mot,
+        racine, schème, score par analyse.
+        """
+        if top:
+            colonnes = ("mot", "racine", "scheme", "score")
+            for champs in self.lire_lignes(fichiers):
+                mot = champs[0]
+                analyses = self.moteur.analyses_classees(mot, top)
+                for racine, cle, score in analyses:
+                    self.ecrire(colonnes, (mot, racine, cle, round(score, 4)))
+                if not analyses:
+                    self.ecrire(colonnes, (mot, None, None, None))
+            return
+
+        if affixes:
+            colonnes = ("mot", "racine", "scheme", "prefixe", "tige", "suffixe")
+            for champs in self.lire_lignes(fichiers):
+                mot = champs[0]
+                analyse = self.moteur.analyser_avec_affixes(mot)
+                self.ecrire(colonnes, (mot,) + (analyse or (None,) * 5))
+            return
+
+        if fst:
+            colonnes = ("mot", "racine", "scheme")
+            transducteur = self.moteur.transducteur()
+            for champs in self.lire_lignes(fichiers):
+                mot = champs[0]
+                analyses = transducteur.analyser(mot)
+                for racine, cle in analyses:
+                    self.ecrire(colonnes, (mot, racine, cle))
+                if not analyses:
+                    self.ecrire(colonnes, (mot, None, None))
+            return
+
+        if not distance:
+            colonnes = ("mot", "racine")
+            for champs in self.lire_lignes(fichiers):
+                mot = champs[0]
+                self.ecrire(colonnes, (mot, self.arbre.trouver_racine_du_mot(mot)))
+            return
+
+        colonnes = ("mot", "racine", "mot_proche", "distance")
+        for champs in self.lire_lignes(fichiers):
+            mot = champs[0]
+            racine = self.arbre.trouver_racine_du_mot(mot)
+            if racine:
+                self.ecrire(colonnes, (mot, racine, mot, 0))
+                continue
+            proches = self.moteur.rechercher_floue(mot, distance)
+            if proches:
+                mot_proche, racine, d = proches[0]
+                self.ecrire(colonnes, (mot, racine, mot_proche, d))
+            else:
+                self.ecrire(colonnes, (mot, None, None, None))
+
+    def cmd_expand_all(self, fichiers):
+        """Entrée: racine (ou toutes les racines) → racine, schème, mot"""
+        colonnes = ("racine", "scheme", "mot")
+        schemes = [entree.cle for entree in self.iterer_schemes()]
+
+        if fichiers:
+            racines = (champs[0] for champs in self.lire_lignes(fichiers))
+        else:
+            racines = self.iterer_racines()
+
+        for racine in racines:
+            with self.transaction():
+                for cle in schemes:
+                    mot = self.moteur.generer_mot(racine, cle)
+                    if mot:
+                        self.ecrire(colonnes, (racine, cle, mot))
+
+    def cmd_expand(self, fichiers):
+        """Entrée: mot → mot, racine, forme pour chaque forme de sa famille (expansion de requête)"""
+        colonnes = ("mot", "racine", "forme")
+        for champs in self.lire_lignes(fichiers):
+            mot = champs[0]
+            racine, famille = self.moteur.etendre(mot)
+            for forme in sorted(famille):
+                self.ecrire(colonnes, (mot, racine, forme))
+            if not famille:
+                self.ecrire(colonnes, (mot, None, None))
+
+    def cmd_by_scheme(self, fichiers, scheme=None):
+        """Entrée: schème (ou --scheme) → schème, mot, racine pour tous les mots connus"""
+        colonnes = ("scheme", "mot", "racine")
+        if scheme:
+            cles = [scheme]
+        else:
+            cles = (champs[0] for champs in self.lire_lignes(fichiers))
+        for cle in cles:
+            for mot, racine in self.moteur.mots_du_scheme(cle):
+                self.ecrire(colonnes, (cle, mot, racine))
+
+    def cmd_delete(self, fichiers):
+        """Entrée: racine → nombre de racines supprimées (un seul lot)"""
+        colonnes = ("statistique", "valeur")
+        racines = [champs[0] for champs in self.lire_lignes(fichiers)]
+        self.ecrire(colonnes, ("racines_supprimees", self.arbre.supprimer_lot(racines)))
+
+    def cmd_stats(self):
+        """Statistiques sur les données chargées"""
+        colonnes = ("statistique", "valeur")
+        self.ecrire(colonnes, ("racines", self.arbre.nb_racines()))
+        self.ecrire(colonnes, ("schemes", sum(1 for _ in self.iterer_schemes())))
+        self.ecrire(colonnes, ("derives", self.arbre.nb_derives))
+        self.ecrire(colonnes, ("index_inverse", len(self.arbre.index_inverse)))
+        for cle, nombre in sorted(self.arbre.usage_schemes.items()):
+            self.ecrire(colonnes, (f"scheme:{cle}", nombre))
+
+    def cmd_export(self, chemin):
+        """Écrit le lexique complet (format d'après l'extension : .tsv, .jsonl, .mlex[.gz|.zst])"""
+        nb_octets = exporter(self.arbre, chemin)
+        self.nb_sorties += self.arbre.nb_racines() + self.arbre.nb_derives
+        self.erreurs.write(f"📤 {nb_octets:,} octet(s) écrits dans '{chemin}'\n")
+
+    def cmd_fst(self, chemin):
+        """Compile le transducteur (schèmes + racines) et l'écrit en JSON"""
+        transducteur = self.moteur.transducteur()
+        transducteur.sauvegarder(chemin)
+        self.nb_sorties += 1
+        self.erreurs.write(f"📤 Transducteur écrit dans '{chemin}' "
+                           f"({len(transducteur.sorties)} état(s), "
+                           f"{len(transducteur.cles)} schème(s))\n")
+
+    def cmd_discover(self, fichiers, seuil=5, processus=None, inserer=False):
+        """
+        Corpus (fichiers, sinon stdin) → racine, support, connue pour les
+        racines candidates attestées au moins `seuil` fois (voir decouverte.py) ;
+        avec inserer, les racines nouvelles sont ajoutées en un lot
+        """
+        from .decouverte import decouvrir
+        fichiers = [f for f in fichiers if f != "-"]
+        lignes = None if fichiers else sys.stdin
+        racines, compteur = decouvrir(self.moteur, fichiers, lignes, seuil, processus)
+        self.nb_entrees += compteur.total
+        colonnes = ("racine", "support", "connue")
+        for racine, support in racines:
+            self.ecrire(colonnes, (racine, support, self.arbre.chercher(racine) is not None))
+        self.erreurs.write(f"🔎 {compteur.total:,} occurrence(s) candidate(s), "
+                           f"{len(racines):,} racine(s) ≥ {seuil} "
+                           f"(sous-estimation max {compteur.erreur:,})\n")
+        if inserer:
+            nouvelles = self.arbre.inserer_lot(racine for racine, _ in racines)
+            self.erreurs.write(f"✅ {nouvelles:,} racine(s) nouvelle(s) insérée(s)\n")
+
+    def cmd_index_docs(self, chemin, fichiers):
+        """
+        Entrée: nom TAB texte (ou texte seul : nommé d'après son numéro de
+        ligne) → index de documents par racine dans `chemin`
+        """
+        from .index_documents import indexer
+
+        def documents():
+            for champs in self.lire_lignes(fichiers):
+                if len(champs) > 1:
+                    yield champs[0], " ".join(champs[1:])
+                else:
+                    yield str(self.nb_entrees), champs[0]
+
+        stats = indexer(self.moteur, documents(), chemin)
+        self.nb_sorties += 1
+        self.erreurs.write(f"📤 {stats['documents']:,} document(s), {stats['racines']:,} racine(s), "
+                           f"{stats['octets']:,} octet(s) écrits dans '{chemin}'\n")
+
+    def cmd_search(self, chemin, fichiers, k=10, tous=True):
+        """Entrée: requête (texte libre) → requête, rang, document, score"""
+        from .index_documents import IndexDocuments, RacinesDesJetons
+        colonnes = ("requete", "rang", "document", "score")
+        racines_du_jeton = RacinesDesJetons(self.moteur)
+        with IndexDocuments(chemin) as index:
+            for champs in self.lire_lignes(fichiers):
+                requete = " ".join(champs)
+                resultats = index.rechercher(requete, racines_du_jeton, k, tous)
+                for rang, (nom, score) in enumerate(resultats, 1):
+                    self.ecrire(colonnes, (requete, rang, nom, round(score, 4)))
+                if not resultats:
+                    self.ecrire(colonnes, (requete, None, None, None))
+
+    def afficher_debit(self, duree):
+        """Affiche les statistiques de débit sur stderr"""
+        duree = max(duree, 1e-9)
+        self.erreurs.write(
+            f"📊 {self.nb_entrees} entrée(s), {self.nb_sorties} sortie(s), "
+            f"{self.nb_rejets} rejet(s) en {duree:.3f} s "
+            f"({self.nb_entrees / duree:,.0f} entrées/s, "
+            f"{self.nb_sorties / duree:,.0f} sorties/s)\n"
+        )
+
+
+def construire_parseur():
+    """Construit le parseur d'arguments des sous-commandes"""
+    commun = argparse.ArgumentParser(add_help=False)
+    commun.add_argument("--racines", default="data/racines.txt",
+                        help="fichier des racines (défaut: data/racines.txt)")
+    commun.add_argument("--schemes", default="data/schemas.txt",
+                        help="fichier des schèmes (défaut: data/schemas.txt)")
+    commun.add_argument("--stockage", default=None, metavar="ADRESSE",
+                        help="stockage du lexique : memoire (défaut) ou sqlite:CHEMIN")
+    commun.add_argument("--lexique", metavar="FICHIER",
+                        help="lexique exporté à recharger (racines, dérivés, index inverse)")
+    commun.add_argument("--format", dest="format_sortie", choices=("tsv", "jsonl"),
+                        default="tsv", help="format de sortie (défaut: tsv)")
+    commun.add_argument("--pre-generer", action="store_true",
+                        help="génère tous les dérivés avant traitement (index inverse complet)")
+    commun.add_argument("--index-compact", action="store_true",
+                        help="compacte l'index inverse (DAWG) avant traitement : "
+                             "moins de mémoire, recherches un peu plus lentes")
+    commun.add_argument("--sans-stats", action="store_true",
+                        help="n'affiche pas les statistiques de débit sur stderr")
+    commun.add_argument("--metriques", metavar="FICHIER",
+                        help="active les métriques et les écrit au format Prometheus "
+                             "('-' = stderr)")
+    commun.add_argument("--profil", metavar="FICHIER",
+                        help="profile le traitement : piles repliées pour flamegraph "
+                             "(ou pstats avec --profil-mode cprofile) ; SIGUSR1 le bascule")
+    commun.add_argument("--profil-mode", choices=("echantillons", "cprofile"),
+                        default="echantillons", help="échantillonnage des piles (défaut) ou cProfile")
+    commun.add_argument("--profil-attente", action="store_true",
+                        help="profileur à l'arrêt au départ : mis en marche par SIGUSR1")
+
+    parseur = argparse.ArgumentParser(
+        prog="python -m src.lot",
+        description="Moteur morphologique arabe - mode lot (non interactif)"
+    )
+    sous = parseur.add_subparsers(dest="commande", required=True)
+
+    p = sous.add_parser("generate", parents=[commun],
+                        help="génère des mots (racine[TAB schème] par ligne)")
+    p.add_argument("--scheme", help="schème par défaut si la ligne n'en donne pas")
+    p.add_argument("fichiers", nargs="*", help="fichiers d'entrée ('-' = stdin)")
+
+    p = sous.add_parser("validate", parents=[commun],
+                        help="valide des mots (mot TAB racine par ligne)")
+    p.add_argument("fichiers", nargs="*", help="fichiers d'entrée ('-' = stdin)")
+
+    p = sous.add_parser("analyze", parents=[commun],
+                        help="trouve la racine de mots (un mot par ligne)")
+    p.add_argument("--distance", type=int, default=0, choices=(0, 1, 2),
+                   help="recherche approchée des mots inconnus (distance d'édition max)")
+    p.add_argument("--fst", action="store_true",
+                   help="analyse chaque mot par le transducteur (toutes les analyses)")
+    p.add_argument("--affixes", action="store_true",
+                   help="retire proclitiques et suffixes (و، ال، ها...) avant la recherche")
+    p.add_argument("--top", type=int, default=0, metavar="K",
+                   help="les K analyses (racine, schème) les plus probables de chaque mot")
+    p.add_argument("--priorites", metavar="FICHIER",
+                   help="fréquences a priori pour --top (R|S TAB clé TAB fréquence)")
+    p.add_argument("fichiers", nargs="*", help="fichiers d'entrée ('-' = stdin)")
+
+    p = sous.add_parser("expand-all", parents=[commun],
+                        help="génère tous les dérivés (toutes les racines si aucun fichier)")
+    p.add_argument("fichiers", nargs="*", help="fichiers de racines ('-' = stdin)")
+
+    p = sous.add_parser("expand", parents=[commun],
+                        help="famille morphologique de mots de requête (un mot par ligne)")
+    p.add_argument("fichiers", nargs="*", help="fichiers d'entrée ('-' = stdin)")
+
+    p = sous.add_parser("by-scheme", parents=[commun],
+                        help="mots connus produits par un schème (un schème par ligne)")
+    p.add_argument("--scheme", help="schème à interroger (sinon lu en entrée)")
+    p.add_argument("fichiers", nargs="*", help="fichiers de schèmes ('-' = stdin)")
+
+    p = sous.add_parser("delete", parents=[commun],
+                        help="supprime des racines et leurs dérivés (une racine par ligne)")
+    p.add_argument("fichiers", nargs="*", help="fichiers de racines ('-' = stdin)")
+
+    sous.add_parser("stats", parents=[commun], help="statistiques sur les données")
+
+    p = sous.add_parser("export", parents=[commun],
+                        help="exporte le lexique (.tsv, .jsonl ou .mlex, option .gz/.zst)")
+    p.add_argument("fichier", help="fichier de sortie")
+
+    p = sous.add_parser("fst", parents=[commun],
+                        help="compile le transducteur des schèmes et racines (JSON)")
+    p.add_argument("fichier", help="fichier de sortie")
+
+    p = sous.add_parser("discover", parents=[commun],
+                        help="découvre des racines candidates dans un corpus (texte libre)")
+    p.add_argument("--seuil", type=int, default=5,
+                   help="occurrences minimum d'une racine proposée (défaut: 5)")
+    p.add_argument("--processus", type=int, default=None,
+                   help="processus de comptage (défaut: un par cœur)")
+    p.add_argument("--inserer", action="store_true",
+                   help="insère les racines proposées dans le lexique")
+    p.add_argument("fichiers", nargs="*", help="fichiers du corpus ('-' = stdin)")
+
+    p = sous.add_parser("index-docs", parents=[commun],
+                        help="indexe des documents par racine (nom TAB texte par ligne)")
+    p.add_argument("index", help="fichier d'index à écrire")
+    p.add_argument("fichiers", nargs="*", help="fichiers de documents ('-' = stdin)")
+
+    p = sous.add_parser("search", parents=[commun],
+                        help="cherche des documents (une requête par ligne)")
+    p.add_argument("index", help="fichier d'index (écrit par index-docs)")
+    p.add_argument("-k", type=int, default=10, help="documents par requête (défaut: 10)")
+    p.add_argument("--ou", action="store_true",
+                   help="au moins un mot de la requête (par défaut : tous)")
+    p.add_argument("fichiers", nargs="*", help="fichiers de requêtes ('-' = stdin)")
+
+    return parseur
+
+
+def principal(argv=None):
+    """Point d'entrée du mode lot"""
+    parseur = construire_parseur()
+    args = parseur.parse_args(argv)
+    sortie_lexique = args.fichier if args.commande == "export" else None
+    for chemin in (args.lexique, sortie_lexique):
+        if chemin:
+            try:
+                detecter_format(chemin)
+            except ValueError as e:
+                parseur.error(str(e))
+    # Les chargeurs se rabattent en silence sur un lexique vide (ou les
+    # schèmes par défaut) : un fichier illisible est une erreur en mode lot
+    for chemin in (args.racines, args.schemes):
+        try:
+            with open(chemin, encoding="utf-8"):
+                pass
+        except OSError as e:
+            parseur.error(f"lecture de '{chemin}' impossible : {e.strerror}")
+
+    try:
+        interface = InterfaceLot(format_sortie=args.format_sortie,
+                                 metriques=bool(args.metriques),
+                                 stockage=args.stockage)
+    except ValueError as e:
+        parseur.error(str(e))
+    interface.charger_donnees(args.racines, args.schemes)
+    if args.lexique:
+        try:
+            importer(interface.arbre, args.lexique)
+        except (OSError, ValueError) as e:
+            parseur.error(str(e))
+    if getattr(args, "priorites", None):
+        try:
+            interface.moteur.charger_priorites(args.priorites)
+        except (OSError, ValueError) as e:
+            parseur.error(str(e))
+
+    profileur = None
+    if args.profil:
+        from .profilage import Profileur, installer_signal
+        profileur = Profileur(args.profil_mode)
+        installer_signal(profileur)
+        if not args.profil_attente:
+            profileur.demarrer()
+
+    debut = time.perf_counter()
+    try:
+        if args.pre_generer:
+            interface.pre_generer()
+        if args.index_compact:
+            if not hasattr(interface.arbre, "compacter_index"):
+                parseur.error("--index-compact n'existe que pour le stockage en mémoire")
+            interface.arbre.compacter_index()
+
+        if args.commande == "generate":
+            interface.cmd_generate(args.fichiers, args.scheme)
+        elif args.commande == "validate":
+            interface.cmd_validate(args.fichiers)
+        elif args.commande == "analyze":
+            interface.cmd_analyze(args.fichiers, args.distance, args.fst, args.affixes, args.top)
+        elif args.commande == "expand-all":
+            interface.cmd_expand_all(args.fichiers)
+        elif args.commande == "expand":
+            interface.cmd_expand(args.fichiers)
+        elif args.commande == "by-scheme":
+            interface.cmd_by_scheme(args.fichiers, args.scheme)
+        elif args.commande == "delete":
+            interface.cmd_delete(args.fichiers)
+        elif args.commande == "stats":
+            interface.cmd_stats()
+        elif args.commande == "export":
+            interface.cmd_export(args.fichier)
+        elif args.commande == "fst":
+            interface.cmd_fst(args.fichier)
+        elif args.commande == "discover":
+            interface.cmd_discover(args.fichiers, args.seuil, args.processus, args.inserer)
+        elif args.commande == "index-docs":
+            interface.cmd_index_docs(args.index, args.fichiers)
+        elif args.commande == "search":
+            interface.cmd_search(args.index, args.fichiers, args.k, not args.ou)
+        interface.sortie.flush()
+        interface.fermer()
+    except BrokenPipeError:
+        # Sortie fermée en aval (ex: | head) : on s'arrête proprement
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if profileur is not None:
+            profileur.arreter()
+            profileur.ecrire(args.profil)
+            interface.erreurs.write(f"{profileur.resume()} → '{args.profil}'\n")
+
+    if not args.sans_stats:
+        interface.afficher_debit(time.perf_counter() - debut)
+    if args.metriques:
+        texte = interface.moteur.texte_prometheus()
+        if args.metriques == "-":
+            interface.erreurs.write(texte)
+        else:
+            with open(args.metriques, "w", encoding="utf-8") as f:
+                f.write(texte)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Compteurs et chronomètres du moteur, désactivés par défaut.
+
+Désactivées, les métriques ne coûtent qu'un test de booléen aux quelques
+points de comptage. Activées (MoteurMorphologique.activer_metriques), les
+méthodes principales sont enveloppées pour mesurer leur durée et les
+compteurs enregistrent les appels,
+les succès de l'index inverse, les balayages de schèmes, la profondeur des
+recherches dans l'AVL et la longueur des chaînes de hachage parcourues.
+"""
+import functools
+import time
+
+
+class Metriques:
+    """Compteurs (valeurs cumulées) et distributions (nombre, somme, max)"""
+
+    def __init__(self, actif=False, prefixe="moteur"):
+        self.actif = actif
+        self.prefixe = prefixe
+        self.compteurs = {}       # nom → valeur
+        self.distributions = {}   # nom → [nombre, somme, maximum]
+
+    def reinitialiser(self):
+        """Remet tous les compteurs à zéro"""
+        self.compteurs.clear()
+        self.distributions.clear()
+
+    def incrementer(self, nom, valeur=1):
+        """Ajoute `valeur` au compteur `nom`"""
+        self.compteurs[nom] = self.compteurs.get(nom, 0) + valeur
+
+    def observer(self, nom, valeur):
+        """Enregistre une observation (durée, profondeur, nombre de schèmes...)"""
+        distribution = self.distributions.get(nom)
+        if distribution is None:
+            self.distributions[nom] = [1, valeur, valeur]
+        else:
+            distribution[0] += 1
+            distribution[1] += valeur
+            if valeur > distribution[2]:
+                distribution[2] = valeur
+
+    def instantane(self):
+        """Copie des métriques sous forme de dictionnaire"""
+        return {
+            "compteurs": dict(self.compteurs),
+            "distributions": {
+                nom: {
+                    "nombre": nombre,
+                    "somme": somme,
+                    "moyenne": somme / nombre if nombre else 0,
+                    "max": maximum,
+                }
+                for nom, (nombre, somme, maximum) in self.distributions.items()
+            },
+        }
+
+    def texte_prometheus(self, jauges=None):
+        """Export au format texte de Prometheus (jauges = valeurs instantanées en plus)"""
+        lignes = []
+        for nom in sorted(self.compteurs):
+            metrique = f"{self.prefixe}_{nom}_total"
+            lignes.append(f"# TYPE {metrique} counter")
+            lignes.append(f"{metrique} {self.compteurs[nom]}")
+
+        for nom in sorted(self.distributions):
+            nombre, somme, maximum = self.distributions[nom]
+            metrique = f"{self.prefixe}_{nom}"
+            lignes.append(f"# TYPE {metrique} summary")
+            lignes.append(f"{metrique}_count {nombre}")
+            lignes.append(f"{metrique}_sum {somme}")
+            lignes.append(f"# TYPE {metrique}_max gauge")
+            lignes.append(f"{metrique}_max {maximum}")
+
+        for nom, valeur in sorted((jauges or {}).items()):
+            metrique = f"{self.prefixe}_{nom}"
+            lignes.append(f"# TYPE {metrique} gauge")
+            lignes.append(f"{metrique} {valeur}")
+
+        return "\n".join(lignes) + "\n"
+
+
+def instrumenter(objet, methodes, metriques):
+    """
+    Remplace sur l'instance `objet` chaque méthode {nom: nom_metrique} par une
+    enveloppe qui mesure sa durée (distribution `<nom_metrique>_secondes`).
+    Rien n'est ajouté sur la classe : sans instrumentation, aucun surcoût.
+    """
+    horloge = time.perf_counter
+    for nom, nom_metrique in methodes.items():
+        methode = getattr(type(objet), nom).__get__(objet)
+        cle = f"{nom_metrique}_secondes"
+
+        def enveloppe(*args, _methode=methode, _cle=cle, **kwargs):
+            debut = horloge()
+            try:
+                return _methode(*args, **kwargs)
+            finally:
+                metriques.observer(_cle, horloge() - debut)
+
+        functools.update_wrapper(enveloppe, methode)
+        setattr(objet, nom, enveloppe)
+
+
+def desinstrumenter(objet, methodes):
+    """Retire les enveloppes posées par instrumenter()"""
+    for nom in methodes:
+        objet.__dict__.pop(nom, None)
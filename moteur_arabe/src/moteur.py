@@ -1,159 +1,588 @@
-# -*- coding: utf-8 -*-
-class MoteurMorphologique:
-    """Moteur principal pour générer et valider les mots"""
-    
-    def __init__(self):
-        self.arbre_racines = None
-        self.table_schemes = None
-    
-    def initialiser(self, arbre, table):
-        """Initialise avec les structures de données"""
-        self.arbre_racines = arbre
-        self.table_schemes = table
-    
-    def generer_mot(self, racine, scheme_cle):
-        """Génère un mot à partir d'une racine et d'un schème"""
-        # Vérifier si la racine existe
-        noeud = self.arbre_racines.rechercher(self.arbre_racines.racine, racine)
-        if not noeud:
-            print(f"❌ Racine '{racine}' non trouvée")
-            return None
-        
-        # Vérifier si le schème existe
-        scheme = self.table_schemes.rechercher(scheme_cle)
-        if not scheme:
-            print(f"❌ Schème '{scheme_cle}' non trouvé")
-            return None
-        
-        if len(racine) < 3:
-            print("❌ Racine doit avoir au moins 3 caractères")
-            return None
-        
-        # Générer le mot
-        pattern = scheme.pattern
-        mot_generé = pattern.replace('C1', racine[0])\
-                            .replace('C2', racine[1])\
-                            .replace('C3', racine[2])
-        
-        print(f"✅ Mot généré: {mot_generé}")
-        
-        # Ajouter aux dérivés et à l'index inverse
-        if mot_generé not in noeud.derivees:
-            noeud.derivees.append(mot_generé)
-            # MET À JOUR L'INDEX INVERSE (TRÈS IMPORTANT !)
-            self.arbre_racines.index_inverse[mot_generé] = racine
-        
-        return mot_generé
-    
-    def valider_mot(self, mot, racine):
-        """Vérifie si un mot vient d'une racine donnée"""
-        print(f"\n🔍 Validation : mot='{mot}', racine='{racine}'")
-        
-        # VÉRIFICATION RAPIDE AVEC INDEX INVERSE (O(1) !)
-        racine_trouvee = self.arbre_racines.trouver_racine_du_mot(mot)
-        if racine_trouvee:
-            if racine_trouvee == racine:
-                print(f"✅✅✅ Mot '{mot}' déjà validé! (via index inverse)")
-                return True, "déjà connu"
-            else:
-                print(f"❌ Mot '{mot}' appartient à la racine '{racine_trouvee}', pas à '{racine}'")
-                return False, None
-        
-        # Si pas dans l'index inverse, vérifie normalement
-        noeud = self.arbre_racines.rechercher(self.arbre_racines.racine, racine)
-        if not noeud:
-            print(f"❌ Racine '{racine}' non trouvée")
-            return False, None
-        
-        # Si le mot est déjà dans les dérivés validés
-        if mot in noeud.derivees:
-            print(f"✅ Mot '{mot}' déjà validé pour la racine '{racine}'")
-            return True, "déjà connu"
-        
-        # Extraire les consonnes de la racine
-        if len(racine) >= 3:
-            c1, c2, c3 = racine[0], racine[1], racine[2]
-        else:
-            return False, None
-        
-        # Chercher dans tous les schèmes
-        scheme_trouve = None
-        
-        for i in range(self.table_schemes.taille):
-            entree = self.table_schemes.table[i]
-            while entree:
-                pattern = entree.pattern
-                
-                # Générer le mot avec ce pattern
-                mot_test = pattern.replace('C1', c1)\
-                                   .replace('C2', c2)\
-                                   .replace('C3', c3)
-                
-                if mot_test == mot:
-                    scheme_trouve = entree.cle
-                    break
-                
-                entree = entree.suivant
-            
-            if scheme_trouve:
-                break
-        
-        if scheme_trouve:
-            # Ajouter aux dérivés validés
-            noeud.derivees.append(mot)
-            # AJOUTER À L'INDEX INVERSE
-            self.arbre_racines.index_inverse[mot] = racine
-            
-            print(f"✅ Mot '{mot}' validé! Schème: {scheme_trouve}")
-            return True, scheme_trouve
-        else:
-            print(f"❌ Mot '{mot}' ne correspond à aucun schème pour la racine '{racine}'")
-            return False, None
-    
-    def afficher_famille(self, racine):
-        """Affiche tous les dérivés d'une racine"""
-        noeud = self.arbre_racines.rechercher(self.arbre_racines.racine, racine)
-        if not noeud:
-            print(f"❌ Racine '{racine}' non trouvée")
-            return
-        
-        print(f"\n=== FAMILLE MORPHOLOGIQUE DE '{racine}' ===")
-        if noeud.derivees:
-            for i, mot in enumerate(noeud.derivees, 1):
-                print(f"{i}. {mot}")
-        else:
-            print("Aucun dérivé enregistré")
-        
-        print(f"\nTotal: {len(noeud.derivees)} mot(s)")
-    
-    def generer_tous_dérivés(self, racine):
-        """Génère tous les dérivés possibles pour une racine"""
-        noeud = self.arbre_racines.rechercher(self.arbre_racines.racine, racine)
-        if not noeud:
-            print(f"❌ Racine '{racine}' non trouvée")
-            return []
-        
-        print(f"\n=== GÉNÉRATION DE TOUS LES DÉRIVÉS POUR '{racine}' ===")
-        mots_generes = []
-        
-        # Parcourir tous les schèmes
-        for i in range(self.table_schemes.taille):
-            entree = self.table_schemes.table[i]
-            while entree:
-                mot = self.generer_mot(racine, entree.cle)
-                if mot and mot not in mots_generes:
-                    mots_generes.append(mot)
-                entree = entree.suivant
-        
-        print(f"\n✅ {len(mots_generes)} dérivé(s) généré(s)")
-        return mots_generes
-    
-    def trouver_racine_d_un_mot(self, mot):
-        """Trouve la racine d'un mot donné"""
-        racine = self.arbre_racines.trouver_racine_du_mot(mot)
-        if racine:
-            print(f"✅ Le mot '{mot}' vient de la racine: {racine}")
-            return racine
-        else:
-            print(f"❌ Mot '{mot}' non trouvé dans la base")
-            return None
\ No newline at end of file
+# -*- coding: utf-8 -*-
+import heapq
+
+from .metriques import Metriques, instrumenter, desinstrumenter
+from .utils import retirer_diacritiques
+
+class MoteurMorphologique:
+    """Moteur principal pour générer et valider les mots"""
+    
+    # Méthodes chronométrées quand les métriques sont actives → nom de métrique
+    METHODES_MESUREES = {
+        "generer_mot": "generer_mot",
+        "valider_mot": "valider_mot",
+        "generer_tous_dérivés": "generer_tous_derives",
+        "trouver_racine_d_un_mot": "trouver_racine",
+        "analyser_avec_affixes": "analyse_affixes",
+        "analyses_classees": "analyses_classees",
+        "etendre": "etendre",
+    }
+    
+    # Paradigmes gardés en cache (les plus anciens sont oubliés au-delà)
+    TAILLE_CACHE_PARADIGMES = 4096
+    
+    def __init__(self, verbeux=True, metriques=None):
+        self.arbre_racines = None
+        self.table_schemes = None
+        self.stockage = None          # Stockage d'où viennent l'arbre et la table (optionnel)
+        self.verbeux = verbeux        # False en mode lot (pas d'affichage)
+        self._recherche_floue = None  # Index approché, construit au premier besoin
+        self._paradigmes = {}         # racine → paradigme, pour une version de la table
+        self._version_paradigmes = None
+        self._familles = None         # Familles par racine (expansion), au premier besoin
+        self._transducteur = None     # Automate des schèmes, compilé au premier besoin
+        self._affixes = None          # Découpeur d'affixes (proclitiques, suffixes)
+        # Fréquences a priori des racines et des schèmes (classement des analyses) ;
+        # schèmes : usage dans le lexique tant qu'aucune fréquence n'est fixée
+        self.priorites_racines = {}
+        self.priorites_schemes = None
+        # Compteurs et chronomètres (inactifs par défaut, voir activer_metriques)
+        self.metriques = metriques if metriques is not None else Metriques()
+        if self.metriques.actif:
+            self.activer_metriques()
+    
+    def _afficher(self, message):
+        """Affiche un message si le mode verbeux est actif"""
+        if self.verbeux:
+            print(message)
+    
+    def initialiser(self, arbre=None, table=None, stockage=None):
+        """
+        Initialise avec les structures de données, ou avec un stockage qui
+        les fournit : objet (StockageMemoire, StockageSQLite) ou adresse
+        ("memoire", "sqlite:lexique.db"), voir stockage.py
+        """
+        if stockage is not None:
+            if isinstance(stockage, str):
+                from .stockage import ouvrir_stockage
+                stockage = ouvrir_stockage(stockage, verbeux=self.verbeux)
+            arbre, table = stockage.arbre, stockage.table
+        if self._transducteur is not None:
+            self._transducteur.detacher()
+            self._transducteur = None
+        if self._familles is not None:
+            self._familles.detacher()
+            self._familles = None
+        self.stockage = stockage
+        self.arbre_racines = arbre
+        self.table_schemes = table
+        self._recherche_floue = None
+        self._paradigmes = {}
+        self._version_paradigmes = None
+    
+    def activer_metriques(self, actif=True):
+        """Active (ou coupe) les métriques à chaud"""
+        self.metriques.actif = actif
+        desinstrumenter(self, self.METHODES_MESUREES)
+        if actif:
+            instrumenter(self, self.METHODES_MESUREES, self.metriques)
+    
+    def _chercher_noeud(self, racine):
+        """Recherche une racine (profondeur AVL mesurée si les métriques sont actives)"""
+        if not self.metriques.actif:
+            return self.arbre_racines.chercher(racine)
+        
+        noeud, profondeur = self.arbre_racines.rechercher_profondeur(racine)
+        self.metriques.observer("avl_profondeur", profondeur)
+        if not noeud:
+            self.metriques.incrementer("racines_inconnues")
+        return noeud
+    
+    def _chercher_scheme(self, scheme_cle):
+        """Recherche un schème (chaîne de hachage mesurée si les métriques sont actives)"""
+        if not self.metriques.actif:
+            return self.table_schemes.rechercher(scheme_cle)
+        
+        scheme, sondes = self.table_schemes.rechercher_sondage(scheme_cle)
+        self.metriques.observer("hachage_sondes", sondes)
+        if not scheme:
+            self.metriques.incrementer("schemes_inconnus")
+        return scheme
+    
+    def synchroniser_derives(self):
+        """
+        Remet les dérivés enregistrés en accord avec la table des schèmes.
+        L'arbre retient la version de la table dont ses dérivés sont issus
+        (epoque_schemes) : seules les cases (racine, schème) des schèmes
+        redéfinis depuis sont recalculées, jamais tout l'index.
+        Retourne le nombre de cases recalculées.
+        """
+        arbre = self.arbre_racines
+        version = self.table_schemes.version
+        if arbre.epoque_schemes == version:
+            return 0
+        
+        nb_cases = 0
+        for cle in self.table_schemes.cles_modifiees_depuis(arbre.epoque_schemes):
+            cases = {}
+            for racine, mot in arbre.derives_du_scheme(cle):
+                cases.setdefault(racine, []).append(mot)
+            pattern = self.table_schemes.rechercher(cle).pattern
+            # Ordre des racines : un mot partagé finit indexé sous la même
+            # racine quel que soit l'ordre de l'index des schèmes
+            for racine, mots in sorted(cases.items()):
+                self._recalculer_case(racine, cle, pattern, mots)
+            nb_cases += len(cases)
+        arbre.epoque_schemes = version
+        
+        if nb_cases:
+            self._afficher(f"🔄 {nb_cases} dérivé(s) recalculé(s) après modification des schèmes")
+        return nb_cases
+    
+    def _recalculer_case(self, racine, cle, pattern, mots):
+        """Remplace les mots d'une case (racine, schème) par la seule forme
+        (sans diacritiques) du nouveau pattern"""
+        if len(racine) < 3:
+            # Comme generer_mot : pas de nouvelle forme, les mots restent tels quels
+            self._afficher(f"❌ Racine '{racine}' : au moins 3 caractères pour recalculer '{cle}'")
+            return
+        arbre = self.arbre_racines
+        noeud = arbre.chercher(racine)
+        nouveau = pattern.replace('C1', racine[0])\
+                         .replace('C2', racine[1])\
+                         .replace('C3', racine[2])
+        for mot in mots:
+            if mot != nouveau:
+                arbre.retirer_derive(noeud, mot)
+        arbre.enregistrer_derive(noeud, nouveau, cle)
+    
+    def generer_mot(self, racine, scheme_cle):
+        """Génère un mot à partir d'une racine et d'un schème"""
+        if self.table_schemes.version != self.arbre_racines.epoque_schemes:
+            self.synchroniser_derives()
+        
+        # Vérifier si la racine existe
+        noeud = self._chercher_noeud(racine)
+        if not noeud:
+            self._afficher(f"❌ Racine '{racine}' non trouvée")
+            return None
+        
+        # Vérifier si le schème existe
+        scheme = self._chercher_scheme(scheme_cle)
+        if not scheme:
+            self._afficher(f"❌ Schème '{scheme_cle}' non trouvé")
+            return None
+        
+        if len(racine) < 3:
+            self._afficher("❌ Racine doit avoir au moins 3 caractères")
+            return None
+        
+        # Générer le mot
+        pattern = scheme.pattern
+        mot_generé = pattern.replace('C1', racine[0])\
+                            .replace('C2', racine[1])\
+                            .replace('C3', racine[2])
+        
+        self._afficher(f"✅ Mot généré: {mot_generé}")
+        
+        # Ajouter aux dérivés et à l'index inverse
+        self.arbre_racines.enregistrer_derive(noeud, mot_generé, scheme_cle)
+        
+        return mot_generé
+    
+    def valider_mot(self, mot, racine):
+        """Vérifie si un mot vient d'une racine donnée"""
+        self._afficher(f"\n🔍 Validation : mot='{mot}', racine='{racine}'")
+        if self.table_schemes.version != self.arbre_racines.epoque_schemes:
+            self.synchroniser_derives()
+        metriques = self.metriques
+        
+        # VÉRIFICATION RAPIDE AVEC INDEX INVERSE (O(1) !)
+        racine_trouvee = self.arbre_racines.trouver_racine_du_mot(mot)
+        if metriques.actif:
+            metriques.incrementer("index_inverse_succes" if racine_trouvee else "index_inverse_echecs")
+        if racine_trouvee:
+            if racine_trouvee == racine:
+                scheme = self._scheme_connu(self.arbre_racines.chercher(racine), mot)
+                self._afficher(f"✅✅✅ Mot '{mot}' déjà validé! (via index inverse) Schème: {scheme}")
+                return True, scheme
+            # Mot partagé : l'index désigne une autre racine, mais le mot a
+            # pu être enregistré aussi pour celle-ci
+            noeud = self.arbre_racines.chercher(racine)
+            if noeud and self._analyse_enregistree(noeud, mot):
+                scheme = self._scheme_connu(noeud, mot)
+                self._afficher(f"✅✅ Mot '{mot}' déjà validé pour '{racine}' "
+                               f"(aussi analysé sous '{racine_trouvee}') Schème: {scheme}")
+                return True, scheme
+            self._afficher(f"❌ Mot '{mot}' appartient à la racine '{racine_trouvee}', pas à '{racine}'")
+            return False, None
+        
+        # Si pas dans l'index inverse, vérifie normalement
+        noeud = self._chercher_noeud(racine)
+        if not noeud:
+            self._afficher(f"❌ Racine '{racine}' non trouvée")
+            return False, None
+        
+        # Les schèmes ne sont pas vocalisés : on compare (et on enregistre)
+        # la forme sans diacritiques
+        forme = retirer_diacritiques(mot)
+        
+        # Si le mot est déjà dans les dérivés validés
+        arbre = self.arbre_racines
+        if arbre.possede_derive(noeud, mot) or arbre.possede_derive(noeud, forme):
+            scheme = self._scheme_connu(noeud, mot)
+            self._afficher(f"✅ Mot '{mot}' déjà validé pour la racine '{racine}' (schème: {scheme})")
+            return True, scheme
+        
+        if len(racine) < 3:
+            return False, None
+        
+        # Le transducteur lit la forme une fois (coût linéaire en sa longueur)
+        # au lieu d'appliquer chaque schème à la racine
+        scheme_trouve = self.transducteur().scheme_pour(forme, racine)
+        
+        if metriques.actif:
+            metriques.incrementer("analyses_transducteur")
+            metriques.incrementer("validations_reussies" if scheme_trouve else "validations_echouees")
+        
+        if scheme_trouve:
+            # Ajouter aux dérivés validés et à l'index inverse : une seule
+            # entrée par case (racine, schème), vocalisée ou non
+            self.arbre_racines.enregistrer_derive(noeud, forme, scheme_trouve)
+            
+            self._afficher(f"✅ Mot '{mot}' validé! Schème: {scheme_trouve}")
+            return True, scheme_trouve
+        else:
+            self._afficher(f"❌ Mot '{mot}' ne correspond à aucun schème pour la racine '{racine}'")
+            return False, None
+    
+    def transducteur(self):
+        """
+        Transducteur des schèmes et des racines (voir transducteur.py),
+        compilé au premier appel ; l'automate est recompilé quand la version
+        de la table change, les racines suivent l'arbre au fil des ajouts.
+        """
+        transducteur = self._transducteur
+        if transducteur is None:
+            from .transducteur import compiler
+            transducteur = self._transducteur = compiler(self.table_schemes, self.arbre_racines)
+        elif transducteur.version_schemes != self.table_schemes.version:
+            transducteur.compiler_schemes(self.table_schemes)
+        return transducteur
+    
+    def analyser_mot(self, mot):
+        """Toutes les analyses (racine, schème) d'un mot, enregistré ou non,
+        parmi les racines connues : [(racine, clé du schème)]"""
+        analyses = self.transducteur().analyser(mot)
+        if analyses:
+            for racine, cle in analyses:
+                self._afficher(f"✅ '{mot}' = racine {racine} + schème {cle}")
+        else:
+            self._afficher(f"❌ Aucune analyse pour '{mot}'")
+        return analyses
+    
+    def fixer_priorites(self, racines=None, schemes=None):
+        """Fréquences a priori {racine: n} et {clé du schème: n} (None = inchangées)"""
+        if racines is not None:
+            self.priorites_racines = dict(racines)
+        if schemes is not None:
+            self.priorites_schemes = dict(schemes)
+    
+    def charger_priorites(self, nom_fichier):
+        """
+        Lit des fréquences a priori, une par ligne : R TAB racine TAB n ou
+        S TAB schème TAB n (lignes vides et commentaires # ignorés)
+        """
+        racines, schemes = {}, {}
+        with open(nom_fichier, "r", encoding="utf-8") as f:
+            for numero, ligne in enumerate(f, 1):
+                ligne = ligne.strip()
+                if not ligne or ligne.startswith("#"):
+                    continue
+                champs = ligne.split("\t")
+                if len(champs) != 3 or champs[0] not in ("R", "S"):
+                    raise ValueError(f"{nom_fichier}:{numero}: attendu 'R|S<TAB>clé<TAB>fréquence'")
+                (racines if champs[0] == "R" else schemes)[champs[1]] = float(champs[2])
+        self.fixer_priorites(racines, schemes or None)
+        self._afficher(f"✅ Priorités chargées: {len(racines)} racine(s), {len(schemes)} schème(s)")
+    
+    def analyses_classees(self, mot, k=None):
+        """
+        Analyses (racine, schème, score) d'un mot, de la plus probable à la
+        moins probable ; `k` limite le nombre d'analyses rendues. Toutes les
+        racines qui produisent le mot sont gardées (analyses_du_mot), à
+        défaut celles du transducteur. Score : (fréquence de la racine + 1)
+        × (fréquence du schème + 1), ramené à une somme de 1 pour le mot.
+        """
+        if self.table_schemes.version != self.arbre_racines.epoque_schemes:
+            self.synchroniser_derives()
+        analyses = self.arbre_racines.analyses_du_mot(mot) or self.transducteur().analyser(mot)
+        if len(analyses) <= 1:
+            classees = [(racine, scheme, 1.0) for racine, scheme in analyses]
+        else:
+            racines = self.priorites_racines
+            schemes = self.priorites_schemes
+            if schemes is None:
+                schemes = self.arbre_racines.usage_schemes
+            poids = [(racines.get(racine, 0) + 1) * (schemes.get(scheme, 0) + 1)
+                     for racine, scheme in analyses]
+            total = sum(poids)
+            classees = [(racine, scheme, p / total) for (racine, scheme), p in zip(analyses, poids)]
+            if k is None:
+                classees.sort(key=lambda analyse: analyse[2], reverse=True)
+            else:
+                classees = heapq.nlargest(k, classees, key=lambda analyse: analyse[2])
+        
+        for racine, scheme, score in classees:
+            self._afficher(f"✅ '{mot}' = racine {racine} + schème {scheme} ({score:.0%})")
+        if not classees:
+            self._afficher(f"❌ Aucune analyse pour '{mot}'")
+        return classees
+    
+    def analyseur_affixes(self):
+        """Découpeur d'affixes (voir affixes.py), créé au premier appel"""
+        if self._affixes is None:
+            from .affixes import AnalyseurAffixes
+            self._affixes = AnalyseurAffixes()
+        return self._affixes
+    
+    def analyser_avec_affixes(self, mot):
+        """
+        Racine d'un mot de texte qui porte des proclitiques ou des suffixes
+        (والكاتب، بمكتوبها). Les découpages sont essayés du plus court au plus
+        long, d'abord dans l'index inverse, puis par le transducteur s'il n'y
+        a aucun dérivé connu. Retourne (racine, schème, préfixe, tige,
+        suffixe), ou None si aucune tige n'a de racine connue.
+        """
+        if self.table_schemes.version != self.arbre_racines.epoque_schemes:
+            self.synchroniser_derives()
+        arbre = self.arbre_racines
+        candidats = self.analyseur_affixes().decouper(mot)
+        if self.metriques.actif:
+            self.metriques.observer("candidats_affixes", len(candidats))
+        
+        resultat = None
+        for prefixe, tige, suffixe in candidats:
+            racine = arbre.trouver_racine_du_mot(tige)
+            if racine:
+                scheme = (arbre.scheme_du_derive(arbre.chercher(racine), tige)
+                          or self.transducteur().scheme_pour(tige, racine))
+                resultat = (racine, scheme, prefixe, tige, suffixe)
+                break
+        else:
+            transducteur = self.transducteur()
+            for prefixe, tige, suffixe in candidats:
+                analyses = transducteur.analyser(tige)
+                if analyses:
+                    racine, scheme = analyses[0]
+                    resultat = (racine, scheme, prefixe, tige, suffixe)
+                    break
+        
+        if resultat:
+            racine, scheme, prefixe, tige, suffixe = resultat
+            self._afficher(f"✅ '{mot}' = {prefixe or '-'} + {tige} + {suffixe or '-'} "
+                           f"→ racine {racine}, schème {scheme}")
+        else:
+            self._afficher(f"❌ Aucune tige connue dans '{mot}'")
+        return resultat
+    
+    def _analyse_enregistree(self, noeud, mot):
+        """Vrai si le mot (ou sa forme nue) est un dérivé enregistré du nœud,
+        ou si l'une de ses analyses désigne la racine du nœud"""
+        arbre = self.arbre_racines
+        return (arbre.possede_derive(noeud, mot)
+                or arbre.possede_derive(noeud, retirer_diacritiques(mot))
+                or any(r == noeud.racine for r, _ in arbre.analyses_du_mot(mot)))
+    
+    def _scheme_connu(self, noeud, mot):
+        """Schème enregistré pour un dérivé déjà connu, sous sa forme nue ou
+        vocalisée ; "déjà connu" si le dérivé a été ajouté sans schème"""
+        if not noeud:
+            return "déjà connu"
+        arbre = self.arbre_racines
+        scheme = arbre.scheme_du_derive(noeud, mot)
+        if scheme is None:
+            scheme = arbre.scheme_du_derive(noeud, retirer_diacritiques(mot))
+        if scheme is None:
+            # Forme vocalisée enregistrée telle quelle (import, ajout direct)
+            scheme = next((s for r, s in arbre.analyses_du_mot(mot) if r == noeud.racine and s),
+                          None)
+        return scheme or "déjà connu"
+    
+    def mots_du_scheme(self, scheme_cle):
+        """Tous les mots du lexique produits par un schème : [(mot, racine)]
+        (index des schèmes de l'arbre, sans parcours ni régénération)"""
+        self.synchroniser_derives()
+        arbre = self.arbre_racines
+        return [(mot, arbre.trouver_racine_du_mot(mot)) for mot in arbre.mots_du_scheme(scheme_cle)]
+    
+    def paradigme(self, racine):
+        """
+        Paradigme complet d'une racine : ((clé du schème, mot), ...) pour tous
+        les schèmes de la table. Calculé au premier accès puis gardé en cache ;
+        le cache est oublié dès que la version de la table change (schème
+        ajouté ou modifié). None si la racine est inconnue.
+        """
+        if not self.arbre_racines.chercher(racine):
+            return None
+        
+        version = self.table_schemes.version
+        if version != self._version_paradigmes:
+            self._paradigmes = {}
+            self._version_paradigmes = version
+        
+        paradigme = self._paradigmes.get(racine)
+        if paradigme is None:
+            if self.metriques.actif:
+                self.metriques.incrementer("paradigmes_calcules")
+            if len(self._paradigmes) >= self.TAILLE_CACHE_PARADIGMES:
+                del self._paradigmes[next(iter(self._paradigmes))]
+            paradigme = self._paradigmes[racine] = self._calculer_paradigme(racine)
+        return paradigme
+    
+    def _calculer_paradigme(self, racine):
+        """Applique chaque schème à la racine (même calcul que generer_mot)"""
+        if len(racine) < 3:
+            return ()
+        paradigme = []
+        vus = set()
+        for entree in self.table_schemes.iterer():
+            # Une clé redéfinie : seule l'entrée trouvée par rechercher() compte
+            if entree.cle in vus:
+                continue
+            vus.add(entree.cle)
+            mot = entree.pattern.replace('C1', racine[0])\
+                                .replace('C2', racine[1])\
+                                .replace('C3', racine[2])
+            paradigme.append((entree.cle, mot))
+        return tuple(paradigme)
+    
+    def familles(self):
+        """Cache des familles par racine (voir familles.py), créé au premier appel"""
+        if self._familles is None:
+            from .familles import CacheFamilles
+            self._familles = CacheFamilles(self)
+            self._familles.attacher(self.arbre_racines)
+        return self._familles
+    
+    def etendre(self, mot):
+        """
+        Expansion d'un mot de requête : (racine, famille), où famille est le
+        frozenset de toutes les formes de la racine (paradigme complet et
+        dérivés enregistrés, le mot compris). La racine vient de l'index
+        inverse, à défaut du transducteur ; la famille est gardée en cache,
+        rien n'est régénéré d'une requête à l'autre. (None, frozenset())
+        si aucune racine connue ne produit le mot.
+        """
+        if self.table_schemes.version != self.arbre_racines.epoque_schemes:
+            self.synchroniser_derives()
+        racine = self.arbre_racines.trouver_racine_du_mot(mot)
+        if racine is None:
+            analyses = self.transducteur().analyser(mot)
+            if not analyses:
+                return None, frozenset()
+            racine = analyses[0][0]
+        famille = self.familles().famille(racine)
+        if famille is None:
+            return None, frozenset()
+        self._afficher(f"✅ '{mot}' → racine {racine} : {len(famille)} forme(s)")
+        return racine, famille
+    
+    def afficher_famille(self, racine):
+        """Affiche le paradigme d'une racine (✔ = dérivé déjà enregistré)
+        puis les autres dérivés enregistrés (formes validées)"""
+        self.synchroniser_derives()
+        noeud = self.arbre_racines.chercher(racine)
+        if not noeud:
+            self._afficher(f"❌ Racine '{racine}' non trouvée")
+            return
+        
+        self._afficher(f"\n=== FAMILLE MORPHOLOGIQUE DE '{racine}' ===")
+        paradigme = self.paradigme(racine)
+        connus = set(noeud.derivees)
+        for i, (cle, mot) in enumerate(paradigme, 1):
+            marque = "✔" if mot in connus else " "
+            self._afficher(f"{i}. {marque} {mot}  ({cle})")
+        
+        formes = {mot for _, mot in paradigme}
+        autres = [mot for mot in noeud.derivees if mot not in formes]
+        if autres:
+            self._afficher("Autres dérivés enregistrés :")
+            for mot in autres:
+                self._afficher(f"   - {mot}")
+        
+        self._afficher(f"\nTotal: {len(formes) + len(autres)} mot(s), "
+                       f"{len(noeud.derivees)} enregistré(s)")
+    
+    def generer_tous_dérivés(self, racine):
+        """Enregistre tous les dérivés d'une racine (paradigme en cache)"""
+        self.synchroniser_derives()
+        noeud = self.arbre_racines.chercher(racine)
+        if not noeud:
+            self._afficher(f"❌ Racine '{racine}' non trouvée")
+            return []
+        
+        self._afficher(f"\n=== GÉNÉRATION DE TOUS LES DÉRIVÉS POUR '{racine}' ===")
+        mots_generes = []
+        
+        for cle, mot in self.paradigme(racine):
+            self.arbre_racines.enregistrer_derive(noeud, mot, cle)
+            if mot not in mots_generes:
+                mots_generes.append(mot)
+                self._afficher(f"✅ {cle}: {mot}")
+        
+        self._afficher(f"\n✅ {len(mots_generes)} dérivé(s) généré(s)")
+        return mots_generes
+    
+    def trouver_racine_d_un_mot(self, mot):
+        """Trouve la racine d'un mot donné"""
+        if self.table_schemes.version != self.arbre_racines.epoque_schemes:
+            self.synchroniser_derives()
+        racine = self.arbre_racines.trouver_racine_du_mot(mot)
+        if self.metriques.actif:
+            self.metriques.incrementer("index_inverse_succes" if racine else "index_inverse_echecs")
+        if racine:
+            self._afficher(f"✅ Le mot '{mot}' vient de la racine: {racine}")
+            return racine
+        else:
+            self._afficher(f"❌ Mot '{mot}' non trouvé dans la base")
+            return None
+    
+    def statistiques(self):
+        """
+        Instantané des statistiques, sans parcours de l'arbre : compteurs
+        tenus à jour par l'arbre (racines, dérivés, usage des schèmes), tailles
+        des index et, si elles sont actives, métriques d'exécution.
+        """
+        arbre = self.arbre_racines
+        return {
+            "racines": arbre.nb_racines(),
+            "derives": arbre.nb_derives,
+            "usage_schemes": dict(arbre.usage_schemes),
+            "mots_indexes": len(arbre.index_inverse),
+            "formes_vocalisees": len(arbre.index_normalise),
+            "metriques": self.metriques.instantane(),
+        }
+    
+    def texte_prometheus(self):
+        """Métriques et tailles des structures au format texte de Prometheus"""
+        arbre = self.arbre_racines
+        return self.metriques.texte_prometheus({
+            "racines": arbre.nb_racines(),
+            "derives": arbre.nb_derives,
+            "mots_indexes": len(arbre.index_inverse),
+        })
+    
+    def recherche_floue(self):
+        """Retourne l'index de recherche approchée (construit au premier appel)"""
+        if self._recherche_floue is None:
+            from .recherche_floue import RechercheFloue
+            self._recherche_floue = RechercheFloue(self.arbre_racines)
+        return self._recherche_floue
+    
+    def rechercher_floue(self, mot, distance_max=2):
+        """
+        Trouve les mots connus proches de `mot` (faute de frappe, hamza,
+        ta marbuta...). Retourne [(mot connu, racine, distance)].
+        """
+        resultats = self.recherche_floue().chercher_mots(mot, distance_max)
+        if resultats:
+            meilleur, racine, distance = resultats[0]
+            self._afficher(f"🔎 '{mot}' ≈ '{meilleur}' (distance {distance}) → racine: {racine}")
+        else:
+            self._afficher(f"❌ Aucun mot proche de '{mot}'")
+        return resultats
+    
+    def rechercher_racines_floue(self, racine, distance_max=2):
+        """Trouve les racines proches de `racine`. Retourne [(racine, distance)]"""
+        return self.recherche_floue().chercher_racines(racine, distance_max)
\ No newline at end of file
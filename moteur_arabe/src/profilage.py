@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Profilage du moteur, à la demande et à chaud.
+
+Deux modes :
+
+    echantillons   toutes les `intervalle` secondes de temps processeur
+                   (SIGPROF), la pile d'appels en cours est relevée ; les
+                   piles sont comptées et écrites au format replié
+                   (« a;b;c 42 », une pile par ligne) que lisent
+                   flamegraph.pl, speedscope ou inferno. Surcoût faible et
+                   constant, utilisable sous charge.
+                   Sans SIGPROF (Windows) ou hors du fil principal, un fil
+                   relève les piles des autres fils : il n'obtient le GIL
+                   qu'aux entrées-sorties des fils observés, les piles sont
+                   alors biaisées vers ces appels.
+    cprofile       cProfile : temps exact par fonction et par appelant,
+                   écrit au format pstats (python -m pstats, snakeviz).
+
+Les cadres sont nommés module:Classe.methode (arbre_abr:ArbreAVL.inserer,
+table_hachage:TableHachage.rechercher, moteur:MoteurMorphologique.generer_mot).
+Avec moteur_seul, seules les piles qui passent par le paquet src sont
+gardées, à partir du premier cadre du moteur : le temps de l'appelant
+(mode lot, benchmark) disparaît du graphe.
+
+Le profileur se met en marche et s'arrête à chaud (demarrer, arreter,
+basculer) ; le mode lot le bascule sur SIGUSR1 (voir lot.py). Pour profiler
+un programme existant sans le modifier :
+
+    python -m src.profilage --sortie piles.txt -m benchmarks.scenarios --echelles 10000
+    python -m src.profilage --mode cprofile --sortie lot.prof -m src.lot analyze mots.txt
+"""
+import argparse
+import cProfile
+import os
+import runpy
+import signal
+import sys
+import threading
+
+MODES = ("echantillons", "cprofile")
+INTERVALLE = 0.005      # secondes entre deux relevés (mode echantillons)
+
+_DOSSIER_MOTEUR = os.path.dirname(os.path.abspath(__file__))
+_CE_FICHIER = os.path.abspath(__file__)
+
+
+def _ignorer(numero, cadre):
+    """Gestionnaire de SIGPROF laissé après l'arrêt"""
+
+
+class Profileur:
+    """Profileur par échantillonnage des piles ou par cProfile, basculable à chaud"""
+
+    def __init__(self, mode="echantillons", intervalle=INTERVALLE, moteur_seul=False):
+        if mode not in MODES:
+            raise ValueError(f"Mode de profilage inconnu : '{mode}' ({', '.join(MODES)})")
+        self.mode = mode
+        self.intervalle = intervalle
+        self.moteur_seul = moteur_seul
+        self.actif = False
+        self.piles = {}           # pile repliée → nombre d'échantillons
+        self.nb_echantillons = 0
+        self.hors_moteur = 0      # échantillons écartés (moteur_seul)
+        self._noms = {}           # code → (nom du cadre, cadre du moteur ?)
+        self._profil = None       # cProfile.Profile (mode cprofile)
+        self._fil = None
+        self._arret = None
+        self._gestionnaire = None   # gestionnaire de SIGPROF remplacé
+
+    # ============ MARCHE / ARRÊT ============
+
+    def demarrer(self):
+        """Met le profileur en marche (sans effet s'il l'est déjà)"""
+        if self.actif:
+            return
+        self.actif = True
+        if self.mode == "cprofile":
+            if self._profil is None:
+                self._profil = cProfile.Profile()
+            self._profil.enable()
+        elif hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread():
+            self._gestionnaire = signal.signal(signal.SIGPROF, self._sur_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.intervalle, self.intervalle)
+        else:
+            self._arret = threading.Event()
+            self._fil = threading.Thread(target=self._echantillonner, name="profilage",
+                                         daemon=True)
+            self._fil.start()
+
+    def arreter(self):
+        """Arrête le profileur ; les mesures sont gardées (reprise possible)"""
+        if not self.actif:
+            return
+        self.actif = False
+        if self.mode == "cprofile":
+            self._profil.disable()
+        elif self._fil is None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            # Un SIGPROF encore en attente ne doit pas tomber sur SIG_DFL (fin du processus)
+            gestionnaire = self._gestionnaire
+            signal.signal(signal.SIGPROF, gestionnaire if callable(gestionnaire) else _ignorer)
+        else:
+            self._arret.set()
+            self._fil.join()
+            self._fil = None
+
+    def basculer(self, *_):
+        """Arrête le profileur s'il tourne, le met en marche sinon (gestionnaire de signal)"""
+        if self.actif:
+            self.arreter()
+        else:
+            self.demarrer()
+
+    def __enter__(self):
+        self.demarrer()
+        return self
+
+    def __exit__(self, *exc):
+        self.arreter()
+
+    # ============ ÉCHANTILLONNAGE ============
+
+    def _sur_signal(self, numero, cadre):
+        self._noter(cadre)
+
+    def _echantillonner(self):
+        propre = threading.get_ident()
+        while not self._arret.wait(self.intervalle):
+            for fil, cadre in sys._current_frames().items():
+                if fil != propre:
+                    self._noter(cadre)
+
+    def _nom(self, code):
+        """(module:Classe.methode, True si le code appartient au paquet du moteur,
+        profileur excepté)"""
+        nom = self._noms.get(code)
+        if nom is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            qualifie = getattr(code, "co_qualname", code.co_name)
+            fichier = os.path.abspath(code.co_filename)
+            nom = self._noms[code] = (f"{module}:{qualifie}",
+                                      fichier.startswith(_DOSSIER_MOTEUR) and fichier != _CE_FICHIER)
+        return nom
+
+    def _noter(self, cadre):
+        noms = []
+        premier_moteur = -1
+        while cadre is not None:
+            nom, du_moteur = self._nom(cadre.f_code)
+            noms.append(nom)
+            if du_moteur:
+                premier_moteur = len(noms)
+            cadre = cadre.f_back
+        self.nb_echantillons += 1
+        if self.moteur_seul:
+            if premier_moteur < 0:
+                self.hors_moteur += 1
+                return
+            del noms[premier_moteur:]     # appelants du premier cadre du moteur
+        pile = ";".join(reversed(noms))
+        self.piles[pile] = self.piles.get(pile, 0) + 1
+
+    # ============ RÉSULTATS ============
+
+    def piles_repliees(self):
+        """Lignes « cadre;cadre;... nombre », de la pile la plus fréquente à la moins fréquente"""
+        return [f"{pile} {nombre}" for pile, nombre in
+                sorted(self.piles.items(), key=lambda paire: (-paire[1], paire[0]))]
+
+    def ecrire(self, chemin):
+        """Écrit les piles repliées (echantillons) ou les statistiques pstats (cprofile)"""
+        if self.mode == "cprofile":
+            if self._profil is not None:
+                self._profil.dump_stats(chemin)
+            return
+        with open(chemin, "w", encoding="utf-8") as f:
+            for ligne in self.piles_repliees():
+                f.write(ligne + "\n")
+
+    def resume(self):
+        """Une ligne pour stderr"""
+        if self.mode == "cprofile":
+            return "🔬 Profil cProfile (pstats)"
+        texte = f"🔬 {self.nb_echantillons:,} échantillon(s), {len(self.piles):,} pile(s) distincte(s)"
+        if self.moteur_seul:
+            texte += f", {self.hors_moteur:,} hors du moteur"
+        return texte
+
+
+def installer_signal(profileur):
+    """Bascule le profileur sur SIGUSR1 (kill -USR1 <pid>) ; False si le système ne l'a pas"""
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    signal.signal(signal.SIGUSR1, profileur.basculer)
+    return True
+
+
+def principal(argv=None):
+    """Exécute un module (-m) ou un script sous le profileur, comme python -m cProfile"""
+    parseur = argparse.ArgumentParser(
+        prog="python -m src.profilage",
+        description="Profile un programme sans le modifier (piles repliées ou pstats)")
+    parseur.add_argument("--mode", choices=MODES, default="echantillons")
+    parseur.add_argument("--sortie", required=True,
+                         help="fichier des piles repliées (echantillons) ou pstats (cprofile)")
+    parseur.add_argument("--intervalle", type=float, default=INTERVALLE,
+                         help=f"secondes entre deux relevés (défaut: {INTERVALLE})")
+    parseur.add_argument("--moteur-seul", action="store_true",
+                         help="ne garde que les piles qui passent par le moteur")
+    parseur.add_argument("--attente", action="store_true",
+                         help="démarre à l'arrêt : SIGUSR1 met en marche et arrête")
+    parseur.add_argument("-m", dest="module", help="module à exécuter (comme python -m), "
+                         "suivi de ses arguments")
+    parseur.add_argument("arguments", nargs=argparse.REMAINDER,
+                         help="script (sans -m) puis ses arguments")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Ce qui suit « -m module » appartient au module, options comprises
+    reste = []
+    if "-m" in argv:
+        i = argv.index("-m")
+        argv, reste = argv[:i + 2], argv[i + 2:]
+    args = parseur.parse_args(argv)
+    if args.module:
+        args.arguments = reste
+    elif not args.arguments:
+        parseur.error("un module (-m) ou un script est nécessaire")
+
+    profileur = Profileur(args.mode, args.intervalle, args.moteur_seul)
+    installer_signal(profileur)
+    cible = args.module or args.arguments[0]
+    sys.argv = [cible] + (args.arguments if args.module else args.arguments[1:])
+    code = 0
+    if not args.attente:
+        profileur.demarrer()
+    try:
+        if args.module:
+            runpy.run_module(args.module, run_name="__main__", alter_sys=True)
+        else:
+            runpy.run_path(cible, run_name="__main__")
+    except SystemExit as e:
+        code = e.code
+    finally:
+        profileur.arreter()
+        profileur.ecrire(args.sortie)
+        print(f"{profileur.resume()} → '{args.sortie}'", file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
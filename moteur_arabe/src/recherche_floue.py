@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Recherche approchée (fautes de frappe, variantes orthographiques).
+
+Index par suppressions (principe de SymSpell) : chaque forme connue est
+enregistrée sous toutes ses variantes obtenues en supprimant jusqu'à
+`distance_max` lettres. Une requête génère ses propres variantes, et toute
+forme à distance d'édition <= distance_max partage au moins une variante
+avec elle. On ne calcule donc la distance que sur une poignée de candidats,
+quelle que soit la taille du lexique.
+
+Les formes sont normalisées (utils.normaliser) à l'indexation et à la
+requête : diacritiques ignorés, أ/إ/ا, ة/ه et ى/ي sont à distance 0.
+"""
+from .utils import normaliser
+
+
+def suppressions_par_niveau(mot, distance_max):
+    """Liste [niveau 0, niveau 1, ...] des variantes de `mot` avec exactement
+    0, 1, ..., distance_max lettres supprimées"""
+    niveaux = [{mot}]
+    for _ in range(distance_max):
+        suivant = set()
+        for v in niveaux[-1]:
+            for i in range(len(v)):
+                suivant.add(v[:i] + v[i + 1:])
+        niveaux.append(suivant)
+    return niveaux
+
+
+def _une_seule_difference(a, b):
+    """Pour deux mots de même longueur : une substitution ou une inversion de voisines ?"""
+    ecarts = [i for i in range(len(a)) if a[i] != b[i]]
+    if len(ecarts) == 1:
+        return True
+    return (len(ecarts) == 2 and ecarts[1] == ecarts[0] + 1
+            and a[ecarts[0]] == b[ecarts[1]] and a[ecarts[1]] == b[ecarts[0]])
+
+
+def distance_edition(a, b, distance_max):
+    """
+    Distance de Damerau-Levenshtein restreinte (insertion, suppression,
+    substitution, transposition de deux lettres voisines).
+    S'arrête dès que distance_max est dépassée (retourne distance_max + 1).
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > distance_max:
+        return distance_max + 1
+
+    # Préfixe et suffixe communs ne changent pas la distance : on les retire
+    debut = 0
+    fin_a, fin_b = len(a), len(b)
+    while debut < fin_a and debut < fin_b and a[debut] == b[debut]:
+        debut += 1
+    while fin_a > debut and fin_b > debut and a[fin_a - 1] == b[fin_b - 1]:
+        fin_a -= 1
+        fin_b -= 1
+    a, b = a[debut:fin_a], b[debut:fin_b]
+    if not a or not b:
+        return min(max(len(a), len(b)), distance_max + 1)
+
+    avant_precedente = None
+    precedente = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        courante = [i] + [0] * len(b)
+        minimum_ligne = i
+        for j in range(1, len(b) + 1):
+            cout = 0 if a[i - 1] == b[j - 1] else 1
+            valeur = min(precedente[j] + 1,          # suppression
+                         courante[j - 1] + 1,        # insertion
+                         precedente[j - 1] + cout)   # substitution
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == b[j - 1]):
+                valeur = min(valeur, avant_precedente[j - 2] + 1)  # transposition
+            courante[j] = valeur
+            if valeur < minimum_ligne:
+                minimum_ligne = valeur
+        if minimum_ligne > distance_max:
+            return distance_max + 1
+        avant_precedente, precedente = precedente, courante
+
+    return min(precedente[len(b)], distance_max + 1)
+
+
+class IndexFlou:
+    """Index par suppressions pour les recherches à distance d'édition bornée"""
+
+    def __init__(self, distance_max=2):
+        self.distance_max = distance_max
+        self.formes = {}          # forme normalisée → ensemble des mots d'origine
+        # suppressions[n] : variante à n lettres supprimées → formes normalisées
+        self.suppressions = [None] + [{} for _ in range(distance_max)]
+
+    def __len__(self):
+        return len(self.formes)
+
+    def nb_variantes(self):
+        """Nombre total de variantes indexées (taille mémoire de l'index)"""
+        return sum(len(niveau) for niveau in self.suppressions[1:])
+
+    def ajouter(self, mot):
+        """Indexe un mot (ses variantes ne sont calculées qu'une fois par forme)"""
+        forme = normaliser(mot)
+        originaux = self.formes.get(forme)
+        if originaux is not None:
+            originaux.add(mot)
+            return
+
+        self.formes[forme] = {mot}
+        niveaux = suppressions_par_niveau(forme, self.distance_max)
+        for n in range(1, self.distance_max + 1):
+            index = self.suppressions[n]
+            for variante in niveaux[n]:
+                liste = index.get(variante)
+                if liste is None:
+                    index[variante] = [forme]
+                else:
+                    liste.append(forme)
+
+    def _distance(self, requete, forme, nq, ni):
+        """Distance exacte d'une forme trouvée via une variante commune
+        (nq suppressions côté requête, ni côté forme)"""
+        if nq + ni <= 1 or nq == 0 or ni == 0:
+            # Pure insertion(s) ou suppression(s) : la distance est l'écart de longueur
+            return nq + ni
+        if nq == 1 and ni == 1:
+            return 1 if _une_seule_difference(requete, forme) else 2
+        return distance_edition(requete, forme, self.distance_max)
+
+    def rechercher(self, requete, distance_max=None, toutes=False):
+        """
+        Retourne [(mot, distance)] triés par distance puis ordre alphabétique.
+
+        Par défaut seules les formes les plus proches sont retournées : la
+        recherche s'arrête au premier niveau de distance qui donne un résultat,
+        ce qui évite d'explorer les variantes à 2 fautes quand une forme à
+        1 faute existe. `toutes=True` retourne tout jusqu'à distance_max.
+        """
+        if distance_max is None or distance_max > self.distance_max:
+            distance_max = self.distance_max
+
+        forme_requete = normaliser(requete)
+        niveaux_requete = suppressions_par_niveau(forme_requete, distance_max)
+        distances = {}
+
+        if forme_requete in self.formes:
+            distances[forme_requete] = 0
+
+        for palier in range(1, distance_max + 1):
+            if distances and not toutes and min(distances.values()) < palier:
+                break
+            # Couples (suppressions requête, suppressions forme) de ce palier
+            for nq in range(palier + 1):
+                for ni in range(palier + 1):
+                    if max(nq, ni) != palier:
+                        continue
+                    for variante in niveaux_requete[nq]:
+                        if ni == 0:
+                            formes = (variante,) if variante in self.formes else ()
+                        else:
+                            formes = self.suppressions[ni].get(variante, ())
+                        for forme in formes:
+                            if forme not in distances:
+                                distances[forme] = self._distance(forme_requete, forme, nq, ni)
+
+        resultats = [(mot, distance)
+                     for forme, distance in distances.items() if distance <= distance_max
+                     for mot in self.formes[forme]]
+        if resultats and not toutes:
+            meilleure = min(distance for _, distance in resultats)
+            resultats = [r for r in resultats if r[1] == meilleure]
+
+        resultats.sort(key=lambda r: (r[1], r[0]))
+        return resultats
+
+
+class RechercheFloue:
+    """
+    Recherche approchée sur les racines de l'arbre et les mots de l'index
+    inverse. S'abonne aux ajouts de l'arbre (observateur) pour rester à jour ;
+    les éléments supprimés depuis sont filtrés au moment de la requête.
+    """
+
+    def __init__(self, arbre, distance_max=2):
+        self.arbre = arbre
+        self.racines = IndexFlou(distance_max)
+        self.mots = IndexFlou(distance_max)
+
+        for noeud in arbre.iterer_infixe():
+            self.racines.ajouter(noeud.racine)
+        for mot in arbre.index_inverse:
+            self.mots.ajouter(mot)
+
+        arbre.observateurs.append(self)
+
+    # ============ ÉVÉNEMENTS DE L'ARBRE ============
+
+    def racine_ajoutee(self, racine):
+        self.racines.ajouter(racine)
+
+    def derive_ajoute(self, racine, mot, scheme=None):
+        self.mots.ajouter(mot)
+
+    # ============ REQUÊTES ============
+
+    def chercher_racines(self, requete, distance_max=None, toutes=False):
+        """Retourne [(racine, distance)] pour les racines encore présentes"""
+        return [(racine, distance)
+                for racine, distance in self.racines.rechercher(requete, distance_max, toutes)
+                if self.arbre.chercher(racine)]
+
+    def chercher_mots(self, requete, distance_max=None, toutes=False):
+        """Retourne [(mot connu, racine, distance)] pour les mots encore indexés"""
+        resultats = []
+        for mot, distance in self.mots.rechercher(requete, distance_max, toutes):
+            racine = self.arbre.trouver_racine_du_mot(mot)
+            if racine:
+                resultats.append((mot, racine, distance))
+        return resultats
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Stockages du lexique : où vivent les racines, les dérivés et les schèmes.
+
+Un stockage fournit deux objets, `arbre` (racines, dérivés, index inverse)
+et `table` (schèmes), que MoteurMorphologique.initialiser() utilise à la
+place d'un ArbreAVL et d'une TableHachage. Ce que le moteur attend d'eux :
+
+    arbre : chercher, ajouter_racine, inserer_lot, supprimer_racine, supprimer_lot,
+            enregistrer_derive, retirer_derive, possede_derive, scheme_du_derive,
+            derives_avec_schemes, derives_hors_index, mots_du_scheme, derives_du_scheme,
+            trouver_racine_du_mot, analyses_du_mot, iterer_infixe,
+            iterer_prefixe, page, nb_racines, nb_derives, usage_schemes, index_inverse,
+            index_normalise, observateurs, version, epoque_schemes,
+            charger_depuis_fichier, vider
+            (les nœuds exposent racine et derivees)
+    table : inserer, rechercher, rechercher_sondage, iterer, version,
+            cles_modifiees_depuis, charger_depuis_fichier,
+            charger_schemes_par_defaut, afficher_tous
+
+Deux implémentations :
+    StockageMemoire   ArbreAVL + TableHachage (par défaut)
+    StockageSQLite    base SQLite en mode WAL (voir stockage_sqlite.py) :
+                      lexiques plus grands que la mémoire, base partagée
+                      par plusieurs processus d'une même machine
+
+Les deux offrent transaction() (`with stockage.transaction():` regroupe des
+écritures, validées ensemble à la sortie), valider() et fermer().
+"""
+from contextlib import contextmanager
+
+from .arbre_abr import ArbreAVL
+from .table_hachage import TableHachage
+
+
+class StockageMemoire:
+    """Stockage en mémoire : les structures d'origine, rien n'est écrit sur disque"""
+
+    def __init__(self, verbeux=True):
+        self.arbre = ArbreAVL(verbeux=verbeux)
+        self.table = TableHachage(verbeux=verbeux)
+
+    @contextmanager
+    def transaction(self):
+        """Rien à regrouper : les modifications sont immédiates"""
+        yield
+
+    def valider(self):
+        """Rien à écrire : les modifications sont immédiates"""
+
+    def fermer(self):
+        """Rien à libérer"""
+
+
+def ouvrir_stockage(adresse="memoire", verbeux=True):
+    """
+    Ouvre un stockage d'après son adresse :
+        "memoire"                  → StockageMemoire
+        "sqlite:chemin/lexique.db" → StockageSQLite (créée si besoin)
+    """
+    if adresse == "memoire":
+        return StockageMemoire(verbeux=verbeux)
+    if adresse.startswith("sqlite:"):
+        from .stockage_sqlite import StockageSQLite
+        return StockageSQLite(adresse[len("sqlite:"):], verbeux=verbeux)
+    raise ValueError(f"Stockage inconnu: '{adresse}' (attendu: memoire ou sqlite:CHEMIN)")
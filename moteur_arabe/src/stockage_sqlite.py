@@ -0,0 +1,591 @@
+# -*- coding: utf-8 -*-
+"""
+Stockage SQLite du lexique (voir stockage.py pour l'interface).
+
+Tables indexées : racines, schemes, derives (mot, racine, schème, clé sans
+diacritiques) et index_inverse (mot → racine). Les compteurs (racines,
+dérivés, usage des schèmes, taille des index) sont tenus par des
+déclencheurs : les statistiques restent en O(1), même quand plusieurs
+processus écrivent dans la même base.
+
+La base est ouverte en mode WAL : les lecteurs des autres processus ne sont
+pas bloqués par l'écrivain. Les lectures se font hors transaction et voient
+toujours la dernière version validée. Chaque opération d'écriture est une
+transaction courte (BEGIN IMMEDIATE … COMMIT) validée avant de rendre la
+main : le verrou d'écriture n'est jamais gardé entre deux appels, et les
+autres processus voient la modification aussitôt. Pour regrouper beaucoup
+d'écritures, `with stockage.transaction():` n'en fait qu'une transaction.
+Les requêtes, toujours les mêmes textes SQL, sont préparées une fois par le
+cache de sqlite3 ; les chargements de fichiers passent par executemany.
+"""
+import sqlite3
+from contextlib import contextmanager
+
+from .table_hachage import EntreeScheme, TableHachage
+from .utils import retirer_diacritiques
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS racines (
+    id      INTEGER PRIMARY KEY,
+    racine  TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS schemes (
+    rang        INTEGER PRIMARY KEY,
+    cle         TEXT NOT NULL UNIQUE,
+    pattern     TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS derives (
+    rang      INTEGER PRIMARY KEY,
+    racine_id INTEGER NOT NULL,
+    mot       TEXT NOT NULL,
+    scheme    TEXT,
+    cle       TEXT NOT NULL,
+    UNIQUE (racine_id, mot)
+);
+CREATE INDEX IF NOT EXISTS derives_cle ON derives (cle);
+CREATE INDEX IF NOT EXISTS derives_scheme ON derives (scheme);
+CREATE TABLE IF NOT EXISTS index_inverse (
+    mot       TEXT PRIMARY KEY,
+    racine_id INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS index_inverse_racine ON index_inverse (racine_id);
+
+CREATE TABLE IF NOT EXISTS compteurs (
+    nom    TEXT PRIMARY KEY,
+    valeur INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO compteurs VALUES
+    ('racines', 0), ('derives', 0), ('mots_indexes', 0), ('formes_vocalisees', 0);
+CREATE TABLE IF NOT EXISTS usage_schemes (
+    scheme TEXT PRIMARY KEY,
+    nombre INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS racines_plus AFTER INSERT ON racines BEGIN
+    UPDATE compteurs SET valeur = valeur + 1 WHERE nom = 'racines';
+END;
+CREATE TRIGGER IF NOT EXISTS racines_moins AFTER DELETE ON racines BEGIN
+    UPDATE compteurs SET valeur = valeur - 1 WHERE nom = 'racines';
+END;
+CREATE TRIGGER IF NOT EXISTS derives_plus AFTER INSERT ON derives BEGIN
+    UPDATE compteurs SET valeur = valeur + 1 WHERE nom = 'derives';
+    UPDATE compteurs SET valeur = valeur + 1
+        WHERE nom = 'formes_vocalisees' AND NEW.cle != NEW.mot;
+    INSERT INTO usage_schemes SELECT NEW.scheme, 1 WHERE NEW.scheme IS NOT NULL
+        ON CONFLICT (scheme) DO UPDATE SET nombre = nombre + 1;
+END;
+DROP TRIGGER IF EXISTS derives_moins;
+CREATE TRIGGER derives_moins AFTER DELETE ON derives BEGIN
+    UPDATE compteurs SET valeur = valeur - 1 WHERE nom = 'derives';
+    UPDATE compteurs SET valeur = valeur - 1
+        WHERE nom = 'formes_vocalisees' AND OLD.cle != OLD.mot;
+    UPDATE usage_schemes SET nombre = nombre - 1 WHERE scheme = OLD.scheme;
+    DELETE FROM usage_schemes WHERE scheme = OLD.scheme AND nombre <= 0;
+    -- Un mot partagé passe à la plus ancienne de ses autres racines
+    INSERT INTO index_inverse (mot, racine_id)
+        SELECT OLD.mot, d.racine_id FROM derives d
+        WHERE d.cle = OLD.cle AND d.mot = OLD.mot
+          AND EXISTS (SELECT 1 FROM index_inverse
+                      WHERE mot = OLD.mot AND racine_id = OLD.racine_id)
+        ORDER BY d.rang LIMIT 1
+        ON CONFLICT (mot) DO UPDATE SET racine_id = excluded.racine_id;
+    DELETE FROM index_inverse WHERE mot = OLD.mot AND racine_id = OLD.racine_id;
+END;
+CREATE TRIGGER IF NOT EXISTS index_plus AFTER INSERT ON index_inverse BEGIN
+    UPDATE compteurs SET valeur = valeur + 1 WHERE nom = 'mots_indexes';
+END;
+CREATE TRIGGER IF NOT EXISTS index_moins AFTER DELETE ON index_inverse BEGIN
+    UPDATE compteurs SET valeur = valeur - 1 WHERE nom = 'mots_indexes';
+END;
+"""
+
+# Requêtes fréquentes (texte constant : préparées une seule fois)
+_RACINE_ID = "SELECT id FROM racines WHERE racine = ?"
+_AJOUTER_RACINE = "INSERT OR IGNORE INTO racines (racine) VALUES (?)"
+_AJOUTER_DERIVE = "INSERT OR IGNORE INTO derives (racine_id, mot, scheme, cle) VALUES (?, ?, ?, ?)"
+_INDEXER = ("INSERT INTO index_inverse (mot, racine_id) VALUES (?, ?) "
+            "ON CONFLICT (mot) DO UPDATE SET racine_id = excluded.racine_id")
+_RACINE_DU_MOT = ("SELECT r.racine FROM index_inverse i JOIN racines r ON r.id = i.racine_id "
+                  "WHERE i.mot = ?")
+_RACINE_DE_LA_CLE = ("SELECT r.racine FROM derives d "
+                     "JOIN index_inverse i ON i.mot = d.mot "
+                     "JOIN racines r ON r.id = i.racine_id "
+                     "WHERE d.cle = ? LIMIT 1")
+_ANALYSES = ("SELECT r.racine, d.scheme FROM derives d JOIN racines r ON r.id = d.racine_id "
+             "WHERE d.cle = ? AND d.mot = ? "
+             "ORDER BY d.racine_id != (SELECT racine_id FROM index_inverse WHERE mot = d.mot), "
+             "d.rang")
+_COMPTEUR = "SELECT valeur FROM compteurs WHERE nom = ?"
+
+# Caractère plus grand que toute lettre : borne supérieure d'un préfixe
+_FIN_PREFIXE = chr(0x10FFFF)
+
+
+class NoeudSQLite:
+    """Une racine de la base ; dérivés et schèmes lus à la demande"""
+
+    def __init__(self, arbre, identifiant, racine):
+        self.arbre = arbre
+        self.id = identifiant
+        self.racine = racine
+
+    @property
+    def derivees(self):
+        """Mots dérivés, dans l'ordre d'ajout"""
+        curseur = self.arbre.connexion.execute(
+            "SELECT mot FROM derives WHERE racine_id = ? ORDER BY rang", (self.id,))
+        return [mot for (mot,) in curseur]
+
+
+class _VueIndex:
+    """Vue en lecture d'une table d'index (len, in, get, itération)"""
+
+    def __init__(self, arbre, compteur, requete_mot=None, requete_tous=None):
+        self.arbre = arbre
+        self.compteur = compteur
+        self.requete_mot = requete_mot
+        self.requete_tous = requete_tous
+
+    def __len__(self):
+        return self.arbre._compteur(self.compteur)
+
+    def get(self, mot, defaut=None):
+        ligne = self.arbre.connexion.execute(self.requete_mot, (mot,)).fetchone()
+        return ligne[0] if ligne else defaut
+
+    def __getitem__(self, mot):
+        valeur = self.get(mot)
+        if valeur is None:
+            raise KeyError(mot)
+        return valeur
+
+    def __contains__(self, mot):
+        return self.get(mot) is not None
+
+    def __iter__(self):
+        for (mot,) in self.arbre.connexion.execute(self.requete_tous):
+            yield mot
+
+
+class ArbreSQLite:
+    """Racines, dérivés et index inverse stockés dans SQLite (même interface qu'ArbreAVL)"""
+
+    def __init__(self, stockage, verbeux=True):
+        self.stockage = stockage
+        self.connexion = stockage.connexion
+        self.verbeux = verbeux
+        self.observateurs = []
+        self.index_inverse = _VueIndex(self, "mots_indexes", _RACINE_DU_MOT,
+                                       "SELECT mot FROM index_inverse")
+        # Formes vocalisées : seul le nombre est exposé (statistiques)
+        self.index_normalise = _VueIndex(self, "formes_vocalisees")
+        # Époques (voir ArbreAVL) : modifications faites par ce processus
+        self.version = 0
+        self.epoque_schemes = 0
+
+    def _afficher(self, message):
+        """Affiche un message si le mode verbeux est actif"""
+        if self.verbeux:
+            print(message)
+
+    def _notifier(self, evenement, *args):
+        """Prévient les observateurs d'une modification (voir ArbreAVL._notifier)"""
+        self.version += 1
+        for observateur in self.observateurs:
+            methode = getattr(observateur, evenement, None)
+            if methode:
+                methode(*args)
+
+    def _compteur(self, nom):
+        return self.connexion.execute(_COMPTEUR, (nom,)).fetchone()[0]
+
+    # ============ RACINES ============
+
+    def chercher(self, racine):
+        """Retourne le nœud de la racine, ou None"""
+        ligne = self.connexion.execute(_RACINE_ID, (racine,)).fetchone()
+        return NoeudSQLite(self, ligne[0], racine) if ligne else None
+
+    def rechercher_profondeur(self, racine):
+        """(nœud ou None, 1) : une seule recherche dans l'index B-tree"""
+        return self.chercher(racine), 1
+
+    def ajouter_racine(self, racine):
+        """Insère une racine (sans effet si elle existe déjà)"""
+        with self.stockage.transaction():
+            ajoutee = self.connexion.execute(_AJOUTER_RACINE, (racine,)).rowcount
+        if ajoutee:
+            self._notifier("racine_ajoutee", racine)
+
+    def inserer_lot(self, racines):
+        """Insère plusieurs racines en une transaction ; retourne le nombre de racines nouvelles"""
+        with self.stockage.transaction():
+            avant = self.nb_racines()
+            self._inserer_lot([(racine,) for racine in sorted(set(racines))])
+            return self.nb_racines() - avant
+
+    def supprimer_racine(self, racine):
+        """Supprime une racine et tous ses dérivés"""
+        with self.stockage.transaction():
+            noeud = self.chercher(racine)
+            if not noeud:
+                return
+            self.connexion.execute("DELETE FROM derives WHERE racine_id = ?", (noeud.id,))
+            self.connexion.execute("DELETE FROM racines WHERE id = ?", (noeud.id,))
+        self._notifier("racine_supprimee", racine)
+
+    def supprimer_lot(self, racines):
+        """Supprime plusieurs racines en une transaction (executemany) ; retourne le nombre supprimé"""
+        with self.stockage.transaction():
+            noeuds = [noeud for noeud in map(self.chercher, set(racines)) if noeud]
+            ids = [(noeud.id,) for noeud in noeuds]
+            self.connexion.executemany("DELETE FROM derives WHERE racine_id = ?", ids)
+            self.connexion.executemany("DELETE FROM racines WHERE id = ?", ids)
+        for noeud in noeuds:
+            self._notifier("racine_supprimee", noeud.racine)
+        return len(noeuds)
+
+    def nb_racines(self):
+        return self._compteur("racines")
+
+    @property
+    def nb_derives(self):
+        return self._compteur("derives")
+
+    @property
+    def usage_schemes(self):
+        return dict(self.connexion.execute("SELECT scheme, nombre FROM usage_schemes"))
+
+    def charger_depuis_fichier(self, nom_fichier, taille_lot=10000):
+        """Charge les racines d'un fichier texte, par lots (executemany)"""
+        try:
+            with open(nom_fichier, 'r', encoding='utf-8') as f, self.stockage.transaction():
+                lot = []
+                for ligne in f:
+                    racine = ligne.strip()
+                    if racine and len(racine) >= 3:
+                        lot.append((racine,))
+                        if len(lot) >= taille_lot:
+                            self._inserer_lot(lot)
+                            lot = []
+                self._inserer_lot(lot)
+            self._afficher(f"✅ Racines chargées depuis '{nom_fichier}'")
+        except FileNotFoundError:
+            self._afficher(f"❌ Fichier '{nom_fichier}' non trouvé")
+
+    def _inserer_lot(self, lot):
+        if not self.observateurs:
+            self.connexion.executemany(_AJOUTER_RACINE, lot)
+            return
+        # Observateurs abonnés : il faut savoir quelles racines sont nouvelles
+        for (racine,) in lot:
+            self.ajouter_racine(racine)
+
+    def vider(self):
+        """Retire toutes les racines et tous les dérivés"""
+        with self.stockage.transaction():
+            self.connexion.execute("DELETE FROM derives")
+            self.connexion.execute("DELETE FROM racines")
+        self._notifier("arbre_vide")
+
+    # ============ DÉRIVÉS ============
+
+    def enregistrer_derive(self, noeud, mot, scheme=None):
+        """Ajoute un dérivé à une racine (table des dérivés + index inverse)"""
+        cle = retirer_diacritiques(mot)
+        with self.stockage.transaction():
+            if not self.connexion.execute(_AJOUTER_DERIVE, (noeud.id, mot, scheme, cle)).rowcount:
+                return False
+            self.connexion.execute(_INDEXER, (mot, noeud.id))
+        self._notifier("derive_ajoute", noeud.racine, mot, scheme)
+        return True
+
+    def ajouter_derive(self, racine, mot, scheme=None):
+        """Ajoute un dérivé à une racine donnée par son texte"""
+        noeud = self.chercher(racine)
+        if not noeud:
+            return False
+        return self.enregistrer_derive(noeud, mot, scheme)
+
+    def retirer_derive(self, noeud, mot):
+        """Retire un dérivé (l'entrée d'index est retirée par déclencheur)"""
+        with self.stockage.transaction():
+            if not self.connexion.execute("DELETE FROM derives WHERE racine_id = ? AND mot = ?",
+                                          (noeud.id, mot)).rowcount:
+                return False
+        self._notifier("derive_retire", noeud.racine, mot)
+        return True
+
+    def fixer_index(self, mot, racine):
+        """Force l'entrée d'index inverse d'un mot (racine None = retirée)"""
+        with self.stockage.transaction():
+            noeud = self.chercher(racine) if racine else None
+            if noeud:
+                self.connexion.execute(_INDEXER, (mot, noeud.id))
+            else:
+                self.connexion.execute("DELETE FROM index_inverse WHERE mot = ?", (mot,))
+        self.version += 1
+
+    def possede_derive(self, noeud, mot):
+        """Vrai si `mot` est un dérivé du nœud"""
+        return self.connexion.execute(
+            "SELECT 1 FROM derives WHERE racine_id = ? AND mot = ?",
+            (noeud.id, mot)).fetchone() is not None
+
+    def derives_hors_index(self, noeud):
+        """Dérivés du nœud que l'index inverse attribue à une autre racine"""
+        return [mot for (mot,) in self.connexion.execute(
+            "SELECT d.mot FROM derives d LEFT JOIN index_inverse i ON i.mot = d.mot "
+            "WHERE d.racine_id = ? AND i.racine_id IS NOT d.racine_id ORDER BY d.rang",
+            (noeud.id,))]
+
+    def scheme_du_derive(self, noeud, mot):
+        """Clé du schème qui a produit `mot` pour ce nœud (None si inconnu)"""
+        ligne = self.connexion.execute(
+            "SELECT scheme FROM derives WHERE racine_id = ? AND mot = ?",
+            (noeud.id, mot)).fetchone()
+        return ligne[0] if ligne else None
+
+    def derives_avec_schemes(self, noeud):
+        """Liste des (mot, clé du schème ou None) d'un nœud"""
+        return self.connexion.execute(
+            "SELECT mot, scheme FROM derives WHERE racine_id = ? ORDER BY rang",
+            (noeud.id,)).fetchall()
+
+    def mots_du_scheme(self, scheme):
+        """Mots produits par un schème (index derives_scheme)"""
+        return [mot for (mot,) in self.connexion.execute(
+            "SELECT DISTINCT mot FROM derives WHERE scheme = ?", (scheme,))]
+
+    def derives_du_scheme(self, scheme):
+        """Cases (racine, mot) produites par un schème (index derives_scheme)"""
+        return self.connexion.execute(
+            "SELECT r.racine, d.mot FROM derives d JOIN racines r ON r.id = d.racine_id "
+            "WHERE d.scheme = ?", (scheme,)).fetchall()
+
+    def trouver_racine_du_mot(self, mot):
+        """Racine d'un mot, vocalisé ou non (même règles qu'ArbreAVL)"""
+        ligne = self.connexion.execute(_RACINE_DU_MOT, (mot,)).fetchone()
+        if ligne:
+            return ligne[0]
+        cle = retirer_diacritiques(mot)
+        if cle != mot:
+            ligne = self.connexion.execute(_RACINE_DU_MOT, (cle,)).fetchone()
+            if ligne:
+                return ligne[0]
+        ligne = self.connexion.execute(_RACINE_DE_LA_CLE, (cle,)).fetchone()
+        return ligne[0] if ligne else None
+
+    def analyses_du_mot(self, mot):
+        """Toutes les analyses (racine, schème) d'un mot (même règles qu'ArbreAVL)"""
+        cle = retirer_diacritiques(mot)
+        formes = [mot]
+        if cle != mot:
+            formes.append(cle)
+        formes.extend(forme for (forme,) in self.connexion.execute(
+            "SELECT DISTINCT mot FROM derives WHERE cle = ? AND mot != ? ORDER BY rang", (cle, cle)))
+        for forme in formes:
+            racine = self.index_inverse.get(forme)
+            if racine is None:
+                continue
+            analyses = self.connexion.execute(_ANALYSES, (cle, forme)).fetchall()
+            return analyses or [(racine, None)]
+        return []
+
+    # ============ PARCOURS ORDONNÉS ============
+
+    def iterer_infixe(self, debut=None, fin=None):
+        """Parcourt les racines dans l'ordre avec debut <= racine < fin"""
+        conditions, valeurs = [], []
+        if debut is not None:
+            conditions.append("racine >= ?")
+            valeurs.append(debut)
+        if fin is not None:
+            conditions.append("racine < ?")
+            valeurs.append(fin)
+        requete = "SELECT id, racine FROM racines"
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        # Curseur à part : l'appelant peut modifier la base pendant le parcours
+        for identifiant, racine in self.connexion.cursor().execute(requete + " ORDER BY racine",
+                                                                   valeurs).fetchall():
+            yield NoeudSQLite(self, identifiant, racine)
+
+    def iterer_prefixe(self, prefixe):
+        """Parcourt dans l'ordre les racines qui commencent par `prefixe`"""
+        return self.iterer_infixe(prefixe, prefixe + _FIN_PREFIXE)
+
+    def compter_prefixe(self, prefixe):
+        """Nombre de racines commençant par `prefixe`"""
+        return self.connexion.execute(
+            "SELECT COUNT(*) FROM racines WHERE racine >= ? AND racine < ?",
+            (prefixe, prefixe + _FIN_PREFIXE)).fetchone()[0]
+
+    def page(self, numero, taille_page, prefixe=""):
+        """(nœuds de la page, nombre total) pour les racines commençant par `prefixe`"""
+        total = self.compter_prefixe(prefixe) if prefixe else self.nb_racines()
+        if numero < 0 or numero * taille_page >= total:
+            return [], total
+        curseur = self.connexion.execute(
+            "SELECT id, racine FROM racines WHERE racine >= ? AND racine < ? "
+            "ORDER BY racine LIMIT ? OFFSET ?",
+            (prefixe, prefixe + _FIN_PREFIXE, taille_page, numero * taille_page))
+        return [NoeudSQLite(self, i, r) for i, r in curseur], total
+
+    def afficher_infixe(self, noeud=None):
+        """Affiche toutes les racines triées"""
+        for noeud in self.iterer_infixe():
+            print(f"  - {noeud.racine} ({len(noeud.derivees)} dérivés)")
+
+
+class TableSQLite:
+    """Schèmes stockés dans SQLite, gardés en cache (ils sont peu nombreux)"""
+
+    def __init__(self, stockage, verbeux=True):
+        self.stockage = stockage
+        self.connexion = stockage.connexion
+        self.verbeux = verbeux
+        self.version = 0    # Incrémentée à chaque ajout, modification ou relecture
+        self.redefinitions = {}
+        self.entrees = {}
+        self._recharger()
+
+    def _afficher(self, message):
+        """Affiche un message si le mode verbeux est actif"""
+        if self.verbeux:
+            print(message)
+
+    def _recharger(self):
+        """Relit les schèmes (ajoutés ou modifiés éventuellement par un autre processus)"""
+        anciennes = self.entrees
+        self.entrees = {}
+        self.version += 1
+        for cle, pattern, description in self.connexion.execute(
+                "SELECT cle, pattern, description FROM schemes ORDER BY rang"):
+            self.entrees[cle] = EntreeScheme(cle, pattern, description)
+            if cle in anciennes and anciennes[cle].pattern != pattern:
+                self.redefinitions[cle] = self.version
+
+    def inserer(self, cle, pattern, description):
+        """Insère ou remplace un schème"""
+        with self.stockage.transaction():
+            self.connexion.execute(
+                "INSERT INTO schemes (cle, pattern, description) VALUES (?, ?, ?) "
+                "ON CONFLICT (cle) DO UPDATE SET pattern = excluded.pattern, "
+                "description = excluded.description",
+                (cle, pattern, description))
+        ancienne = self.entrees.get(cle)
+        self.entrees[cle] = EntreeScheme(cle, pattern, description)
+        self.version += 1
+        if ancienne is not None and ancienne.pattern != pattern:
+            self.redefinitions[cle] = self.version
+        self._afficher(f"✅ Schème '{cle}' ajouté")
+
+    def rechercher(self, cle):
+        """Recherche un schème par sa clé"""
+        return self.entrees.get(cle)
+
+    def cles_modifiees_depuis(self, version):
+        """Clés dont le pattern a changé après `version` (voir TableHachage)"""
+        return [cle for cle, v in self.redefinitions.items() if v > version]
+
+    def rechercher_sondage(self, cle):
+        """(entrée ou None, 1) : une seule consultation du cache"""
+        return self.entrees.get(cle), 1
+
+    def iterer(self):
+        """Parcourt les schèmes dans l'ordre d'ajout"""
+        return iter(list(self.entrees.values()))
+
+    def afficher_tous(self):
+        """Affiche tous les schèmes"""
+        print("\n=== SCHÈMES DISPONIBLES ===")
+        for entree in self.entrees.values():
+            print(f"🔸 {entree.cle}: {entree.description}")
+            print(f"   Pattern: {entree.pattern}")
+            print()
+        if not self.entrees:
+            print("Aucun schème disponible")
+        else:
+            print(f"Total: {len(self.entrees)} schème(s)")
+
+    def charger_depuis_fichier(self, nom_fichier):
+        """Charge les schèmes depuis un fichier (format de data/schemes.txt)"""
+        try:
+            with open(nom_fichier, 'r', encoding='utf-8') as f, self.stockage.transaction():
+                for ligne in f:
+                    ligne = ligne.strip()
+                    if not ligne or ligne.startswith('#'):
+                        continue
+                    parts = ligne.split('|')
+                    if len(parts) >= 2:
+                        description = parts[2].strip() if len(parts) > 2 else "Pas de description"
+                        self.inserer(parts[0].strip(), parts[1].strip(), description)
+            self._afficher(f"✅ Schèmes chargés depuis '{nom_fichier}'")
+        except FileNotFoundError:
+            self._afficher(f"⚠️  Fichier '{nom_fichier}' non trouvé. Chargement des schèmes par défaut.")
+            self.charger_schemes_par_defaut()
+
+    def charger_schemes_par_defaut(self):
+        """Charge les schèmes de base (les mêmes que TableHachage)"""
+        table = TableHachage(verbeux=False)
+        table.charger_schemes_par_defaut()
+        with self.stockage.transaction():
+            for entree in table.iterer():
+                self.inserer(entree.cle, entree.pattern, entree.description)
+
+
+class StockageSQLite:
+    """Base SQLite (WAL) partageable entre processus d'une même machine"""
+
+    def __init__(self, chemin, verbeux=True):
+        self.chemin = chemin
+        self.profondeur = 0       # transactions imbriquées en cours (voir transaction)
+        # isolation_level=None : mode autocommit, les transactions sont explicites
+        self.connexion = sqlite3.connect(chemin, isolation_level=None,
+                                         cached_statements=256)
+        self.connexion.execute("PRAGMA journal_mode = WAL")
+        self.connexion.execute("PRAGMA synchronous = NORMAL")
+        self.connexion.execute("PRAGMA busy_timeout = 5000")
+        self.connexion.executescript(_SCHEMA)
+
+        self.table = TableSQLite(self, verbeux=verbeux)
+        self.arbre = ArbreSQLite(self, verbeux=verbeux)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Transaction d'écriture : BEGIN IMMEDIATE (verrou pris d'emblée,
+        attente de busy_timeout si un autre processus écrit), COMMIT à la
+        sortie, ROLLBACK sur exception. Une transaction ouverte dans une
+        autre n'en fait qu'une : seule la plus externe valide.
+        """
+        if self.profondeur:
+            self.profondeur += 1
+            try:
+                yield
+            finally:
+                self.profondeur -= 1
+            return
+        self.connexion.execute("BEGIN IMMEDIATE")
+        self.profondeur = 1
+        try:
+            yield
+        except BaseException:
+            self.connexion.execute("ROLLBACK")
+            raise
+        else:
+            self.connexion.execute("COMMIT")
+        finally:
+            self.profondeur = 0
+
+    def valider(self):
+        """Rien en attente : chaque écriture est validée avant de rendre la main"""
+
+    def fermer(self):
+        """Ferme la base"""
+        if self.connexion is None:
+            return
+        self.connexion.close()
+        self.connexion = None
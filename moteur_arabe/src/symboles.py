@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Représentation par identifiants : chaque mot et chaque racine est interné
+une fois et désigné partout ailleurs par un entier dense (1, 2, 3… ; 0 veut
+dire « aucun »). Les nœuds stockent leurs dérivés et leurs schèmes dans des
+tableaux compacts (array('I'), array('H')), l'index des schèmes dans des
+array('Q') ; les chaînes ne sont reconstituées qu'à la frontière de l'API
+(derivees, mots_du_scheme…).
+
+    TableSymboles   chaîne ↔ identifiant (dict + liste) : pour les racines
+    TableMots       même table pour les mots ; la valeur du dict porte
+                    aussi l'id de la racine du mot (index inverse)
+    IndexInverse    mot → racine lu dans le dict de la TableMots, avec
+                    l'interface du dict qu'il remplace
+    CasesDuScheme   dérivés d'un schème (mot, racine) dans un array('Q')
+    AnalysesMultiples  analyses (racine, schème) des mots de plusieurs
+                    racines : listes chaînées dans des tableaux plats
+
+Un identifiant n'est jamais réattribué : un mot retiré de toutes ses
+racines garde le sien (et le retrouve s'il revient).
+"""
+import sys
+from array import array
+
+MASQUE_RACINE = 0xFFFFFFFF      # id de la racine dans les valeurs de TableMots
+
+
+class TableSymboles:
+    """Chaînes internées, numérotées dans l'ordre d'arrivée (dict + liste)"""
+
+    def __init__(self):
+        self.ids = {}                 # chaîne → identifiant
+        self.chaines = [None]         # identifiant → chaîne (0 : aucun)
+
+    def __len__(self):
+        return len(self.chaines) - 1
+
+    def chercher(self, chaine):
+        """Identifiant de la chaîne, 0 si elle n'a jamais été internée"""
+        return self.ids.get(chaine, 0)
+
+    def identifiant(self, chaine):
+        """Identifiant de la chaîne, attribué au premier appel"""
+        identifiant = self.ids.get(chaine)
+        if identifiant is None:
+            identifiant = self.ids[chaine] = len(self.chaines)
+            self.chaines.append(chaine)
+        return identifiant
+
+    def chaine(self, identifiant):
+        """Chaîne d'un identifiant (None pour 0)"""
+        return self.chaines[identifiant]
+
+    def __contains__(self, chaine):
+        return chaine in self.ids
+
+    def __iter__(self):
+        return iter(self.chaines[1:])
+
+    def taille_octets(self):
+        return (sys.getsizeof(self.ids) + sys.getsizeof(self.chaines)
+                + sum(sys.getsizeof(chaine) for chaine in self.chaines[1:]))
+
+
+class TableMots(TableSymboles):
+    """
+    Table des mots : comme TableSymboles, mais la valeur de chaque mot dans
+    le dict porte aussi sa racine, id du mot << 32 | id de la racine (0 = mot
+    non indexé). Le même dict sert à interner les mots et d'index inverse.
+    """
+
+    def chercher(self, chaine):
+        """Identifiant de la chaîne, 0 si elle n'a jamais été internée"""
+        return self.ids.get(chaine, 0) >> 32
+
+    def identifiant(self, chaine):
+        """Identifiant de la chaîne, attribué au premier appel"""
+        valeur = self.ids.get(chaine)
+        if valeur is not None:
+            return valeur >> 32
+        identifiant = len(self.chaines)
+        self.ids[chaine] = identifiant << 32
+        self.chaines.append(chaine)
+        return identifiant
+
+
+class IndexInverse:
+    """
+    Index inverse mot → racine, lu dans le dict de la TableMots : une
+    recherche de dict et un masque donnent l'id de la racine. S'utilise
+    comme le dict qu'il remplace (get, [], in, del, pop, len, itération) ;
+    l'arbre passe par les identifiants (racine_id, fixer).
+    """
+
+    def __init__(self, mots, racines):
+        self.mots = mots              # TableMots (partagée avec l'arbre)
+        self.racines = racines        # TableSymboles des racines
+        self.ids = mots.ids           # mot → id du mot << 32 | id de la racine
+        self.chaines_racines = racines.chaines     # id → racine (0 : None)
+        self.nb = 0
+
+    def racine_id(self, id_mot):
+        return self.ids[self.mots.chaines[id_mot]] & MASQUE_RACINE
+
+    def fixer(self, id_mot, id_racine):
+        """Indexe le mot sous la racine (id_racine 0 = retire l'entrée) ;
+        retourne l'id de la racine précédente (0 si aucune)"""
+        mot = self.mots.chaines[id_mot]
+        ancienne = self.ids[mot] & MASQUE_RACINE
+        if not ancienne:
+            if id_racine:
+                self.nb += 1
+        elif not id_racine:
+            self.nb -= 1
+        self.ids[mot] = id_mot << 32 | id_racine
+        return ancienne
+
+    def get(self, mot, defaut=None):
+        racine = self.chaines_racines[self.ids.get(mot, 0) & MASQUE_RACINE]
+        return defaut if racine is None else racine
+
+    def __getitem__(self, mot):
+        racine = self.get(mot)
+        if racine is None:
+            raise KeyError(mot)
+        return racine
+
+    def __contains__(self, mot):
+        return self.ids.get(mot, 0) & MASQUE_RACINE != 0
+
+    def __setitem__(self, mot, racine):
+        self.fixer(self.mots.identifiant(mot), self.racines.identifiant(racine))
+
+    def __delitem__(self, mot):
+        if mot not in self:
+            raise KeyError(mot)
+        self.fixer(self.mots.chercher(mot), 0)
+
+    def pop(self, mot, *defaut):
+        racine = self.get(mot)
+        if racine is None:
+            if defaut:
+                return defaut[0]
+            raise KeyError(mot)
+        del self[mot]
+        return racine
+
+    def __len__(self):
+        return self.nb
+
+    def __iter__(self):
+        for mot, valeur in self.ids.items():
+            if valeur & MASQUE_RACINE:
+                yield mot
+
+    def items(self):
+        racines = self.chaines_racines
+        for mot, valeur in self.ids.items():
+            if valeur & MASQUE_RACINE:
+                yield mot, racines[valeur & MASQUE_RACINE]
+
+    def taille_octets(self):
+        """Rien en propre : l'index vit dans le dict de la TableMots"""
+        return 0
+
+
+class CasesDuScheme:
+    """
+    Dérivés d'un schème, chacun codé id du mot << 32 | id de la racine,
+    dans un array('Q') : 8 octets par case, aucun objet par élément. Un
+    ajout est un append ; un retrait est noté dans `retirees` et le tableau
+    n'est recopié que quand les cases retirées en occupent la moitié.
+    """
+
+    def __init__(self):
+        self.cases = array('Q')
+        self.retirees = set()        # cases encore dans le tableau mais retirées
+
+    def ajouter(self, case):
+        if case in self.retirees:
+            self.retirees.discard(case)      # déjà dans le tableau : redevient valide
+        else:
+            self.cases.append(case)
+
+    def retirer(self, case):
+        retirees = self.retirees
+        retirees.add(case)
+        if 2 * len(retirees) > len(self.cases):
+            self.cases = array('Q', [c for c in self.cases if c not in retirees])
+            retirees.clear()
+
+    def __len__(self):
+        return len(self.cases) - len(self.retirees)
+
+    def __iter__(self):
+        retirees = self.retirees
+        if not retirees:
+            return iter(self.cases)
+        return (case for case in self.cases if case not in retirees)
+
+    def taille_octets(self):
+        return self.cases.itemsize * len(self.cases) + sys.getsizeof(self.retirees)
+
+
+class AnalysesMultiples:
+    """
+    Analyses des mots produits par plusieurs racines : pour chaque id de mot,
+    une liste chaînée d'entiers (id de la racine << 16 | id du schème) dans
+    l'ordre d'ajout. Les cellules sont rangées dans des tableaux plats
+    (12 octets par analyse, 4 par mot pour la tête) ; les cellules libérées
+    sont réutilisées. Seuls les mots ambigus ont une liste.
+    """
+
+    def __init__(self):
+        self.tetes = array('I')               # id du mot → première cellule (0 = aucune)
+        self.valeurs = array('Q', [0])        # cellule → analyse (cellule 0 : aucune)
+        self.suivantes = array('I', [0])      # cellule → cellule suivante (0 = fin)
+        self.libre = 0                        # première cellule libre (chaînée par suivantes)
+        self.nb = 0                           # mots qui ont une liste
+
+    def __len__(self):
+        return self.nb
+
+    def __contains__(self, id_mot):
+        tetes = self.tetes
+        return id_mot < len(tetes) and tetes[id_mot] != 0
+
+    def analyses(self, id_mot):
+        """Analyses du mot, dans l'ordre d'ajout ([] s'il n'est pas ambigu)"""
+        resultats = []
+        if id_mot < len(self.tetes):
+            valeurs, suivantes = self.valeurs, self.suivantes
+            cellule = self.tetes[id_mot]
+            while cellule:
+                resultats.append(valeurs[cellule])
+                cellule = suivantes[cellule]
+        return resultats
+
+    def ajouter(self, id_mot, analyse):
+        """Ajoute une analyse à la fin de la liste du mot"""
+        tetes, suivantes = self.tetes, self.suivantes
+        if id_mot >= len(tetes):
+            tetes.frombytes(bytes(tetes.itemsize * (id_mot + 1 - len(tetes))))
+        nouvelle = self.libre
+        if nouvelle:
+            self.libre = suivantes[nouvelle]
+            self.valeurs[nouvelle] = analyse
+            suivantes[nouvelle] = 0
+        else:
+            nouvelle = len(self.valeurs)
+            self.valeurs.append(analyse)
+            suivantes.append(0)
+        cellule = tetes[id_mot]
+        if not cellule:
+            tetes[id_mot] = nouvelle
+            self.nb += 1
+            return
+        while suivantes[cellule]:
+            cellule = suivantes[cellule]
+        suivantes[cellule] = nouvelle
+
+    def retirer_racine(self, id_mot, id_racine):
+        """
+        Retire l'analyse d'une racine ; retourne les analyses restantes. La
+        liste est libérée dès qu'il n'en reste qu'une (le mot n'est plus ambigu).
+        """
+        restantes = [a for a in self.analyses(id_mot) if a >> 16 != id_racine]
+        self._liberer(id_mot)
+        if len(restantes) > 1:
+            for analyse in restantes:
+                self.ajouter(id_mot, analyse)
+        return restantes
+
+    def _liberer(self, id_mot):
+        """Rend les cellules du mot à la liste des cellules libres"""
+        cellule = self.tetes[id_mot] if id_mot < len(self.tetes) else 0
+        if not cellule:
+            return
+        self.tetes[id_mot] = 0
+        self.nb -= 1
+        suivantes = self.suivantes
+        while cellule:
+            suivante = suivantes[cellule]
+            suivantes[cellule] = self.libre
+            self.libre = cellule
+            cellule = suivante
+
+    def taille_octets(self):
+        return (self.tetes.itemsize * len(self.tetes) + self.valeurs.itemsize * len(self.valeurs)
+                + self.suivantes.itemsize * len(self.suivantes))
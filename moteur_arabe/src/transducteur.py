@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+Transducteur à états finis : (racine, schème) ↔ forme de surface.
+
+Les patterns de la table des schèmes sont compilés en un automate
+déterministe et minimal qui lit une forme lettre à lettre. Chaque lettre
+suit soit une transition littérale (lettre écrite dans un pattern), soit la
+transition par défaut (position C1, C2 ou C3 : n'importe quelle lettre de
+racine). Un état final donne les schèmes qui acceptent la forme ; la place
+des consonnes de racine y est fixe, elles sont donc lues directement dans
+la forme. Les racines sont regroupées par leurs trois premières lettres
+(celles qu'utilisent les patterns).
+
+    analyse     forme → [(racine, schème)]    linéaire en la longueur du mot
+    génération  (racine, schème) → forme      linéaire en la longueur du mot
+
+Le transducteur se sauvegarde en JSON (sauvegarder / charger). Attaché à un
+arbre, il suit les racines ajoutées ou supprimées (observateur).
+"""
+import json
+from array import array
+
+from .utils import retirer_diacritiques
+
+FORMAT = 1   # version du format de fichier
+
+
+def jetons(pattern):
+    """Découpe un pattern : lettres littérales, et 0/1/2 pour C1/C2/C3"""
+    resultat = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "C" and pattern[i + 1:i + 2] in ("1", "2", "3"):
+            resultat.append(int(pattern[i + 1]) - 1)
+            i += 2
+        else:
+            resultat.append(pattern[i])
+            i += 1
+    return tuple(resultat)
+
+
+class Transducteur:
+    """Automate minimal des schèmes et racines groupées par consonnes"""
+
+    def __init__(self):
+        self.cles = []            # id → clé du schème (ordre de la table)
+        self.gabarits = {}        # clé → jetons du pattern (génération)
+        self.positions = []       # id → positions de C1, C2, C3 dans la forme
+        self.transitions = []     # état → {lettre: état suivant}
+        self.defauts = array('i') # état → état suivant pour une lettre de racine (-1 = aucun)
+        self.sorties = []         # état → ids des schèmes acceptés (état final si non vide)
+        self.initial = -1         # état de départ (créé en dernier)
+        self.racines = {}         # trois premières lettres → racines
+        self.version_schemes = None
+        self.arbre = None
+
+    # ============ COMPILATION ============
+
+    def compiler_schemes(self, table):
+        """(Re)construit l'automate à partir des patterns de la table"""
+        self.cles = []
+        self.gabarits = {}
+        for entree in table.iterer():
+            # Une clé redéfinie : seule l'entrée trouvée par rechercher() compte
+            if entree.cle not in self.gabarits:
+                self.gabarits[entree.cle] = jetons(entree.pattern)
+                self.cles.append(entree.cle)
+
+        self._calculer_positions()
+
+        self.transitions = []
+        self.defauts = array('i')
+        self.sorties = []
+        self._registre = {}     # signature d'un état → numéro (minimisation)
+        self._memo = {}         # ensemble (schème, position) → numéro
+        self.initial = self._construire(frozenset((p, 0) for p in range(len(self.cles))))
+        del self._registre, self._memo
+        self.version_schemes = table.version
+
+    def _calculer_positions(self):
+        """Place de C1, C2 et C3 dans les formes produites par chaque schème"""
+        self.positions = []
+        for cle in self.cles:
+            places = ([], [], [])
+            for i, jeton in enumerate(self.gabarits[cle]):
+                if jeton.__class__ is int:
+                    places[jeton].append(i)
+            self.positions.append(tuple(tuple(p) for p in places))
+
+    def _construire(self, ensemble):
+        """
+        Construit l'état d'un ensemble de couples (schème, position) et
+        retourne son numéro. Les états sont créés après leurs successeurs
+        (l'automate est acyclique) : deux états de même signature (sorties,
+        transitions) sont fusionnés au passage, d'où un automate minimal.
+        """
+        numero = self._memo.get(ensemble)
+        if numero is not None:
+            return numero
+
+        lettres = set()
+        acceptes = []
+        for p, i in ensemble:
+            gabarit = self.gabarits[self.cles[p]]
+            if i == len(gabarit):
+                acceptes.append(p)
+            elif gabarit[i].__class__ is str:
+                lettres.add(gabarit[i])
+
+        transitions = {}
+        for lettre in sorted(lettres):
+            transitions[lettre] = self._construire(self._avancer(ensemble, lettre))
+        suite = self._avancer(ensemble, None)
+        defaut = self._construire(suite) if suite else -1
+
+        signature = (tuple(sorted(acceptes)), tuple(transitions.items()), defaut)
+        numero = self._registre.get(signature)
+        if numero is None:
+            numero = self._registre[signature] = len(self.sorties)
+            self.transitions.append(transitions)
+            self.defauts.append(defaut)
+            self.sorties.append(signature[0])
+        self._memo[ensemble] = numero
+        return numero
+
+    def _avancer(self, ensemble, lettre):
+        """Couples atteints en lisant `lettre` (None = lettre de racine quelconque)"""
+        suite = set()
+        for p, i in ensemble:
+            gabarit = self.gabarits[self.cles[p]]
+            if i < len(gabarit):
+                jeton = gabarit[i]
+                if jeton.__class__ is int or jeton == lettre:
+                    suite.add((p, i + 1))
+        return frozenset(suite)
+
+    def compiler_racines(self, racines):
+        """Regroupe les racines par leurs trois premières lettres"""
+        self.racines = {}
+        for racine in racines:
+            self.ajouter_racine(racine)
+
+    def ajouter_racine(self, racine):
+        if len(racine) >= 3:
+            groupe = self.racines.setdefault(racine[:3], [])
+            if racine not in groupe:
+                groupe.append(racine)
+
+    def retirer_racine(self, racine):
+        groupe = self.racines.get(racine[:3])
+        if groupe and racine in groupe:
+            groupe.remove(racine)
+            if not groupe:
+                del self.racines[racine[:3]]
+
+    def attacher(self, arbre):
+        """Compile les racines de l'arbre puis suit ses modifications"""
+        self.compiler_racines(noeud.racine for noeud in arbre.iterer_infixe())
+        self.arbre = arbre
+        arbre.observateurs.append(self)
+
+    def detacher(self):
+        if self.arbre is not None and self in self.arbre.observateurs:
+            self.arbre.observateurs.remove(self)
+        self.arbre = None
+
+    # ============ ÉVÉNEMENTS DE L'ARBRE ============
+
+    def racine_ajoutee(self, racine):
+        self.ajouter_racine(racine)
+
+    def racine_supprimee(self, racine):
+        self.retirer_racine(racine)
+
+    def arbre_vide(self):
+        self.racines = {}
+
+    # ============ ANALYSE ============
+
+    def _etat_final(self, forme):
+        """Lit la forme ; retourne l'état atteint, ou -1 si elle est rejetée"""
+        etat = self.initial
+        transitions = self.transitions
+        defauts = self.defauts
+        for lettre in forme:
+            suivant = transitions[etat].get(lettre)
+            if suivant is None:
+                suivant = defauts[etat]
+                if suivant < 0:
+                    return -1
+            etat = suivant
+        return etat
+
+    def _consonnes(self, forme, id_scheme):
+        """Consonnes de racine lues dans la forme (None si une même position
+        Cn porte deux lettres différentes) ; '' pour une position absente"""
+        consonnes = []
+        for places in self.positions[id_scheme]:
+            if not places:
+                consonnes.append("")
+                continue
+            lettre = forme[places[0]]
+            for place in places[1:]:
+                if forme[place] != lettre:
+                    return None
+            consonnes.append(lettre)
+        return consonnes
+
+    def analyses_forme(self, forme):
+        """[([C1, C2, C3], clé du schème)] pour une forme sans diacritiques"""
+        if self.initial < 0:
+            return []
+        etat = self._etat_final(forme)
+        if etat < 0:
+            return []
+        resultats = []
+        for id_scheme in self.sorties[etat]:
+            consonnes = self._consonnes(forme, id_scheme)
+            if consonnes is not None:
+                resultats.append((consonnes, self.cles[id_scheme]))
+        return resultats
+
+    def analyser(self, mot):
+        """Toutes les analyses (racine, clé du schème) d'un mot, vocalisé ou non"""
+        resultats = []
+        for consonnes, cle in self.analyses_forme(retirer_diacritiques(mot)):
+            if all(consonnes):
+                racines = self.racines.get("".join(consonnes), ())
+            else:
+                # Pattern sans C1, C2 ou C3 : les lettres connues filtrent les groupes
+                racines = [racine for groupe, liste in self.racines.items()
+                           if all(not c or c == g for c, g in zip(consonnes, groupe))
+                           for racine in liste]
+            resultats.extend((racine, cle) for racine in racines)
+        return resultats
+
+    def scheme_pour(self, forme, racine):
+        """Premier schème (ordre de la table) qui donne `forme` avec cette racine, ou None"""
+        if self.initial < 0:
+            return None
+        etat = self._etat_final(forme)
+        if etat < 0:
+            return None
+        for id_scheme in self.sorties[etat]:
+            consonnes = self._consonnes(forme, id_scheme)
+            if consonnes is not None and all(not c or c == racine[i]
+                                             for i, c in enumerate(consonnes)):
+                return self.cles[id_scheme]
+        return None
+
+    # ============ GÉNÉRATION ============
+
+    def generer(self, racine, cle):
+        """Forme produite par un schème pour une racine (None si schème inconnu)"""
+        gabarit = self.gabarits.get(cle)
+        if gabarit is None or len(racine) < 3:
+            return None
+        return "".join(racine[j] if j.__class__ is int else j for j in gabarit)
+
+    # ============ FICHIER ============
+
+    def sauvegarder(self, chemin):
+        """Écrit le transducteur (automate, schèmes et racines) en JSON"""
+        donnees = {
+            "format": FORMAT,
+            "cles": self.cles,
+            "gabarits": [self.gabarits[cle] for cle in self.cles],
+            "initial": self.initial,
+            "transitions": self.transitions,
+            "defauts": self.defauts.tolist(),
+            "sorties": self.sorties,
+            "racines": sorted(r for groupe in self.racines.values() for r in groupe),
+        }
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(donnees, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def charger(cls, chemin):
+        """Relit un transducteur écrit par sauvegarder()"""
+        with open(chemin, "r", encoding="utf-8") as f:
+            donnees = json.load(f)
+        if donnees.get("format") != FORMAT:
+            raise ValueError(f"Format de transducteur inconnu dans '{chemin}'")
+        transducteur = cls()
+        transducteur.cles = donnees["cles"]
+        transducteur.gabarits = {cle: tuple(g) for cle, g in zip(donnees["cles"], donnees["gabarits"])}
+        transducteur._calculer_positions()
+        transducteur.initial = donnees["initial"]
+        transducteur.transitions = donnees["transitions"]
+        transducteur.defauts = array('i', donnees["defauts"])
+        transducteur.sorties = [tuple(s) for s in donnees["sorties"]]
+        transducteur.compiler_racines(donnees["racines"])
+        return transducteur
+
+
+def compiler(table, arbre=None):
+    """Transducteur des schèmes de `table` (et des racines de `arbre`, suivies ensuite)"""
+    transducteur = Transducteur()
+    transducteur.compiler_schemes(table)
+    if arbre is not None:
+        transducteur.attacher(arbre)
+    return transducteur
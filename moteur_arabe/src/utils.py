@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Fonctions utilitaires partagées (normalisation de l'écriture arabe)"""
+
+# Signes supprimés : tashkeel (fathatan → sukun, U+064B-U+0652), marques
+# coraniques et hamza suscrite/souscrite isolées (U+0653-U+065F), alef
+# suscrit (U+0670) et tatweel (U+0640).
+_DIACRITIQUES = "".join(chr(c) for c in range(0x064B, 0x0660)) + "\u0670\u0640"
+_TABLE_DIACRITIQUES = str.maketrans("", "", _DIACRITIQUES)
+
+# Variantes orthographiques ramenées à une forme unique :
+#   أ إ آ ٱ → ا   (hamza / madda / wasla sur alef)
+#   ة → ه         (ta marbuta)
+#   ى → ي         (alef maqsura)
+# La table est compilée une seule fois : str.translate fait tout en C.
+_TABLE_ORTHOGRAPHE = str.maketrans({
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ة": "ه",
+    "ى": "ي",
+})
+
+
+# Les deux passes en une seule table (recherche approchée)
+_TABLE_NORMALISATION = str.maketrans({
+    **_TABLE_ORTHOGRAPHE,
+    **_TABLE_DIACRITIQUES,
+})
+
+
+def retirer_diacritiques(mot):
+    """Supprime harakat, shadda, tanwin et tatweel : كَتَّبَ → كتب"""
+    return mot.translate(_TABLE_DIACRITIQUES)
+
+
+def normaliser_orthographe(mot):
+    """Ramène les variantes orthographiques (hamza, ta marbuta, alef maqsura) à une forme unique"""
+    return mot.translate(_TABLE_ORTHOGRAPHE)
+
+
+def normaliser(mot):
+    """Normalisation complète : sans diacritiques et variantes orthographiques unifiées"""
+    return mot.translate(_TABLE_NORMALISATION)
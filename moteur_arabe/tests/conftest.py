@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Outils communs des tests (à lancer depuis le dossier moteur_arabe/) :
+
+    python -m pytest tests
+    python -m pytest tests -m "not performance"     # sans les mesures de débit
+    MOTEUR_NB_GRAINES=50 python -m pytest tests      # plus de séquences aléatoires
+
+Les tests de propriétés tirent leurs données (racines, schèmes, suites
+d'opérations) avec random.Random(graine) : une graine qui échoue se rejoue
+telle quelle (son numéro est dans le nom du test).
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.arbre_abr import ArbreAVL                      # noqa: E402
+from src.moteur import MoteurMorphologique             # noqa: E402
+from src.table_hachage import TableHachage             # noqa: E402
+from src.utils import retirer_diacritiques             # noqa: E402
+
+NB_GRAINES = int(os.environ.get("MOTEUR_NB_GRAINES", "5"))
+GRAINES = list(range(NB_GRAINES))
+
+# Lettres des racines des tests : peu nombreuses, pour que les mots se
+# partagent entre racines (ambiguïtés) et que les collisions arrivent
+LETTRES = "بتدرسكلمعف"
+PATTERNS = ("C1اC2C3", "مC1C2وC3", "يC1C2C3", "اC1C2C3", "تC1C2يC3", "مC1C2C3",
+            "C1C2C3ان", "C1C2اC3", "C1اC2يC3", "مستC1C2C3")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "performance: mesures de débit (sensibles à la machine)")
+
+
+def appliquer(pattern, racine):
+    """Mot d'un pattern pour une racine : la définition de référence"""
+    return pattern.replace("C1", racine[0]).replace("C2", racine[1]).replace("C3", racine[2])
+
+
+def racines_aleatoires(aleatoire, nombre):
+    """`nombre` racines trilitères distinctes, dans un ordre aléatoire"""
+    racines = set()
+    while len(racines) < nombre:
+        racines.add("".join(aleatoire.choice(LETTRES) for _ in range(3)))
+    racines = sorted(racines)
+    aleatoire.shuffle(racines)
+    return racines
+
+
+def moteur_silencieux(stockage=None, schemes=None):
+    """Moteur sans affichage : schèmes par défaut, ou [(clé, pattern)]"""
+    moteur = MoteurMorphologique(verbeux=False)
+    if stockage is None:
+        moteur.initialiser(ArbreAVL(verbeux=False), TableHachage(verbeux=False))
+    else:
+        moteur.initialiser(stockage=stockage)
+    if schemes is None:
+        moteur.table_schemes.charger_schemes_par_defaut()
+    else:
+        for cle, pattern in schemes:
+            moteur.table_schemes.inserer(cle, pattern, "test")
+    return moteur
+
+
+def schemes_en_vigueur(table):
+    """[(clé, pattern)] dans l'ordre de la table ; une clé redéfinie : l'entrée de rechercher()"""
+    vus = {}
+    for entree in table.iterer():
+        if entree.cle not in vus:
+            vus[entree.cle] = table.rechercher(entree.cle).pattern
+    return list(vus.items())
+
+
+def forme(mot):
+    return retirer_diacritiques(mot)
+
+
+def verifier_avl(noeud):
+    """(hauteur, taille, racines dans l'ordre) ; échoue si un invariant est faux"""
+    if noeud is None:
+        return 0, 0, []
+    hg, tg, gauche = verifier_avl(noeud.gauche)
+    hd, td, droite = verifier_avl(noeud.droite)
+    assert abs(hg - hd) <= 1, f"déséquilibre en {noeud.racine}"
+    assert noeud.hauteur == 1 + max(hg, hd), f"hauteur fausse en {noeud.racine}"
+    assert noeud.taille == 1 + tg + td, f"taille fausse en {noeud.racine}"
+    assert all(r < noeud.racine for r in gauche) and all(r > noeud.racine for r in droite)
+    return noeud.hauteur, noeud.taille, gauche + [noeud.racine] + droite
+
+
+def verifier_arbre(arbre, modele):
+    """Compare l'arbre (AVL ou SQLite) au modèle {racine: {mot: schème}} et vérifie ses index"""
+    ordre = sorted(modele)
+    noeuds = list(arbre.iterer_infixe())
+    assert [n.racine for n in noeuds] == ordre
+    assert arbre.nb_racines() == len(modele)
+    if isinstance(arbre, ArbreAVL):
+        _, taille, infixe = verifier_avl(arbre.racine)
+        assert infixe == ordre and taille == len(modele)
+        for k in range(0, len(ordre), max(1, len(ordre) // 7)):
+            assert arbre.kieme(k).racine == ordre[k]
+            assert arbre.rang(ordre[k]) == k
+
+    usage = {}
+    for noeud in noeuds:
+        derives = dict(arbre.derives_avec_schemes(noeud))
+        assert derives == modele[noeud.racine], noeud.racine
+        for scheme in derives.values():
+            if scheme:
+                usage[scheme] = usage.get(scheme, 0) + 1
+    assert arbre.nb_derives == sum(len(d) for d in modele.values())
+    assert arbre.usage_schemes == usage
+
+    # Index inverse ↔ dérivés : chaque mot indexé appartient à sa racine,
+    # chaque dérivé est indexé, et analyses_du_mot donne toutes ses racines
+    proprietaires = {}
+    for racine in ordre:
+        for mot in modele[racine]:
+            proprietaires.setdefault(mot, []).append(racine)
+    assert len(arbre.index_inverse) == len(proprietaires)
+    for mot, racines in proprietaires.items():
+        racine = arbre.index_inverse.get(mot)
+        assert racine in racines, mot
+        assert arbre.trouver_racine_du_mot(mot) == racine
+        analyses = arbre.analyses_du_mot(mot)
+        assert analyses[0][0] == racine
+        assert sorted(r for r, _ in analyses) == sorted(racines), mot
+        assert {(r, modele[r][mot]) for r in racines} == set(analyses)
+    for scheme in usage:
+        attendus = sorted({mot for racine in ordre for mot, s in modele[racine].items() if s == scheme})
+        assert sorted(arbre.mots_du_scheme(scheme)) == attendus
+
+
+@pytest.fixture(params=GRAINES, ids=lambda graine: f"graine{graine}")
+def graine(request):
+    return request.param
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Invariants de l'ArbreAVL sous des suites aléatoires d'opérations : équilibre
+et ordre, tailles des sous-arbres (rang, k-ième), index inverse cohérent
+avec les dérivés, compteurs tenus à jour, comparés à un modèle simple
+(dict racine → dérivés).
+"""
+import random
+
+import pytest
+
+from conftest import PATTERNS, appliquer, racines_aleatoires, verifier_arbre
+from src.arbre_abr import NB_MAX_SCHEMES, ArbreAVL
+
+
+def operations_aleatoires(arbre, modele, aleatoire, racines, nombre):
+    """Applique `nombre` opérations tirées au hasard à l'arbre et au modèle"""
+    cles = [f"s{i}" for i in range(len(PATTERNS))]
+    for _ in range(nombre):
+        tirage = aleatoire.random()
+        racine = aleatoire.choice(racines)
+        if tirage < 0.25:
+            arbre.ajouter_racine(racine)
+            modele.setdefault(racine, {})
+        elif tirage < 0.55:
+            i = aleatoire.randrange(len(PATTERNS))
+            noeud = arbre.chercher(racine)
+            # Mot d'une autre racine parfois : mots partagés entre racines
+            source = racine if aleatoire.random() < 0.8 else aleatoire.choice(racines)
+            mot = appliquer(PATTERNS[i], source)
+            scheme = cles[i] if aleatoire.random() < 0.9 else None
+            ajoute = arbre.ajouter_derive(racine, mot, scheme)
+            if noeud is None:
+                assert not ajoute
+            elif mot not in modele[racine]:
+                assert ajoute
+                modele[racine][mot] = scheme
+        elif tirage < 0.7:
+            noeud = arbre.chercher(racine)
+            if noeud is not None and modele[racine]:
+                mot = aleatoire.choice(sorted(modele[racine]))
+                assert arbre.retirer_derive(noeud, mot)
+                del modele[racine][mot]
+        elif tirage < 0.85:
+            arbre.supprimer_racine(racine)
+            modele.pop(racine, None)
+        elif tirage < 0.93:
+            lot = aleatoire.sample(racines, aleatoire.randint(0, len(racines) // 3))
+            attendu = len(set(lot) & set(modele))
+            assert arbre.supprimer_lot(lot) == attendu
+            for r in lot:
+                modele.pop(r, None)
+        else:
+            lot = aleatoire.sample(racines, aleatoire.randint(0, len(racines) // 3))
+            attendu = len(set(lot) - set(modele))
+            assert arbre.inserer_lot(lot) == attendu
+            for r in lot:
+                modele.setdefault(r, {})
+
+
+def test_invariants_sous_operations_aleatoires(graine):
+    aleatoire = random.Random(graine)
+    racines = racines_aleatoires(aleatoire, 60)
+    arbre = ArbreAVL(verbeux=False)
+    modele = {}
+    for _ in range(20):
+        operations_aleatoires(arbre, modele, aleatoire, racines, 40)
+        verifier_arbre(arbre, modele)
+
+
+def test_index_compact_equivaut_au_dict(graine):
+    aleatoire = random.Random(graine)
+    racines = racines_aleatoires(aleatoire, 60)
+    arbre = ArbreAVL(verbeux=False)
+    modele = {}
+    operations_aleatoires(arbre, modele, aleatoire, racines, 400)
+    attendu = dict(arbre.index_inverse.items())
+    arbre.compacter_index()
+    assert dict(arbre.index_inverse.items()) == attendu
+    verifier_arbre(arbre, modele)
+    # Les modifications après compaction passent par les ajouts et retraits
+    for _ in range(5):
+        operations_aleatoires(arbre, modele, aleatoire, racines, 40)
+        verifier_arbre(arbre, modele)
+
+
+def test_parcours_par_intervalle_et_prefixe(graine):
+    aleatoire = random.Random(graine)
+    racines = racines_aleatoires(aleatoire, 200)
+    arbre = ArbreAVL(verbeux=False)
+    arbre.inserer_lot(racines)
+    ordre = sorted(racines)
+    for _ in range(20):
+        debut, fin = sorted(aleatoire.sample(ordre, 2))
+        assert [n.racine for n in arbre.iterer_infixe(debut, fin)] == [r for r in ordre if debut <= r < fin]
+        assert arbre.compter_intervalle(debut, fin) == sum(1 for r in ordre if debut <= r < fin)
+        prefixe = aleatoire.choice(ordre)[:aleatoire.randint(1, 2)]
+        assert [n.racine for n in arbre.iterer_prefixe(prefixe)] == [r for r in ordre if r.startswith(prefixe)]
+        assert arbre.compter_prefixe(prefixe) == sum(1 for r in ordre if r.startswith(prefixe))
+        taille_page = aleatoire.randint(1, 15)
+        filtrees = [r for r in ordre if r.startswith(prefixe)]
+        numero = aleatoire.randint(0, len(filtrees) // taille_page + 1)
+        noeuds, total = arbre.page(numero, taille_page, prefixe)
+        assert total == len(filtrees)
+        assert [n.racine for n in noeuds] == filtrees[numero * taille_page:(numero + 1) * taille_page]
+
+
+def test_trop_de_schemes_refuse_sans_modifier_l_arbre():
+    arbre = ArbreAVL(verbeux=False)
+    arbre.ajouter_racine("كتب")
+    arbre.cles_schemes += [f"s{i}" for i in range(1, NB_MAX_SCHEMES + 1)]
+    with pytest.raises(ValueError):
+        arbre.ajouter_derive("كتب", "كاتب", "فاعل")
+    assert arbre.nb_derives == 0 and arbre.chercher("كتب").derivees == []
+    assert arbre.trouver_racine_du_mot("كاتب") is None
+    assert arbre.ajouter_derive("كتب", "كاتب")
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Comptes bornés (Misra-Gries) face aux comptes exacts : chaque compte est
+une borne inférieure, sous-estimée d'au plus `erreur`, elle-même bornée
+par total / capacité ; fusionner des compteurs garde ces garanties.
+"""
+import random
+from collections import Counter
+
+from conftest import appliquer, moteur_silencieux, racines_aleatoires, schemes_en_vigueur
+from src.decouverte import CompteurBorne, ExtracteurRacines, decouvrir
+from src.index_documents import jetons
+from src.transducteur import compiler
+
+
+def verifier_bornes(compteur, exacts):
+    assert compteur.total == sum(exacts.values())
+    assert compteur.erreur <= compteur.total / compteur.capacite
+    assert len(compteur) <= 2 * compteur.capacite
+    for cle, exact in exacts.items():
+        compte = compteur.comptes.get(cle, 0)
+        assert exact - compteur.erreur <= compte <= exact, cle
+    assert set(compteur.comptes) <= set(exacts)
+
+
+def test_compteur_borne(graine):
+    aleatoire = random.Random(graine)
+    # Fréquences très inégales : quelques clés dominent, beaucoup sont rares
+    cles = [f"k{i}" for i in range(300)]
+    poids = [1 / (i + 1) for i in range(len(cles))]
+    parties = []
+    for _ in range(4):
+        compteur = CompteurBorne(capacite=20)
+        flux = aleatoire.choices(cles, poids, k=aleatoire.randint(500, 3000))
+        for cle in flux:
+            compteur.ajouter(cle)
+        verifier_bornes(compteur, Counter(flux))
+        parties.append((compteur, flux))
+
+    total = CompteurBorne(capacite=20)
+    for compteur, _ in parties:
+        total.fusionner(compteur)
+    exacts = Counter(cle for _, flux in parties for cle in flux)
+    verifier_bornes(total, exacts)
+    seuil = aleatoire.randint(1, 200)
+    retenues = dict(total.au_moins(seuil))
+    for cle, exact in exacts.items():
+        if exact >= seuil + total.erreur:
+            assert cle in retenues, cle
+        if cle in retenues:
+            assert exact >= seuil
+    assert list(retenues.values()) == sorted(retenues.values(), reverse=True)
+
+
+def test_decouvrir_comptes_exacts(graine, tmp_path):
+    aleatoire = random.Random(graine)
+    moteur = moteur_silencieux()
+    schemes = schemes_en_vigueur(moteur.table_schemes)
+    racines = racines_aleatoires(aleatoire, 30)
+    mots = [aleatoire.choice(["", "و", "ال", "وال"]) + appliquer(aleatoire.choice(schemes)[1], racine)
+            for racine in racines for _ in range(3)]
+    poids = [aleatoire.random() ** 3 for _ in mots]
+    lignes = [" ".join(aleatoire.choices(mots, poids, k=aleatoire.randint(1, 12))) + "\n"
+              for _ in range(300)]
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("".join(lignes), encoding="utf-8")
+
+    extracteur = ExtracteurRacines(compiler(moteur.table_schemes))
+    exacts = Counter(racine for ligne in lignes for jeton in jetons(ligne)
+                     for racine in extracteur.candidates(jeton))
+
+    capacite = 25
+    seuil = 10
+    # Fichier en petites plages d'octets, puis flux de lignes en paquets
+    for fichiers, flux in (([str(corpus)], None), ((), iter(lignes))):
+        retenues, compteur = decouvrir(moteur, fichiers, flux, seuil, processus=1,
+                                       capacite=capacite, taille_morceau=2000)
+        assert compteur.capacite == capacite
+        verifier_bornes(compteur, exacts)
+        for racine, support in retenues:
+            assert seuil <= support <= exacts[racine]
+        retenues = dict(retenues)
+        for racine, exact in exacts.items():
+            if exact >= seuil + compteur.erreur:
+                assert racine in retenues, racine
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Équivalence des chemins rapides du moteur avec leur définition de référence,
+sur des racines, schèmes et suites d'opérations aléatoires :
+
+- generer_mot, paradigme, Transducteur.generer : remplacement de C1 C2 C3
+  dans le pattern en vigueur ;
+- valider_mot : index inverse, puis premier schème de la table qui donne
+  la forme avec la racine (le transducteur remplace cette boucle) ;
+- analyser, etendre : recherche exhaustive racines × schèmes ;
+- stockages : arbre en mémoire, index compacté et SQLite rendent le même
+  lexique sous la même suite d'opérations.
+"""
+import random
+
+from conftest import (PATTERNS, appliquer, forme, moteur_silencieux, racines_aleatoires,
+                      schemes_en_vigueur, verifier_arbre)
+
+VOYELLES = "َُِْ"
+
+
+def modele_de(arbre):
+    """{racine: {mot: schème}} lu dans l'arbre (pour vérifier ses index)"""
+    return {noeud.racine: dict(arbre.derives_avec_schemes(noeud))
+            for noeud in arbre.iterer_infixe()}
+
+
+def schemes_aleatoires(aleatoire, nombre=6):
+    """[(clé, pattern)] distincts tirés parmi PATTERNS"""
+    return [(f"s{i}", pattern) for i, pattern in enumerate(aleatoire.sample(PATTERNS, nombre))]
+
+
+def mot_aleatoire(aleatoire, racines, table):
+    """Mot d'un schème en vigueur (parfois vocalisé), ou suite de lettres quelconque"""
+    tirage = aleatoire.random()
+    if tirage < 0.15:
+        return "".join(aleatoire.choice(racines[0] + racines[-1]) for _ in range(4))
+    _, pattern = aleatoire.choice(schemes_en_vigueur(table))
+    mot = appliquer(pattern, aleatoire.choice(racines))
+    if tirage < 0.3:
+        i = aleatoire.randrange(len(mot))
+        mot = mot[:i + 1] + aleatoire.choice(VOYELLES) + mot[i + 1:]
+    return mot
+
+
+def redefinir(aleatoire, moteur):
+    """Redéfinit une clé existante ou en ajoute une (nouvelle version de la table)"""
+    cles = [cle for cle, _ in schemes_en_vigueur(moteur.table_schemes)]
+    cle = aleatoire.choice(cles) if aleatoire.random() < 0.7 else f"s{len(cles) + 10}"
+    moteur.table_schemes.inserer(cle, aleatoire.choice(PATTERNS), "test")
+
+
+def analyses_reference(moteur, mot):
+    """{(racine, clé)} : toutes les racines connues × schèmes en vigueur qui donnent la forme"""
+    schemes = schemes_en_vigueur(moteur.table_schemes)
+    return {(noeud.racine, cle) for noeud in moteur.arbre_racines.iterer_infixe()
+            for cle, pattern in schemes if appliquer(pattern, noeud.racine) == forme(mot)}
+
+
+def verifier_derives_a_jour(moteur):
+    """Après synchronisation, chaque dérivé à schème est la forme du pattern en vigueur"""
+    arbre = moteur.arbre_racines
+    for noeud in arbre.iterer_infixe():
+        for mot, cle in arbre.derives_avec_schemes(noeud):
+            if cle:
+                pattern = moteur.table_schemes.rechercher(cle).pattern
+                assert forme(mot) == appliquer(pattern, noeud.racine), (noeud.racine, mot, cle)
+    verifier_arbre(arbre, modele_de(arbre))
+
+
+def test_generer_mot_et_paradigme(graine):
+    aleatoire = random.Random(graine)
+    racines = racines_aleatoires(aleatoire, 40)
+    moteur = moteur_silencieux(schemes=schemes_aleatoires(aleatoire))
+    for racine in racines[:30]:
+        moteur.arbre_racines.ajouter_racine(racine)
+
+    for tour in range(300):
+        if tour % 60 == 59:
+            redefinir(aleatoire, moteur)
+        schemes = dict(schemes_en_vigueur(moteur.table_schemes))
+        racine = aleatoire.choice(racines)
+        cle = aleatoire.choice(list(schemes) + ["inconnu"])
+        connue = moteur.arbre_racines.chercher(racine) is not None
+        attendu = appliquer(schemes[cle], racine) if connue and cle in schemes else None
+        assert moteur.generer_mot(racine, cle) == attendu
+        if attendu is not None:
+            assert moteur.transducteur().generer(racine, cle) == attendu
+            assert attendu in moteur.arbre_racines.chercher(racine).derivees
+            assert moteur.arbre_racines.trouver_racine_du_mot(attendu) is not None
+        paradigme = moteur.paradigme(racine)
+        if connue:
+            assert paradigme == tuple((c, appliquer(p, racine)) for c, p in schemes.items())
+        else:
+            assert paradigme is None
+    moteur.synchroniser_derives()
+    verifier_derives_a_jour(moteur)
+
+
+def test_valider_mot(graine):
+    aleatoire = random.Random(graine)
+    racines = racines_aleatoires(aleatoire, 40)
+    moteur = moteur_silencieux(schemes=schemes_aleatoires(aleatoire))
+    arbre = moteur.arbre_racines
+    for racine in racines[:20]:
+        arbre.ajouter_racine(racine)
+
+    for tour in range(400):
+        if tour % 80 == 79:
+            redefinir(aleatoire, moteur)
+        if tour % 50 == 49:
+            # Racines ajoutées après la compilation du transducteur
+            arbre.ajouter_racine(aleatoire.choice(racines))
+        if tour % 7 == 0:
+            moteur.generer_mot(aleatoire.choice(racines),
+                               aleatoire.choice(schemes_en_vigueur(moteur.table_schemes))[0])
+        mot = mot_aleatoire(aleatoire, racines, moteur.table_schemes)
+        racine = aleatoire.choice(racines)
+
+        moteur.synchroniser_derives()
+        noeud = arbre.chercher(racine)
+        indexee = arbre.trouver_racine_du_mot(mot)
+        scheme_attendu = None
+        enregistre = noeud is not None and (mot in noeud.derivees or forme(mot) in noeud.derivees)
+        if indexee:
+            # Toute analyse enregistrée est acceptée, pas seulement celle de l'index
+            valide = (indexee == racine or enregistre
+                      or racine in {r for r, _ in arbre.analyses_du_mot(mot)})
+        elif noeud is None:
+            valide = False
+        elif enregistre:
+            valide = True
+        else:
+            scheme_attendu = next((cle for cle, pattern in schemes_en_vigueur(moteur.table_schemes)
+                                   if appliquer(pattern, racine) == forme(mot)), None)
+            valide = scheme_attendu is not None
+
+        resultat, scheme = moteur.valider_mot(mot, racine)
+        assert resultat == valide, (mot, racine)
+        if scheme_attendu:
+            # Validé par les schèmes : la forme nue est enregistrée sous la racine
+            assert scheme == scheme_attendu, (mot, racine)
+            assert forme(mot) in arbre.chercher(racine).derivees
+        if valide:
+            assert arbre.trouver_racine_du_mot(mot) is not None
+    verifier_derives_a_jour(moteur)
+
+
+def test_formes_vocalisees_une_seule_case(tmp_path):
+    for stockage in (None, f"sqlite:{tmp_path / 'lexique.db'}"):
+        moteur = moteur_silencieux(stockage, schemes=[("مفعول", "مC1C2وC3")])
+        arbre = moteur.arbre_racines
+        arbre.ajouter_racine("كتب")
+        assert moteur.valider_mot("مَكْتُوبٌ", "كتب") == (True, "مفعول")
+        assert moteur.valider_mot("مكتوب", "كتب") == (True, "مفعول")
+        assert moteur.generer_mot("كتب", "مفعول") == "مكتوب"
+        assert arbre.nb_derives == 1
+        assert arbre.usage_schemes == {"مفعول": 1}
+        # Forme vocalisée enregistrée telle quelle : son schème reste trouvé
+        arbre.ajouter_derive("كتب", "مَكْتُوب", "مفعول")
+        assert moteur.valider_mot("مَكْتُوب", "كتب") == (True, "مفعول")
+
+
+def test_valider_mot_partage_entre_racines(tmp_path):
+    for stockage in (None, f"sqlite:{tmp_path / 'lexique.db'}"):
+        moteur = moteur_silencieux(stockage, schemes=[("فاعل", "C1اC2C3")])
+        arbre = moteur.arbre_racines
+        arbre.inserer_lot(["كتب", "كتبب", "درس"])
+        moteur.generer_mot("كتب", "فاعل")
+        moteur.generer_mot("كتبب", "فاعل")
+        assert arbre.analyses_du_mot("كاتب") == [("كتبب", "فاعل"), ("كتب", "فاعل")]
+        # L'index désigne كتبب : l'analyse sous كتب est acceptée quand même
+        assert moteur.valider_mot("كاتب", "كتبب") == (True, "فاعل")
+        assert moteur.valider_mot("كاتب", "كتب") == (True, "فاعل")
+        assert moteur.valider_mot("كَاتِب", "كتب") == (True, "فاعل")
+        assert moteur.valider_mot("كاتب", "درس") == (False, None)
+        assert arbre.nb_derives == 2
+
+
+
+def test_schemes_redefinis_racine_trop_courte(tmp_path):
+    for stockage in (None, f"sqlite:{tmp_path / 'lexique.db'}"):
+        moteur = moteur_silencieux(stockage, schemes=[("فاعل", "C1اC2C3")])
+        arbre = moteur.arbre_racines
+        arbre.inserer_lot(["كت", "كتب"])
+        arbre.ajouter_derive("كت", "كات", "فاعل")
+        moteur.generer_mot("كتب", "فاعل")
+        moteur.table_schemes.inserer("فاعل", "C1ااC2C3", "test")
+        # La case de la racine trop courte est laissée telle quelle
+        assert moteur.synchroniser_derives() == 2
+        assert arbre.chercher("كت").derivees == ["كات"]
+        assert arbre.chercher("كتب").derivees == ["كااتب"]
+
+def test_analyser_et_etendre(graine):
+    aleatoire = random.Random(graine)
+    racines = racines_aleatoires(aleatoire, 40)
+    moteur = moteur_silencieux(schemes=schemes_aleatoires(aleatoire))
+    arbre = moteur.arbre_racines
+    for racine in racines[:25]:
+        arbre.ajouter_racine(racine)
+
+    for tour in range(300):
+        # Modifications entre deux requêtes : les caches doivent suivre
+        tirage = aleatoire.random()
+        racine = aleatoire.choice(racines)
+        if tirage < 0.2:
+            moteur.generer_mot(racine, aleatoire.choice(schemes_en_vigueur(moteur.table_schemes))[0])
+        elif tirage < 0.25:
+            arbre.ajouter_racine(racine)
+        elif tirage < 0.28:
+            arbre.supprimer_racine(racine)
+        elif tirage < 0.33:
+            noeud = arbre.chercher(racine)
+            if noeud is not None and noeud.derivees:
+                arbre.retirer_derive(noeud, aleatoire.choice(noeud.derivees))
+        elif tirage < 0.35:
+            redefinir(aleatoire, moteur)
+        elif tirage < 0.4:
+            # Mot hors paradigme : son retrait ne doit retirer que lui
+            arbre.ajouter_derive(racine, mot_aleatoire(aleatoire, racines, moteur.table_schemes))
+
+        mot = mot_aleatoire(aleatoire, racines, moteur.table_schemes)
+        reference = analyses_reference(moteur, mot)
+        analyses = moteur.transducteur().analyser(mot)
+        assert len(analyses) == len(set(analyses))
+        assert set(analyses) == reference, mot
+
+        moteur.synchroniser_derives()
+        indexee = arbre.trouver_racine_du_mot(mot)
+        racine_attendue = indexee or (analyses[0][0] if analyses else None)
+        racine_trouvee, famille = moteur.etendre(mot)
+        assert racine_trouvee == racine_attendue, mot
+        if racine_attendue is None:
+            assert famille == frozenset()
+        else:
+            noeud = arbre.chercher(racine_attendue)
+            attendue = {m for _, m in moteur.paradigme(racine_attendue)} | set(noeud.derivees)
+            assert famille == attendue, mot
+
+
+def test_analyser_avec_affixes(graine):
+    aleatoire = random.Random(graine)
+    racines = racines_aleatoires(aleatoire, 30)
+    moteur = moteur_silencieux(schemes=schemes_aleatoires(aleatoire))
+    for racine in racines:
+        moteur.arbre_racines.ajouter_racine(racine)
+    for racine in racines[:10]:
+        moteur.generer_mot(racine, aleatoire.choice(schemes_en_vigueur(moteur.table_schemes))[0])
+
+    for _ in range(100):
+        mot = mot_aleatoire(aleatoire, racines, moteur.table_schemes)
+        texte = aleatoire.choice(["", "و", "ال", "وال", "ب"]) + forme(mot) + aleatoire.choice(["", "ها", "هم"])
+        resultat = moteur.analyser_avec_affixes(texte)
+        if resultat is None:
+            continue
+        racine, scheme, prefixe, tige, suffixe = resultat
+        assert texte.startswith(prefixe)
+        connus = set(moteur.arbre_racines.chercher(racine).derivees)
+        produits = {appliquer(pattern, racine) for _, pattern in schemes_en_vigueur(moteur.table_schemes)}
+        assert tige in connus or tige in produits, (texte, resultat)
+
+
+def etat(arbre):
+    """Contenu complet du lexique, comparable d'un stockage à l'autre"""
+    return ([(noeud.racine, arbre.derives_avec_schemes(noeud)) for noeud in arbre.iterer_infixe()],
+            arbre.nb_racines(), arbre.nb_derives, arbre.usage_schemes,
+            sorted((mot, arbre.index_inverse.get(mot)) for mot in arbre.index_inverse))
+
+
+def test_stockages_equivalents(graine, tmp_path):
+    aleatoire = random.Random(graine)
+    racines = racines_aleatoires(aleatoire, 50)
+    schemes = schemes_aleatoires(aleatoire)
+    moteurs = [moteur_silencieux(schemes=schemes), moteur_silencieux(schemes=schemes),
+               moteur_silencieux(f"sqlite:{tmp_path / 'lexique.db'}", schemes=schemes)]
+    moteurs[1].arbre_racines.compacter_index()
+
+    for tour in range(400):
+        tirage = aleatoire.random()
+        racine = aleatoire.choice(racines)
+        cle = aleatoire.choice(schemes_en_vigueur(moteurs[0].table_schemes))[0]
+        mot = mot_aleatoire(aleatoire, racines, moteurs[0].table_schemes)
+        pattern = aleatoire.choice(PATTERNS)
+        lot = aleatoire.sample(racines, aleatoire.randint(0, 10))
+        choix = aleatoire.random()
+        resultats = []
+        for moteur in moteurs:
+            arbre = moteur.arbre_racines
+            if tirage < 0.35:
+                resultats.append(moteur.generer_mot(racine, cle))
+            elif tirage < 0.55:
+                resultats.append(moteur.valider_mot(mot, racine))
+            elif tirage < 0.65:
+                resultats.append(arbre.ajouter_racine(racine))
+            elif tirage < 0.7:
+                resultats.append(arbre.supprimer_racine(racine))
+            elif tirage < 0.73:
+                resultats.append(arbre.supprimer_lot(lot))
+            elif tirage < 0.76:
+                resultats.append(arbre.inserer_lot(lot))
+            elif tirage < 0.84:
+                noeud = arbre.chercher(racine)
+                if noeud is not None and noeud.derivees:
+                    derives = sorted(noeud.derivees)
+                    resultats.append(arbre.retirer_derive(noeud, derives[int(choix * len(derives))]))
+            elif tirage < 0.87:
+                moteur.table_schemes.inserer(cle, pattern, "test")
+            else:
+                resultats.append(sorted(arbre.analyses_du_mot(mot)))
+        assert all(r == resultats[0] for r in resultats), (tour, resultats)
+
+        if tour % 100 == 99:
+            for moteur in moteurs:
+                moteur.synchroniser_derives()
+                verifier_derives_a_jour(moteur)
+            reference = etat(moteurs[0].arbre_racines)
+            assert all(etat(moteur.arbre_racines) == reference for moteur in moteurs[1:])
+    moteurs[2].stockage.fermer()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Export puis import du lexique dans chaque format (compressé ou non) :
+racines, dérivés avec leur schème et index inverse reviennent à
+l'identique, y compris pour les mots partagés entre racines. Un .mlex
+tronqué au milieu d'un enregistrement est refusé.
+"""
+import random
+
+import pytest
+
+from conftest import PATTERNS, appliquer, racines_aleatoires, verifier_arbre
+from src.arbre_abr import ArbreAVL
+from src.export import _ENTETE, MAGIQUE, exporter, importer
+
+
+def lexique_aleatoire(aleatoire):
+    """ArbreAVL et modèle {racine: {mot: schème}}, avec des mots partagés entre racines"""
+    racines = racines_aleatoires(aleatoire, 40)
+    arbre = ArbreAVL(verbeux=False)
+    modele = {}
+    for racine in racines[:30]:
+        arbre.ajouter_racine(racine)
+        modele[racine] = {}
+    for _ in range(150):
+        racine = aleatoire.choice(racines[:30])
+        i = aleatoire.randrange(len(PATTERNS))
+        source = racine if aleatoire.random() < 0.8 else aleatoire.choice(racines)
+        mot = appliquer(PATTERNS[i], source)
+        scheme = f"s{i}" if aleatoire.random() < 0.9 else None
+        if arbre.ajouter_derive(racine, mot, scheme):
+            modele[racine][mot] = scheme
+    # Quelques retraits : l'index d'un mot partagé passe à une autre racine
+    for _ in range(20):
+        racine = aleatoire.choice(racines[:30])
+        if modele[racine]:
+            mot = aleatoire.choice(sorted(modele[racine]))
+            arbre.retirer_derive(arbre.chercher(racine), mot)
+            del modele[racine][mot]
+    return arbre, modele
+
+
+@pytest.mark.parametrize("extension", ["tsv", "jsonl", "mlex", "tsv.gz", "mlex.gz"])
+def test_aller_retour(graine, tmp_path, extension):
+    arbre, modele = lexique_aleatoire(random.Random(graine))
+    chemin = str(tmp_path / f"lexique.{extension}")
+    assert exporter(arbre, chemin) > 0
+
+    relu = ArbreAVL(verbeux=False)
+    assert importer(relu, chemin) == (len(modele), arbre.nb_derives)
+    verifier_arbre(relu, modele)
+    assert dict(relu.index_inverse.items()) == dict(arbre.index_inverse.items())
+    for mot in arbre.index_inverse:
+        # L'analyse de l'index d'abord ; l'ordre des autres suit l'ordre d'import
+        analyses, attendues = relu.analyses_du_mot(mot), arbre.analyses_du_mot(mot)
+        assert analyses[0] == attendues[0] and sorted(analyses) == sorted(attendues), mot
+
+
+def test_mlex_tronque(graine, tmp_path):
+    arbre, modele = lexique_aleatoire(random.Random(graine))
+    chemin = tmp_path / "lexique.mlex"
+    exporter(arbre, str(chemin))
+    donnees = chemin.read_bytes()
+
+    # Frontières des enregistrements
+    frontieres = [len(MAGIQUE)]
+    while frontieres[-1] < len(donnees):
+        _, longueur = _ENTETE.unpack_from(donnees, frontieres[-1])
+        frontieres.append(frontieres[-1] + _ENTETE.size + longueur)
+    assert frontieres[-1] == len(donnees)
+
+    aleatoire = random.Random(graine)
+    tronque = tmp_path / "tronque.mlex"
+    for coupe in aleatoire.sample(range(len(MAGIQUE) + 1, len(donnees)), 20):
+        tronque.write_bytes(donnees[:coupe])
+        if coupe in frontieres:
+            # Coupé entre deux enregistrements : un lexique plus court, valide
+            assert importer(ArbreAVL(verbeux=False), str(tronque))[0] <= len(modele)
+        else:
+            with pytest.raises(ValueError, match="tronqué"):
+                importer(ArbreAVL(verbeux=False), str(tronque))
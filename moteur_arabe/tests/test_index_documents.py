@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Index des documents par racine face à un calcul direct : listes
+d'occurrences et classement BM25 recalculés document par document.
+"""
+import heapq
+import math
+import os
+import random
+
+import pytest
+
+from conftest import appliquer, moteur_silencieux, racines_aleatoires, schemes_en_vigueur
+from src import index_documents
+from src.index_documents import IndexDocuments, RacinesDesJetons, _poids, indexer, jetons
+
+
+def lexique(aleatoire):
+    """Moteur de 40 racines et vocabulaire (dérivés, affixés ou non, et mots inconnus)"""
+    moteur = moteur_silencieux()
+    racines = racines_aleatoires(aleatoire, 40)
+    vocabulaire = ["زززز", "ههههه"]
+    for racine in racines:
+        moteur.arbre_racines.ajouter_racine(racine)
+        for _, pattern in aleatoire.sample(schemes_en_vigueur(moteur.table_schemes), 3):
+            mot = appliquer(pattern, racine)
+            moteur.arbre_racines.ajouter_derive(racine, mot)
+            vocabulaire.append(aleatoire.choice(["", "و", "ال", "وال"]) + mot)
+    return moteur, vocabulaire
+
+
+class Direct:
+    """Occurrences et scores BM25 recalculés document par document"""
+
+    def __init__(self, racines_du_jeton, documents):
+        self.occurrences = []
+        for _, texte in documents:
+            positions = {}
+            for position, jeton in enumerate(jetons(texte)):
+                for racine in racines_du_jeton(jeton):
+                    positions.setdefault(racine, []).append(position)
+            self.occurrences.append((positions, len(jetons(texte))))
+        self.moyenne = sum(longueur for _, longueur in self.occurrences) / len(documents)
+        self.frequences = {}
+        for positions, _ in self.occurrences:
+            for racine in positions:
+                self.frequences[racine] = self.frequences.get(racine, 0) + 1
+
+    def idf(self, racine):
+        df = self.frequences[racine]
+        nb = len(self.occurrences)
+        return math.log(1 + (nb - df + 0.5) / (df + 0.5))
+
+    def scores(self, groupes, tous):
+        scores = {}
+        for i, (positions, longueur) in enumerate(self.occurrences):
+            presents = [any(racine in positions for racine in groupe) for groupe in groupes]
+            if all(presents) if tous else any(presents):
+                scores[i] = sum(self.idf(racine) * _poids(len(positions[racine]), longueur, self.moyenne)
+                                for groupe in groupes for racine in groupe if racine in positions)
+        return scores
+
+
+def verifier_classement(index, direct, groupes, k, tous):
+    scores = direct.scores(groupes, tous)
+    attendus = heapq.nlargest(k, scores.items(), key=lambda e: (e[1], -e[0]))
+    resultats = index.rechercher_racines(groupes, k, tous)
+    # Poids des champions en float32 : scores égaux à 1e-5 près, l'ordre
+    # des ex æquo peut différer
+    assert len(resultats) == len(attendus)
+    assert all(abs(a - b) < 1e-5 for (_, a), (_, b) in zip(resultats, attendus))
+    assert all(abs(score - scores[d]) < 1e-5 for d, score in resultats)
+
+
+def test_occurrences_et_classement(graine, tmp_path):
+    aleatoire = random.Random(graine)
+    moteur, vocabulaire = lexique(aleatoire)
+    documents = [(f"d{i}", " ".join(aleatoire.choices(vocabulaire, k=aleatoire.randint(1, 30))))
+                 for i in range(400)]
+    chemin = str(tmp_path / "documents.ridx")
+    # Petit tampon : plusieurs fichiers temporaires fusionnés
+    indexer(moteur, documents, chemin, taille_tampon=500)
+
+    racines_du_jeton = RacinesDesJetons(moteur)
+    direct = Direct(racines_du_jeton, documents)
+    occurrences = direct.occurrences
+
+    with IndexDocuments(chemin) as index:
+        assert len(index) == len(documents)
+        assert [index.nom(i) for i in range(len(documents))] == [nom for nom, _ in documents]
+        assert set(index.dictionnaire) == set(direct.frequences)
+        for racine, df in direct.frequences.items():
+            assert index.frequence(racine) == df
+            assert list(index.occurrences(racine)) == [
+                (i, positions[racine]) for i, (positions, _) in enumerate(occurrences)
+                if racine in positions]
+
+        for _ in range(100):
+            requete = jetons(" ".join(aleatoire.choices(vocabulaire, k=aleatoire.randint(1, 3))))
+            groupes = [g for g in (racines_du_jeton(j) for j in requete) if g]
+            if groupes:
+                verifier_classement(index, direct, groupes, 10, aleatoire.random() < 0.7)
+
+
+def test_mot_a_plusieurs_racines_classe_exactement(graine, tmp_path, monkeypatch):
+    # Peu de champions : un mot à plusieurs racines ne peut pas s'en contenter
+    monkeypatch.setattr(index_documents, "NB_CHAMPIONS", 3)
+    aleatoire = random.Random(graine)
+    moteur = moteur_silencieux(schemes=[("فاعل", "C1اC2C3")])
+    arbre = moteur.arbre_racines
+    racines = racines_aleatoires(aleatoire, 12)
+    vocabulaire = []
+    for racine in racines:
+        arbre.ajouter_racine(racine)
+        # Chaque mot appartient aussi à une autre racine
+        autre = aleatoire.choice(racines)
+        mot = appliquer("C1اC2C3", racine)
+        arbre.ajouter_derive(racine, mot, "فاعل")
+        arbre.ajouter_racine(autre)
+        arbre.ajouter_derive(autre, mot)
+        vocabulaire.append(mot)
+    documents = [(f"d{i}", " ".join(aleatoire.choices(vocabulaire, k=aleatoire.randint(1, 8))))
+                 for i in range(60)]
+    chemin = str(tmp_path / "documents.ridx")
+    indexer(moteur, documents, chemin)
+
+    racines_du_jeton = RacinesDesJetons(moteur)
+    direct = Direct(racines_du_jeton, documents)
+    with IndexDocuments(chemin) as index:
+        for mot in vocabulaire:
+            verifier_classement(index, direct, [racines_du_jeton(mot)], 3, True)
+
+
+def test_construction_interrompue_sans_fichier_partiel(tmp_path, monkeypatch):
+    moteur = moteur_silencieux()
+    moteur.arbre_racines.ajouter_racine("كتب")
+    moteur.arbre_racines.ajouter_derive("كتب", "كاتب")
+
+    def echec(self):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(index_documents._Liste, "terminer", echec)
+    chemin = str(tmp_path / "documents.ridx")
+    with pytest.raises(OSError):
+        indexer(moteur, [("d0", "كاتب")], chemin)
+    assert os.listdir(tmp_path) == []
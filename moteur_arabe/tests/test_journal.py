@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Redémarrage avec journal et instantané : le fichier de données est chargé,
+puis restaurer() y ajoute l'instantané et le journal.
+"""
+from src.arbre_abr import ArbreAVL
+from src.journal import Journal
+
+
+def demarrer(dossier):
+    """Chargement comme au démarrage de l'application : données puis journal"""
+    arbre = ArbreAVL(verbeux=False)
+    arbre.charger_depuis_fichier(str(dossier / "racines.txt"))
+    journal = Journal(str(dossier / "lexique.journal"), str(dossier / "lexique.instantane"),
+                      seuil_compactage=1, verbeux=False)
+    journal.restaurer(arbre)
+    journal.ouvrir(arbre)
+    return arbre, journal
+
+
+def test_fichier_de_donnees_modifie_apres_instantane(tmp_path):
+    donnees = tmp_path / "racines.txt"
+    donnees.write_text("كتب\nدرس\nعلم\n", encoding="utf-8")
+
+    arbre, journal = demarrer(tmp_path)
+    arbre.ajouter_derive("كتب", "كاتب", "فاعل")
+    arbre.supprimer_racine("علم")
+    arbre.ajouter_racine("فهم")
+    journal.compacter()
+    arbre.ajouter_derive("درس", "مدروس", "مفعول")
+    journal.fermer()
+    assert (tmp_path / "lexique.instantane").exists()
+
+    # Racine ajoutée au fichier après l'instantané
+    donnees.write_text("كتب\nدرس\nعلم\nسمع\n", encoding="utf-8")
+    arbre, journal = demarrer(tmp_path)
+    racines = [noeud.racine for noeud in arbre.iterer_infixe()]
+    assert racines == sorted(["كتب", "درس", "سمع", "فهم"])
+    assert arbre.trouver_racine_du_mot("كاتب") == "كتب"
+    assert arbre.trouver_racine_du_mot("مدروس") == "درس"
+
+    # La suppression survit à un second compactage et à un redémarrage
+    journal.compacter()
+    journal.fermer()
+    arbre, journal = demarrer(tmp_path)
+    assert arbre.chercher("علم") is None
+    assert arbre.chercher("سمع") is not None
+    arbre.ajouter_racine("علم")
+    journal.fermer()
+    arbre, journal = demarrer(tmp_path)
+    assert arbre.chercher("علم") is not None
+    journal.fermer()
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Mode lot de bout en bout (sous-commandes de src.lot sur de petits
+fichiers), métriques au format Prometheus et profileur (piles repliées,
+cProfile, exécution d'un script sous profilage).
+"""
+import json
+import pstats
+import sys
+
+import pytest
+
+from src import lot, profilage
+from src.metriques import Metriques, desinstrumenter, instrumenter
+from src.profilage import Profileur
+
+RACINES = ["كتب", "درس", "علم"]
+SCHEMES = [("فاعل", "C1اC2C3"), ("مفعول", "مC1C2وC3")]
+
+
+@pytest.fixture
+def donnees(tmp_path):
+    (tmp_path / "racines.txt").write_text("\n".join(RACINES) + "\n", encoding="utf-8")
+    (tmp_path / "schemes.txt").write_text(
+        "".join(f"{cle}|{pattern}|test\n" for cle, pattern in SCHEMES), encoding="utf-8")
+    return tmp_path
+
+
+def lancer(capsys, dossier, *arguments, entree=None):
+    """Lance une sous-commande ; retourne (lignes de stdout en champs, stderr)"""
+    argv = [arguments[0], "--racines", str(dossier / "racines.txt"),
+            "--schemes", str(dossier / "schemes.txt"), *arguments[1:]]
+    if entree is not None:
+        chemin = dossier / "entree.txt"
+        chemin.write_text("\n".join(entree) + "\n", encoding="utf-8")
+        argv.append(str(chemin))
+    assert lot.principal(argv) == 0
+    sortie, erreurs = capsys.readouterr()
+    return [ligne.split("\t") for ligne in sortie.splitlines()], erreurs
+
+
+def test_generate_validate_analyze(capsys, donnees):
+    lignes, erreurs = lancer(capsys, donnees, "generate", entree=["كتب\tفاعل", "درس\tمفعول", "كتب"])
+    assert lignes == [["كتب", "فاعل", "كاتب"], ["درس", "مفعول", "مدروس"]]
+    assert "1 rejet(s)" in erreurs
+
+    lignes, _ = lancer(capsys, donnees, "validate", entree=["كاتب\tكتب", "كاتب\tدرس"])
+    assert lignes == [["كاتب", "كتب", "1", "فاعل"], ["كاتب", "درس", "0", ""]]
+
+    lignes, _ = lancer(capsys, donnees, "analyze", "--pre-generer", "--format", "jsonl",
+                       entree=["معلوم", "زززز"])
+    assert [json.loads("\t".join(l)) for l in lignes] == [
+        {"mot": "معلوم", "racine": "علم"}, {"mot": "زززز", "racine": None}]
+
+    lignes, _ = lancer(capsys, donnees, "analyze", "--pre-generer", "--index-compact",
+                       "--distance", "1", entree=["معلوم", "معلوب"])
+    assert lignes == [["معلوم", "علم", "معلوم", "0"], ["معلوب", "علم", "معلوم", "1"]]
+
+    lignes, _ = lancer(capsys, donnees, "analyze", "--fst", entree=["مكتوب"])
+    assert lignes == [["مكتوب", "كتب", "مفعول"]]
+    lignes, _ = lancer(capsys, donnees, "analyze", "--affixes", "--pre-generer", entree=["والكاتب"])
+    assert lignes == [["والكاتب", "كتب", "فاعل", "وال", "كاتب", ""]]
+    lignes, _ = lancer(capsys, donnees, "analyze", "--top", "2", entree=["كاتب"])
+    assert [l[:3] for l in lignes] == [["كاتب", "كتب", "فاعل"]]
+
+
+def test_expand_by_scheme_delete_stats(capsys, donnees):
+    lignes, _ = lancer(capsys, donnees, "expand-all")
+    assert len(lignes) == len(RACINES) * len(SCHEMES)
+    assert ["علم", "مفعول", "معلوم"] in lignes
+
+    lignes, _ = lancer(capsys, donnees, "expand", "--pre-generer", entree=["كاتب"])
+    assert lignes == [["كاتب", "كتب", "كاتب"], ["كاتب", "كتب", "مكتوب"]]
+
+    lignes, _ = lancer(capsys, donnees, "by-scheme", "--pre-generer", "--scheme", "فاعل")
+    assert sorted(lignes) == sorted(["فاعل", f"{r[0]}ا{r[1:]}", r] for r in RACINES)
+
+    lignes, _ = lancer(capsys, donnees, "delete", entree=["كتب", "نون"])
+    assert lignes == [["racines_supprimees", "1"]]
+
+    lignes, _ = lancer(capsys, donnees, "stats", "--pre-generer", "--sans-stats")
+    stats = dict(lignes)
+    assert stats["racines"] == "3" and stats["schemes"] == "2"
+    assert stats["derives"] == stats["index_inverse"] == "6"
+    assert stats["scheme:فاعل"] == stats["scheme:مفعول"] == "3"
+
+
+def test_export_fst_et_relecture(capsys, donnees):
+    lexique = donnees / "lexique.mlex.gz"
+    lancer(capsys, donnees, "export", "--pre-generer", str(lexique))
+    # Le lexique exporté est rechargé à la place d'une pré-génération
+    (donnees / "racines.txt").write_text("", encoding="utf-8")
+    lignes, _ = lancer(capsys, donnees, "analyze", "--lexique", str(lexique), entree=["مدروس"])
+    assert lignes == [["مدروس", "درس"]]
+
+    transducteur = donnees / "transducteur.json"
+    lancer(capsys, donnees, "fst", str(transducteur))
+    assert transducteur.exists()
+
+
+def test_discover_index_docs_search(capsys, donnees):
+    corpus = ["والكاتب مكتوب سامع", "مسموع وسامع", "سامع والمسموع"]
+    lignes, erreurs = lancer(capsys, donnees, "discover", "--seuil", "3", "--processus", "1",
+                             "--inserer", entree=corpus)
+    assert lignes == [["سمع", "5", "False"]]
+    assert "1 racine(s) nouvelle(s)" in erreurs
+
+    index = donnees / "corpus.ridx"
+    lancer(capsys, donnees, "index-docs", "--pre-generer", str(index),
+           entree=["d1\tالكاتب درس", "d2\tمدروس معلوم", "d3\tعالم"])
+    lignes, _ = lancer(capsys, donnees, "search", "--pre-generer", str(index),
+                       entree=["دارس", "كاتب معلوم"])
+    assert [l[:3] for l in lignes] == [["دارس", "1", "d2"], ["كاتب معلوم", "", ""]]
+    lignes, _ = lancer(capsys, donnees, "search", "--pre-generer", "--ou", str(index),
+                       entree=["كاتب معلوم"])
+    assert sorted(l[2] for l in lignes) == ["d1", "d2", "d3"]
+
+
+def test_fichiers_illisibles(capsys, donnees):
+    for option in ("--racines", "--schemes"):
+        with pytest.raises(SystemExit) as sortie:
+            lot.principal(["stats", option, str(donnees / "absent.txt")])
+        assert sortie.value.code != 0
+        assert "absent.txt" in capsys.readouterr().err
+    (donnees / "tronque.mlex").write_bytes(b"MLEX\x01R\xff\x00\x00\x00")
+    with pytest.raises(SystemExit):
+        lancer(capsys, donnees, "stats", "--lexique", str(donnees / "tronque.mlex"))
+    assert "tronqué" in capsys.readouterr().err
+
+
+# ============ MÉTRIQUES ============
+
+def test_metriques_et_prometheus(capsys, donnees):
+    metriques = Metriques(actif=True, prefixe="essai")
+    metriques.incrementer("appels")
+    metriques.incrementer("appels", 2)
+    for valeur in (3, 1, 5):
+        metriques.observer("profondeur", valeur)
+    assert metriques.instantane() == {
+        "compteurs": {"appels": 3},
+        "distributions": {"profondeur": {"nombre": 3, "somme": 9, "moyenne": 3, "max": 5}},
+    }
+    texte = metriques.texte_prometheus({"racines": 7})
+    for ligne in ("# TYPE essai_appels_total counter", "essai_appels_total 3",
+                  "essai_profondeur_count 3", "essai_profondeur_sum 9",
+                  "essai_profondeur_max 5", "essai_racines 7"):
+        assert ligne in texte.splitlines()
+
+    # Enveloppes posées sur l'instance seulement, puis retirées
+    class Objet:
+        def doubler(self, x):
+            return 2 * x
+
+    objet = Objet()
+    instrumenter(objet, {"doubler": "double"}, metriques)
+    assert objet.doubler(4) == 8 and "doubler" in vars(objet)
+    assert metriques.distributions["double_secondes"][0] == 1
+    desinstrumenter(objet, {"doubler": "double"})
+    assert "doubler" not in vars(objet)
+    metriques.reinitialiser()
+    assert metriques.texte_prometheus() == "\n"
+
+    # Mode lot : compteurs du moteur et tailles des structures
+    fichier = donnees / "metriques.prom"
+    lancer(capsys, donnees, "validate", "--pre-generer", "--metriques", str(fichier),
+           entree=["كاتب\tكتب", "زززز\tكتب"])
+    lignes = fichier.read_text(encoding="utf-8").splitlines()
+    assert "moteur_index_inverse_succes_total 1" in lignes
+    assert "moteur_valider_mot_secondes_count 2" in lignes
+    assert "moteur_derives 6" in lignes
+
+
+# ============ PROFILAGE ============
+
+def travailler(donnees, tours):
+    """Charge et pré-génère le lexique `tours` fois (mode lot, sans sortie)"""
+    for _ in range(tours):
+        interface = lot.InterfaceLot()
+        interface.charger_donnees(str(donnees / "racines.txt"), str(donnees / "schemes.txt"))
+        interface.pre_generer()
+
+
+def test_profileur_echantillons(donnees, tmp_path):
+    profileur = Profileur(intervalle=0.001, moteur_seul=True)
+    with profileur:
+        assert profileur.actif
+        while profileur.nb_echantillons < 20:
+            travailler(donnees, 5)
+    assert not profileur.actif
+    piles = profileur.piles_repliees()
+    assert piles
+    # Moteur seul : chaque pile commence au premier cadre du moteur
+    assert all(ligne.startswith("lot:InterfaceLot.") for ligne in piles)
+    assert sum(int(ligne.rsplit(" ", 1)[1]) for ligne in piles) + profileur.hors_moteur \
+        == profileur.nb_echantillons
+    chemin = tmp_path / "piles.txt"
+    profileur.ecrire(str(chemin))
+    assert chemin.read_text(encoding="utf-8").splitlines() == piles
+
+    # Basculé à chaud : plus rien n'est relevé à l'arrêt
+    nombre = profileur.nb_echantillons
+    travailler(donnees, 20)
+    assert profileur.nb_echantillons == nombre
+    profileur.basculer()
+    assert profileur.actif
+    profileur.basculer()
+    assert not profileur.actif
+
+
+def test_profileur_cprofile_et_module(capsys, donnees, tmp_path, monkeypatch):
+    with pytest.raises(ValueError):
+        Profileur("inconnu")
+    profileur = Profileur("cprofile")
+    with profileur:
+        travailler(donnees, 2)
+    chemin = tmp_path / "profil.prof"
+    profileur.ecrire(str(chemin))
+    fonctions = {nom for _, _, nom in pstats.Stats(str(chemin)).stats}
+    assert "pre_generer" in fonctions
+
+    # Un script exécuté sous le profileur, sans le modifier (arguments transmis)
+    monkeypatch.setattr(sys, "argv", list(sys.argv))
+    script = tmp_path / "script.py"
+    script.write_text("import sys\nfrom src import lot\nsys.exit(lot.principal(sys.argv[1:]))\n",
+                      encoding="utf-8")
+    sortie = tmp_path / "lot.prof"
+    code = profilage.principal(["--mode", "cprofile", "--sortie", str(sortie), str(script),
+                                "stats", "--sans-stats",
+                                "--racines", str(donnees / "racines.txt"),
+                                "--schemes", str(donnees / "schemes.txt")])
+    assert code == 0
+    assert "racines\t3" in capsys.readouterr().out
+    assert "cmd_stats" in {nom for _, _, nom in pstats.Stats(str(sortie)).stats}
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Non-régression des débits (scénarios de benchmarks.scenarios).
+
+Les débits sont rapportés à celui d'une boucle Python étalon mesurée sur la
+même machine : la référence (references_performances.json) se compare d'une
+machine à l'autre. Un scénario échoue si son débit relatif baisse de plus de
+MOTEUR_SEUIL_PERF (défaut 0.5, soit deux fois plus lent : les machines de
+test partagées sont bruitées). Après une optimisation voulue :
+
+    MOTEUR_MAJ_REFERENCES=1 python -m pytest tests -m performance
+
+S'y ajoutent des contrôles sans référence : le chemin par l'index bat le
+balayage des schèmes, et les recherches par index ne deviennent pas
+linéaires quand le lexique grandit.
+"""
+import json
+import os
+import platform
+import time
+
+import pytest
+
+from benchmarks.donnees import generer_racines
+from benchmarks.scenarios import SCENARIOS as FABRIQUES, mesurer
+
+pytestmark = pytest.mark.performance
+
+REFERENCES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "references_performances.json")
+SEUIL = float(os.environ.get("MOTEUR_SEUIL_PERF", "0.5"))
+MISE_A_JOUR = os.environ.get("MOTEUR_MAJ_REFERENCES") == "1"
+ECHELLE = 2000
+OPERATIONS = 3000
+REPETITIONS = 3
+SCENARIOS = ("generer_mot", "valider_mot_index", "valider_mot_balayage",
+             "trouver_racine_du_mot", "etendre", "generer_tous_derives")
+
+_contextes = {}
+
+
+def contexte(echelle):
+    """Contexte des scénarios (racines synthétiques, schèmes par défaut), gardé entre tests"""
+    if echelle not in _contextes:
+        _contextes[echelle] = {"racines": generer_racines(echelle, 42), "schemes": None,
+                               "graine": 42}
+    return _contextes[echelle]
+
+
+def debit(nom, echelle=ECHELLE):
+    """Meilleur débit (ops/s) de REPETITIONS passes : le bruit ne fait que ralentir"""
+    return max(mesurer(nom, echelle, contexte(echelle), OPERATIONS, memoire=False)["ops_par_seconde"]
+               for _ in range(REPETITIONS))
+
+
+def debit_meme_lexique(nom, echelle):
+    """Meilleur débit de passes répétées sur un seul lexique (scénarios en lecture seule)"""
+    executer = FABRIQUES[nom](contexte(echelle), OPERATIONS)
+    return max(len(durees) / sum(durees) for durees in (executer() for _ in range(REPETITIONS)))
+
+
+@pytest.fixture(scope="module")
+def etalon():
+    """Débit (ops/s) d'une boucle Python pure : dictionnaire et remplacements de chaînes"""
+    def boucle():
+        table = {}
+        debut = time.perf_counter()
+        for i in range(200000):
+            mot = "C1اC2C3".replace("C1", "ك").replace("C2", "ت").replace("C3", str(i & 255))
+            table[mot] = table.get(mot, 0) + 1
+        return 200000 / (time.perf_counter() - debut)
+    return max(boucle() for _ in range(REPETITIONS))
+
+
+def lire_references():
+    if not os.path.exists(REFERENCES):
+        return {"meta": {}, "rapports": {}}
+    with open(REFERENCES, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("nom", SCENARIOS)
+def test_debit_sans_regression(nom, etalon):
+    rapport = debit(nom) / etalon
+    references = lire_references()
+    if MISE_A_JOUR:
+        references["meta"] = {"python": platform.python_version(), "echelle": ECHELLE,
+                              "operations": OPERATIONS}
+        references["rapports"][nom] = round(rapport, 4)
+        with open(REFERENCES, "w", encoding="utf-8") as f:
+            f.write(json.dumps(references, ensure_ascii=False, indent=2, sort_keys=True) + "\n")
+        pytest.skip(f"référence mise à jour : {rapport:.4f}")
+    reference = references["rapports"].get(nom)
+    if reference is None:
+        pytest.skip(f"pas de référence pour {nom} (MOTEUR_MAJ_REFERENCES=1)")
+    assert rapport >= reference * (1 - SEUIL), \
+        f"{nom} : débit relatif {rapport:.4f}, référence {reference:.4f} (x{rapport / reference:.2f})"
+
+
+def test_index_plus_rapide_que_balayage():
+    assert debit("valider_mot_index") > debit("valider_mot_balayage")
+
+
+@pytest.mark.parametrize("nom", ["trouver_racine_du_mot", "valider_mot_index", "etendre"])
+def test_recherche_independante_de_la_taille(nom):
+    # Dix fois plus de racines : un parcours linéaire serait dix fois plus
+    # lent ; les index (dictionnaires, descente de l'AVL) perdent moins de x4
+    petit, grand = debit_meme_lexique(nom, ECHELLE), debit_meme_lexique(nom, 10 * ECHELLE)
+    assert grand >= petit / 4, f"{nom} : x{grand / petit:.2f} pour 10 fois plus de racines"
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Recherche approchée face à la force brute : distance d'édition restreinte
+(OSA) calculée sans coupure entre la requête et chaque mot du lexique, sur
+un petit alphabet pour que les voisins à une ou deux fautes abondent.
+"""
+import random
+
+from src.recherche_floue import IndexFlou, distance_edition
+
+ALPHABET = "بتد"
+
+
+def osa(a, b):
+    """Distance OSA de référence : programmation dynamique complète"""
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1,
+                          d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+def mot_aleatoire(aleatoire):
+    return "".join(aleatoire.choice(ALPHABET) for _ in range(aleatoire.randint(1, 6)))
+
+
+def test_distance_edition(graine):
+    aleatoire = random.Random(graine)
+    for _ in range(500):
+        a, b = mot_aleatoire(aleatoire), mot_aleatoire(aleatoire)
+        distance_max = aleatoire.randint(0, 3)
+        assert distance_edition(a, b, distance_max) == min(osa(a, b), distance_max + 1), (a, b)
+
+
+def test_rechercher_toutes_equivaut_a_la_force_brute(graine):
+    aleatoire = random.Random(graine)
+    index = IndexFlou(distance_max=2)
+    lexique = {mot_aleatoire(aleatoire) for _ in range(60)}
+    for mot in lexique:
+        index.ajouter(mot)
+    assert len(index) == len(lexique)
+
+    for _ in range(100):
+        requete = mot_aleatoire(aleatoire)
+        for distance_max in (0, 1, 2):
+            attendus = sorted(((mot, osa(requete, mot)) for mot in lexique
+                               if osa(requete, mot) <= distance_max),
+                              key=lambda r: (r[1], r[0]))
+            assert index.rechercher(requete, distance_max, toutes=True) == attendus, requete
+            # Sans toutes : seulement les plus proches
+            plus_proches = [r for r in attendus if r[1] == attendus[0][1]] if attendus else []
+            assert index.rechercher(requete, distance_max) == plus_proches, requete
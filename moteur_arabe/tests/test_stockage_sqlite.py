@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Base SQLite partagée : deux connexions sur le même fichier (comme deux
+processus) voient les écritures l'une de l'autre, sans verrou gardé.
+"""
+import pytest
+
+from src.stockage_sqlite import StockageSQLite
+
+
+@pytest.fixture
+def deux_connexions(tmp_path):
+    chemin = str(tmp_path / "lexique.db")
+    a, b = StockageSQLite(chemin, verbeux=False), StockageSQLite(chemin, verbeux=False)
+    yield a, b
+    a.fermer()
+    b.fermer()
+
+
+def test_ecritures_visibles_et_verrou_rendu(deux_connexions):
+    a, b = deux_connexions
+    b.arbre.ajouter_racine("درس")
+    assert a.arbre.nb_racines() == 1
+    assert a.arbre.chercher("درس") is not None
+
+    # a écrit aussitôt après b : aucun verrou ne reste pris
+    a.arbre.ajouter_racine("كتب")
+    a.arbre.ajouter_derive("كتب", "كاتب", "فاعل")
+    assert b.arbre.nb_racines() == 2
+    assert b.arbre.trouver_racine_du_mot("كاتب") == "كتب"
+    assert b.arbre.usage_schemes == {"فاعل": 1}
+
+    b.arbre.supprimer_lot(["كتب", "درس"])
+    assert a.arbre.nb_racines() == 0
+    assert a.arbre.trouver_racine_du_mot("كاتب") is None
+
+    a.table.inserer("فاعل", "C1اC2C3", "اسم الفاعل")
+    b.arbre.inserer_lot(["علم", "فهم"])
+    assert a.arbre.nb_racines() == 2
+
+
+def test_transaction_groupee_et_annulee(deux_connexions):
+    a, b = deux_connexions
+    with a.transaction():
+        a.arbre.ajouter_racine("كتب")
+        a.arbre.ajouter_derive("كتب", "كاتب", "فاعل")
+        assert b.arbre.nb_racines() == 0      # pas encore validée
+    assert b.arbre.nb_derives == 1
+
+    with pytest.raises(ValueError):
+        with a.transaction():
+            a.arbre.ajouter_racine("درس")
+            raise ValueError("abandon")
+    assert a.arbre.chercher("درس") is None
+    assert b.arbre.nb_racines() == 1
+    b.arbre.ajouter_racine("درس")
+    assert a.arbre.nb_racines() == 2